@@ -0,0 +1,95 @@
+"""Command-line entry point for the pyutils benchmark suite.
+
+Examples:
+    python -m benchmarks                          # run and print results
+    python -m benchmarks --save benchmarks/baseline.json
+    python -m benchmarks --compare benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks --scales 10,10000,10000000 --functions slugify,get_nested
+
+With --compare, the exit status is 1 when any case's throughput dropped
+by more than the threshold relative to the baseline. Cases missing from
+the baseline are listed as a warning, or also fail the run with --strict.
+"""
+
+import argparse
+import json
+import platform
+import sys
+
+from benchmarks import suite
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--scales",
+        default=",".join(str(scale) for scale in suite.DEFAULT_SCALES),
+        help="comma-separated input sizes (default: %(default)s)",
+    )
+    parser.add_argument("--functions", help="comma-separated function names (default: all)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="timed seconds per case")
+    parser.add_argument("--save", metavar="FILE", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a JSON baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=suite.DEFAULT_THRESHOLD,
+        help="tolerated relative slowdown for --compare (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="with --compare, also fail when cases are missing from the baseline",
+    )
+    return parser.parse_args(argv)
+
+
+def print_result(name, result):
+    print(
+        f"{name:<42} {result['ops_per_sec']:>12,.1f} ops/s"
+        f"  p50 {result['p50_us']:>11,.1f} us  p99 {result['p99_us']:>11,.1f} us"
+        f"  peak {result['peak_kb']:>10,.1f} KiB",
+        flush=True,
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    missing = suite.missing_cases()
+    if missing:
+        print(f"warning: no benchmark cases for {', '.join(missing)}", file=sys.stderr)
+    
+    scales = [int(scale) for scale in args.scales.split(",")]
+    functions = args.functions.split(",") if args.functions else None
+    results = suite.run(scales, functions, args.min_time, report=print_result)
+    
+    if args.save:
+        payload = {
+            "meta": {"python": platform.python_version(), "machine": platform.machine()},
+            "results": results,
+        }
+        with open(args.save, "w") as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+            f.write("\n")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = suite.compare(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x baseline throughput", file=sys.stderr)
+        unchecked = suite.missing_from_baseline(results, baseline)
+        if unchecked:
+            print(
+                f"{'MISSING' if args.strict else 'warning'}: {len(unchecked)} cases not in"
+                f" {args.compare}: {', '.join(unchecked)}",
+                file=sys.stderr,
+            )
+        if regressions or (unchecked and args.strict):
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Event-loop latency of co-located requests while a large batch is processed.
+
+A ticker task stands in for other requests on the loop; its wake-up delay
+is reported as p50/p99/max while 200k strings are slugified.
+
+Run with: python -m benchmarks.bench_aio [items]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pyutils import aio
+from pyutils.string_utils import slugify
+
+
+async def with_ticker(make_coro, interval=0.001):
+    """Return (elapsed seconds, sorted ticker delays) while running make_coro()."""
+    delays = []
+    done = False
+    
+    async def ticker():
+        while not done:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            delays.append(max(0.0, time.perf_counter() - expected))
+    
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await make_coro()
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    return elapsed, sorted(delays)
+
+
+def main(items=200_000):
+    texts = [f"Hello World Item Number {i}!" for i in range(items)]
+    
+    async def blocking():
+        return [slugify(t) for t in texts]
+    
+    cases = [
+        ("list comprehension (blocking)", blocking),
+        ("map_async 5 ms budget", lambda: aio.map_async(slugify, texts)),
+        ("map_async 1 ms budget", lambda: aio.map_async(slugify, texts, time_budget=0.001)),
+    ]
+    print(f"{items:,} items; ticker delay in ms")
+    for name, make_coro in cases:
+        elapsed, delays = asyncio.run(with_ticker(make_coro))
+        report(name, elapsed, delays)
+    with ThreadPoolExecutor(1) as executor:
+        elapsed, delays = asyncio.run(with_ticker(
+            lambda: aio.map_async(slugify, texts, executor=executor)
+        ))
+        report("map_async thread executor", elapsed, delays)
+
+
+def report(name, elapsed, delays):
+    if not delays:
+        delays = [elapsed]
+    p99 = delays[min(len(delays) - 1, int(len(delays) * 0.99))]
+    print(f"{name:<32} total {elapsed * 1e3:>8.1f} ms  "
+          f"p50 {statistics.median(delays) * 1e3:>6.2f}  p99 {p99 * 1e3:>7.2f}  "
+          f"max {delays[-1] * 1e3:>7.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,45 @@
+"""Compare peak memory of eager and lazy chunking with tracemalloc.
+
+Run with: python -m benchmarks.bench_chunking
+"""
+
+import tracemalloc
+from array import array
+
+from pyutils.list_utils import chunk_list, iter_chunks
+
+
+def peak_bytes(func):
+    """Return the tracemalloc peak (bytes) while running func."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def consume(chunks):
+    """Touch every chunk without keeping a reference to it."""
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+    return total
+
+
+def main(size=5_000_000, chunk_size=10_000):
+    data = list(range(size))
+    buffer = array("q", range(size))
+    cases = [
+        ("chunk_list (eager)", lambda: consume(chunk_list(data, chunk_size))),
+        ("chunk_list (lazy)", lambda: consume(chunk_list(data, chunk_size, lazy=True))),
+        ("iter_chunks (list)", lambda: consume(iter_chunks(data, chunk_size))),
+        ("iter_chunks (array)", lambda: consume(iter_chunks(buffer, chunk_size))),
+    ]
+    print(f"{size:,} elements, chunk_size={chunk_size:,}")
+    for name, func in cases:
+        print(f"{name:<22} peak {peak_bytes(func) / 1e6:>10.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark flatten_dict/unflatten_dict on large synthetic configs.
+
+Run with: python -m benchmarks.bench_flatten_dict
+"""
+
+import time
+
+from pyutils.dict_utils import flatten_dict, iter_flat_items, unflatten_dict
+
+
+def recursive_flatten(data, separator=".", prefix=""):
+    """Reference recursive implementation that rebuilds key strings per level."""
+    result = {}
+    for key, value in data.items():
+        full_key = f"{prefix}{separator}{key}" if prefix else str(key)
+        if isinstance(value, dict) and value:
+            result.update(recursive_flatten(value, separator, full_key))
+        else:
+            result[full_key] = value
+    return result
+
+
+def build_wide_config(sections=50, keys=100):
+    """Config with sections * keys leaves, two levels deep."""
+    return {
+        f"section{s}": {f"key{k}": k for k in range(keys)}
+        for s in range(sections)
+    }
+
+
+def build_deep_config(depth=30, branches=170, leaves=30):
+    """Config with branches chains of the given depth, leaves at the bottom."""
+    config = {}
+    for b in range(branches):
+        node = config.setdefault(f"branch{b}", {})
+        for level in range(depth - 2):
+            node = node.setdefault(f"level{level}", {})
+        for leaf in range(leaves):
+            node[f"leaf{leaf}"] = leaf
+    return config
+
+
+def best_of(func, repeat=5):
+    """Return the fastest of several timed runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+def main():
+    for name, config in (
+        ("wide 5k keys", build_wide_config()),
+        ("deep 30 levels", build_deep_config()),
+    ):
+        flat = flatten_dict(config)
+        assert flat == recursive_flatten(config)
+        print(f"{name} ({len(flat):,} leaves)")
+        print(f"  recursive       {best_of(lambda: recursive_flatten(config)):8.2f} ms")
+        print(f"  flatten_dict    {best_of(lambda: flatten_dict(config)):8.2f} ms")
+        print(f"  iter_flat_items {best_of(lambda: sum(1 for _ in iter_flat_items(config))):8.2f} ms")
+        print(f"  unflatten_dict  {best_of(lambda: unflatten_dict(flat)):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
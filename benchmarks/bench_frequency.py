@@ -0,0 +1,78 @@
+"""Throughput, peak memory and accuracy of bounded-memory top-k counting.
+
+Compares Counter.most_common with SpaceSaving and CountMinSketch on a
+generated Zipf-like stream of URLs with many distinct rare items
+(generation time is included in every throughput figure).
+
+Run with: python -m benchmarks.bench_frequency [items]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from pyutils.frequency_utils import CountMinSketch, SpaceSaving
+
+
+def iter_urls(count, seed=0):
+    """Zipf-like URLs: a few hot pages and a long tail of unique ones."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        if rng.random() < 0.3:
+            yield f"/item/{rng.getrandbits(48)}"
+        else:
+            yield f"/page/{int(rng.paretovariate(0.8))}"
+
+
+def measure(func):
+    """Return (result, seconds, peak MiB) for one run of func."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def space_saving(items, error):
+    summary = SpaceSaving(error)
+    summary.update(iter_urls(items))
+    return summary
+
+
+def count_min(items, error):
+    sketch = CountMinSketch(error)
+    sketch.update(iter_urls(items))
+    return sketch
+
+
+def main(items=1_000_000, k=20):
+    exact, seconds, peak = measure(lambda: Counter(iter_urls(items)))
+    top = exact.most_common(k)
+    print(f"{items:,} items, {len(exact):,} distinct")
+    print(f"{'Counter':<28} {items / seconds / 1e6:>6.2f} M items/s  peak {peak:>7.1f} MiB")
+    for error in (0.01, 0.001):
+        summary, seconds, peak = measure(lambda: space_saving(items, error))
+        found = {item for item, _ in summary.top_k(k)}
+        recall = sum(item in found for item, _ in top) / k
+        worst = max(summary[item] - exact[item] for item in found)
+        print(
+            f"{f'SpaceSaving(error={error})':<28} {items / seconds / 1e6:>6.2f} M items/s  "
+            f"peak {peak:>7.1f} MiB  top-{k} recall {recall:.0%}  max overcount {worst:,}"
+        )
+        sketch, seconds, peak = measure(lambda: count_min(items, error))
+        worst = max(sketch[item] - exact[item] for item, _ in top)
+        print(
+            f"{f'CountMinSketch(error={error})':<28} {items / seconds / 1e6:>6.2f} M items/s  "
+            f"peak {peak:>7.1f} MiB  top-{k} max overcount {worst:,}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,48 @@
+"""Benchmark get_nested against naive per-call path splitting.
+
+Run with: python -m benchmarks.bench_get_nested
+"""
+
+import timeit
+
+from pyutils.dict_utils import compile_path, get_nested, path_cache_info
+
+
+def naive_get_nested(data, path, default=None):
+    """Reference implementation that re-splits the path on every call."""
+    current = data
+    for key in path.split("."):
+        if not isinstance(current, dict) or key not in current:
+            return default
+        current = current[key]
+    return current
+
+
+def build_nested(depth):
+    """Build a nested dict of the given depth and the path to its leaf."""
+    keys = [f"level{i}" for i in range(depth)]
+    data = "leaf"
+    for key in reversed(keys):
+        data = {key: data}
+    return data, ".".join(keys)
+
+
+def main(number=200_000):
+    print(f"{'depth':>5} {'naive':>10} {'get_nested':>12} {'compiled':>10}  (ns/call)")
+    for depth in (1, 4, 16):
+        data, path = build_nested(depth)
+        accessor = compile_path(path)
+        results = []
+        for stmt in (
+            lambda: naive_get_nested(data, path),
+            lambda: get_nested(data, path),
+            lambda: accessor(data),
+        ):
+            seconds = min(timeit.repeat(stmt, number=number, repeat=3))
+            results.append(seconds / number * 1e9)
+        print(f"{depth:>5} {results[0]:>10.1f} {results[1]:>12.1f} {results[2]:>10.1f}")
+    print(path_cache_info())
+
+
+if __name__ == "__main__":
+    main()
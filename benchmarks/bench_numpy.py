@@ -0,0 +1,41 @@
+"""Compare list inputs with the NumPy fast paths of list_utils.
+
+Run with: python -m benchmarks.bench_numpy (requires numpy)
+"""
+
+import timeit
+
+import numpy as np
+
+from pyutils.list_utils import chunk_list, flatten_list, remove_duplicates
+
+
+def best_ms(func, number=5):
+    """Return the best of five runs of func, in milliseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e3
+
+
+def main(size=1_000_000):
+    values = np.random.default_rng(0).integers(0, size // 10, size)
+    as_list = values.tolist()
+    nested = values.reshape(-1, 100)
+    nested_list = nested.tolist()
+    parts = list(np.array_split(values, 100))
+    part_lists = [part.tolist() for part in parts]
+    cases = [
+        ("chunk_list", lambda: chunk_list(as_list, 1000), lambda: chunk_list(values, 1000)),
+        ("flatten_list", lambda: flatten_list(nested_list),
+         lambda: flatten_list(nested, container_types=(list, np.ndarray))),
+        ("flatten_list (parts)", lambda: flatten_list(part_lists),
+         lambda: flatten_list(parts, container_types=(list, np.ndarray))),
+        ("remove_duplicates", lambda: remove_duplicates(as_list), lambda: remove_duplicates(values)),
+    ]
+    print(f"{size:,} integers")
+    for name, list_case, array_case in cases:
+        list_ms = best_ms(list_case)
+        array_ms = best_ms(array_case)
+        print(f"{name:<22} list {list_ms:>9.2f} ms  ndarray {array_ms:>9.2f} ms  ({list_ms / array_ms:,.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Measure map_batch scaling across worker counts.
+
+Run with: python -m benchmarks.bench_parallel [max_workers]
+
+Speedups are only meaningful up to the number of physical cores.
+"""
+
+import os
+import sys
+import time
+
+from pyutils.parallel import calibrate, map_batch
+from pyutils.string_utils import slugify
+
+
+def main(max_workers=16, count=2_000_000):
+    texts = [f"Deluxe Wireless Headphones Crème Set #{i}!" for i in range(count)]
+    print(f"{count:,} strings, {os.cpu_count()} CPUs available")
+    print(f"calibrated cutover (4 workers): {calibrate(slugify, texts[:512], workers=4):,} items")
+
+    start = time.perf_counter()
+    [slugify(text) for text in texts]
+    serial = time.perf_counter() - start
+    print(f"{'in-process':>12} {serial:8.2f} s")
+
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        map_batch(slugify, texts, workers=workers, chunk_size=20_000, min_items=0)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>4} workers {elapsed:8.2f} s  speedup {serial / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 16)
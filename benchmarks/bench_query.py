@@ -0,0 +1,77 @@
+"""Compare compiled path queries with hand-written loops over get_nested.
+
+Run with: python -m benchmarks.bench_query
+"""
+
+import timeit
+
+from pyutils.dict_utils import compile_query, get_nested
+
+
+def make_documents(count):
+    """Build order documents with a few orders of a few items each."""
+    return [
+        {
+            "id": i,
+            "customer": {"name": f"customer{i}"},
+            "orders": [
+                {"id": o, "items": [{"sku": f"sku{i}-{o}-{n}", "qty": n} for n in range(1 + o % 3)]}
+                for o in range(i % 4)
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def loop_with_get_nested(documents):
+    """The loop a query like "orders.*.items.0.sku" replaces."""
+    result = []
+    for document in documents:
+        for order in get_nested(document, "orders", []):
+            items = get_nested(order, "items", [])
+            if items:
+                sku = get_nested(items[0], "sku")
+                if sku is not None:
+                    result.append(sku)
+    return result
+
+
+def loop_plain(documents):
+    """The same loop with direct indexing and no helper calls."""
+    result = []
+    for document in documents:
+        for order in document.get("orders", ()):
+            items = order.get("items")
+            if items and "sku" in items[0]:
+                result.append(items[0]["sku"])
+    return result
+
+
+def best_ms(func, number=1):
+    """Return the best of three runs of func, in milliseconds."""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e3
+
+
+def main(count=100_000):
+    documents = make_documents(count)
+    first_skus = compile_query("orders.*.items.0.sku")
+    all_skus = compile_query("**.sku")
+    name = compile_query("customer.name")
+    expected = loop_plain(documents)
+    assert list(first_skus.iter_many(documents)) == expected
+    
+    cases = [
+        ("loop + get_nested", lambda: loop_with_get_nested(documents)),
+        ("plain loop", lambda: loop_plain(documents)),
+        ("orders.*.items.0.sku", lambda: list(first_skus.iter_many(documents))),
+        ("  per document", lambda: [sku for d in documents for sku in first_skus(d)]),
+        ("customer.name (first)", lambda: [name.first(d) for d in documents]),
+        ("**.sku", lambda: list(all_skus.iter_many(documents))),
+    ]
+    print(f"{count:,} documents, {len(expected):,} first-item SKUs")
+    for label, func in cases:
+        print(f"{label:<24} {best_ms(func):>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare slugify throughput against the previous str.replace chain.
+
+Run with: python -m benchmarks.bench_slugify
+"""
+
+import time
+
+from pyutils.string_utils import Slugifier, slugify, slugify_many
+
+
+def legacy_slugify(text, separator="-"):
+    """Previous implementation: five chained str.replace passes."""
+    return text.lower().strip().replace('!', '').replace('?', '').replace('.', '').replace(' ', separator)
+
+
+def make_titles(count):
+    """Build synthetic product titles, one in five with accented letters."""
+    words = ["Deluxe", "Wireless", "Headphones", "Kitchen", "Set", "(2-Pack)", "v2.0!"]
+    accented = ["Crème", "Brûlée"]
+    titles = []
+    for i in range(count):
+        title = [words[(i + j) % len(words)] for j in range(6)]
+        if i % 5 == 0:
+            title[2:4] = accented
+        titles.append(" ".join(title) + f" #{i}")
+    return titles
+
+
+def throughput(func, titles):
+    """Return strings per second for func over titles."""
+    start = time.perf_counter()
+    func(titles)
+    return len(titles) / (time.perf_counter() - start)
+
+
+def main(count=200_000):
+    titles = make_titles(count)
+    slugifier = Slugifier()
+    cases = [
+        ("legacy chain", lambda ts: [legacy_slugify(t) for t in ts]),
+        ("slugify", lambda ts: [slugify(t) for t in ts]),
+        ("Slugifier", lambda ts: [slugifier(t) for t in ts]),
+        ("slugify_many", slugify_many),
+    ]
+    print(f"{count:,} titles")
+    for name, func in cases:
+        print(f"{name:<14} {throughput(func, titles) / 1e6:>6.2f} M strings/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Throughput (MB/s) and peak memory of pyutils.stream pipelines.
+
+Run with: python -m benchmarks.bench_stream [size_mb]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+
+from pyutils import stream
+from pyutils.dict_utils import flatten_dict
+from pyutils.list_utils import remove_duplicates
+
+
+def write_events(path, size_mb):
+    """Write camelCase JSON-lines events until the file reaches size_mb."""
+    target = size_mb * 1e6
+    with open(path, "w") as f:
+        i = 0
+        while f.tell() < target:
+            event = {
+                "eventId": i % 50_000,
+                "eventType": "click" if i % 3 else "view",
+                "userInfo": {"userId": i % 997, "userName": f"user{i % 997}", "tags": ["a", "b"]},
+                "pageInfo": {"pageUrl": f"/page/{i % 101}", "referrerUrl": None},
+            }
+            f.write(json.dumps(event) + "\n")
+            i += 1
+
+
+def load_all(path):
+    """Today's approach: load everything into lists, then transform."""
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    records = remove_duplicates(records, key=lambda r: r["eventId"])
+    return [flatten_dict(record) for record in records]
+
+
+def consume(iterator):
+    count = 0
+    for _ in iterator:
+        count += 1
+    return count
+
+
+def measure(func, size_bytes, trace_memory=False):
+    """Return (MB/s, peak MiB or None) for one run of func."""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 2**20 if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return size_bytes / 1e6 / elapsed, peak
+
+
+def main(size_mb=50):
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "events.jsonl")
+        target = os.path.join(tmp, "out.jsonl")
+        write_events(source, size_mb)
+        size = os.path.getsize(source)
+
+        def etl():
+            return stream.pipeline(
+                stream.read_lines(source),
+                stream.parse_json,
+                partial(stream.dedupe, key=lambda r: r["eventId"]),
+                stream.flatten,
+                stream.rename_keys,
+                partial(stream.write_lines, path=target),
+            )
+
+        cases = [
+            ("for line in file", lambda: consume(open(source, "rb"))),
+            ("read_lines (mmap)", lambda: consume(stream.read_lines(source))),
+            ("read_lines (buffered)", lambda: consume(stream.read_lines(source, use_mmap=False))),
+            ("read_lines + parse_json", lambda: consume(stream.parse_json(stream.read_lines(source)))),
+            ("project 2 paths", lambda: consume(stream.pipeline(
+                stream.read_lines(source),
+                stream.parse_json,
+                partial(stream.project, paths=["eventId", "userInfo.userName"]),
+            ))),
+            ("full ETL to file", etl),
+            ("load-all lists (baseline)", lambda: load_all(source)),
+        ]
+        print(f"{size / 1e6:,.1f} MB of JSON lines")
+        for name, func in cases:
+            measure(func, size)  # warm the page cache
+            throughput, _ = measure(func, size)
+            _, peak = measure(func, size, trace_memory=True)
+            print(f"{name:<28} {throughput:>8.1f} MB/s  peak {peak:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
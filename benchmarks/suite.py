@@ -0,0 +1,540 @@
+"""Benchmark cases and measurement for every public pyutils function.
+
+Each function in pyutils.__all__ registers one or more input shapes. A
+case is built for every (function, shape, scale) combination and
+measured for throughput, latency percentiles and peak memory.
+"""
+
+import gc
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pyutils
+from pyutils import dict_utils, frequency_utils, list_utils, string_utils
+
+# Input sizes used when none are given; 10_000_000 is available via --scales
+DEFAULT_SCALES = (10, 10_000)
+
+# Maximum relative slowdown (ops/sec) tolerated by compare()
+DEFAULT_THRESHOLD = 0.25
+
+_ASCII_WORDS = ("alpha", "Beta", "gamma!", "Delta", "(epsilon)", "zeta", "ETA", "theta.")
+_UNICODE_WORDS = ("Crème", "brûlée", "Straße", "naïve", "Ångström", "façade", "日本", "café")
+
+# Builders take (scale, shape) and return the zero-argument operation to time
+Builder = Callable[[int, str], Callable[[], Any]]
+CASES: Dict[str, Dict[str, Builder]] = {}
+
+
+def register(name: str, *shapes: str) -> Callable[[Builder], Builder]:
+    """Register a case builder for a public function and its input shapes."""
+    def decorator(builder: Builder) -> Builder:
+        for shape in shapes:
+            CASES.setdefault(name, {})[shape] = builder
+        return builder
+    return decorator
+
+
+def consume(iterator: Any) -> None:
+    """Exhaust an iterator without storing its items."""
+    deque(iterator, maxlen=0)
+
+
+def make_text(length: int, shape: str) -> str:
+    """Build an ASCII or Unicode text of roughly length characters."""
+    words = _UNICODE_WORDS if shape == "unicode" else _ASCII_WORDS
+    count = length // 6 + 1
+    return " ".join(words[i % len(words)] for i in range(count))[:length]
+
+
+def make_identifier(length: int, camel: bool, shape: str) -> str:
+    """Build a camelCase or snake_case identifier of length characters."""
+    words = ["user", "Id", "HTTP", "Response", "code"] if camel else ["user", "id", "http", "code"]
+    if shape == "unicode":
+        words += ["Élève", "ñame"] if camel else ["élève", "ñame"]
+    separator = "" if camel else "_"
+    return separator.join(words[i % len(words)] for i in range(length // 3 + 1))[:length]
+
+
+def make_nested_list(size: int, shape: str) -> List[Any]:
+    """Build a nested list with size leaves, shallow (2 levels) or deep."""
+    if shape == "shallow":
+        return [list(range(i, min(i + 10, size))) for i in range(0, size, 10)]
+    depth = min(size, 100)
+    result = []
+    for i in range(size // depth):
+        node = [i]
+        for _ in range(depth - 1):
+            node = [node]
+        result.append(node)
+    return result
+
+
+def make_config(size: int, shape: str) -> Dict[str, Any]:
+    """Build a nested dict with about size leaves, shallow or deep."""
+    if shape == "shallow":
+        width = max(1, int(size ** 0.5))
+        return {
+            f"section{s}": {f"keyName{k}": k for k in range(width)}
+            for s in range(max(1, size // width))
+        }
+    depth = min(size, 30)
+    config: Dict[str, Any] = {}
+    for b in range(max(1, size // depth)):
+        node = config.setdefault(f"branch{b}", {})
+        for level in range(depth - 2):
+            node = node.setdefault(f"levelName{level}", {})
+        node["leafValue"] = b
+    return config
+
+
+def make_record(shape: str) -> Tuple[Dict[str, Any], str]:
+    """Build a record and the path to its leaf (depth 2 or 16)."""
+    depth = 16 if shape == "deep" else 2
+    record: Dict[str, Any] = {"leaf": 1, "other": 2}
+    for level in reversed(range(depth - 1)):
+        record = {f"k{level}": record, "sibling": level}
+    path = ".".join([f"k{level}" for level in range(depth - 1)] + ["leaf"])
+    return record, path
+
+
+# String utilities
+
+@register("slugify", "ascii", "unicode")
+def _slugify(scale, shape):
+    text = make_text(scale, shape)
+    return lambda: string_utils.slugify(text)
+
+
+@register("slugify_many", "ascii", "unicode")
+def _slugify_many(scale, shape):
+    texts = [make_text(40 + i % 7, shape) for i in range(scale)]
+    return lambda: string_utils.slugify_many(texts)
+
+
+@register("truncate", "ascii", "unicode")
+def _truncate(scale, shape):
+    text = make_text(scale, shape)
+    return lambda: string_utils.truncate(text, scale // 2)
+
+
+@register("truncate_many", "ascii", "unicode")
+def _truncate_many(scale, shape):
+    texts = [make_text(40 + i % 7, shape) for i in range(scale)]
+    return lambda: string_utils.truncate_many(texts, 30, mode="graphemes")
+
+
+@register("TextPipeline", "ascii", "unicode")
+def _text_pipeline(scale, shape):
+    texts = [make_text(40 + i % 7, shape) for i in range(scale)]
+    pipeline = (
+        string_utils.TextPipeline()
+        .strip()
+        .lower()
+        .replace({"&": " and ", "@": " at "})
+        .slugify()
+        .truncate(30)
+    )
+    return lambda: pipeline.many(texts)
+
+
+@register("camel_to_snake", "ascii", "unicode")
+def _camel_to_snake(scale, shape):
+    text = make_identifier(scale, True, shape)
+    return lambda: string_utils.camel_to_snake(text)
+
+
+@register("snake_to_camel", "ascii", "unicode")
+def _snake_to_camel(scale, shape):
+    text = make_identifier(scale, False, shape)
+    return lambda: string_utils.snake_to_camel(text)
+
+
+@register("snake_to_pascal", "ascii", "unicode")
+def _snake_to_pascal(scale, shape):
+    text = make_identifier(scale, False, shape)
+    return lambda: string_utils.snake_to_pascal(text)
+
+
+# List utilities
+
+@register("chunk_list", "flat")
+def _chunk_list(scale, shape):
+    data = list(range(scale))
+    return lambda: list_utils.chunk_list(data, 10)
+
+
+@register("iter_chunks", "flat", "buffer")
+def _iter_chunks(scale, shape):
+    data = bytes(scale) if shape == "buffer" else list(range(scale))
+    return lambda: consume(list_utils.iter_chunks(data, 10))
+
+
+@register("flatten_list", "shallow", "deep")
+def _flatten_list(scale, shape):
+    data = make_nested_list(scale, shape)
+    return lambda: list_utils.flatten_list(data)
+
+
+@register("iter_flatten", "shallow", "deep")
+def _iter_flatten(scale, shape):
+    data = make_nested_list(scale, shape)
+    return lambda: consume(list_utils.iter_flatten(data))
+
+
+def _duplicated(scale, shape):
+    if shape == "records":
+        return [{"id": i % (scale // 2 + 1), "tags": ["a"]} for i in range(scale)]
+    return [i % (scale // 2 + 1) for i in range(scale)]
+
+
+@register("remove_duplicates", "ints", "records")
+def _remove_duplicates(scale, shape):
+    data = _duplicated(scale, shape)
+    return lambda: list_utils.remove_duplicates(data)
+
+
+@register("iter_unique", "ints", "records", "approximate")
+def _iter_unique(scale, shape):
+    data = _duplicated(scale, shape)
+    if shape == "approximate":
+        return lambda: consume(list_utils.iter_unique(data, approximate=True, capacity=scale))
+    return lambda: consume(list_utils.iter_unique(data))
+
+
+# Frequency utilities
+
+def make_urls(count: int) -> List[str]:
+    """Build count URLs skewed towards a few hot pages."""
+    return [f"/page/{i % (i % 50 + 1)}" for i in range(count)]
+
+
+@register("SpaceSaving", "update")
+def _space_saving(scale, shape):
+    urls = make_urls(scale)
+    return lambda: frequency_utils.SpaceSaving(error=0.01).update(urls)
+
+
+@register("CountMinSketch", "update")
+def _count_min_sketch(scale, shape):
+    urls = make_urls(scale)
+    return lambda: frequency_utils.CountMinSketch(error=0.01).update(urls)
+
+
+@register("top_k", "urls", "records")
+def _top_k(scale, shape):
+    urls = make_urls(scale)
+    if shape == "records":
+        records = [{"url": url} for url in urls]
+        return lambda: frequency_utils.top_k(records, 10, key=lambda r: r["url"])
+    return lambda: frequency_utils.top_k(urls, 10)
+
+
+# Dict utilities
+
+@register("get_nested", "shallow", "deep")
+def _get_nested(scale, shape):
+    record, path = make_record(shape)
+    records = [record] * scale
+    get_nested = dict_utils.get_nested
+    return lambda: [get_nested(r, path) for r in records]
+
+
+def make_orders(shape: str) -> Tuple[Dict[str, Any], str]:
+    """Build an order document and a query for its SKUs (wildcard or **)."""
+    document = {
+        "id": 1,
+        "customer": {"name": "customer"},
+        "orders": [{"id": o, "items": [{"sku": f"sku{o}-{n}", "qty": n} for n in range(3)]} for o in range(3)],
+    }
+    return document, "**.sku" if shape == "deep" else "orders.*.items.0.sku"
+
+
+@register("query_nested", "shallow", "deep")
+def _query_nested(scale, shape):
+    document, query = make_orders(shape)
+    documents = [document] * scale
+    query_nested = dict_utils.query_nested
+    return lambda: [match for d in documents for match in query_nested(d, query)]
+
+
+@register("compile_query", "shallow", "deep")
+def _compile_query(scale, shape):
+    depth = 16 if shape == "deep" else 2
+    query = ".".join(["key", "*", "0", "**"] * max(depth // 4, scale // 4))
+    return lambda: dict_utils.compile_query(query)
+
+
+@register("compile_path", "shallow", "deep")
+def _compile_path(scale, shape):
+    depth = 16 if shape == "deep" else 2
+    path = ".".join(["key"] * max(depth, scale))
+    return lambda: dict_utils.compile_path(path)
+
+
+@register("extract_columns", "shallow", "deep")
+def _extract_columns(scale, shape):
+    record, path = make_record(shape)
+    records = [record] * scale
+    parent = path.rpartition(".")[0]
+    paths = [path, parent + ".other" if parent else "other", "sibling", "missing"]
+    return lambda: dict_utils.extract_columns(records, paths)
+
+
+@register("merge_dicts", "shallow", "deep")
+def _merge_dicts(scale, shape):
+    base = make_config(scale, shape)
+    override = make_config(max(1, scale // 10), shape)
+    return lambda: dict_utils.merge_dicts(base, override, deep=True)
+
+
+@register("MergedView", "shallow", "deep")
+def _merged_view(scale, shape):
+    base = make_config(scale, shape)
+    override = make_config(max(1, scale // 10), shape)
+    keys = list(base)[:10]
+    
+    def lookup():
+        view = dict_utils.MergedView(base, override)
+        for key in keys:
+            view[key]
+    return lookup
+
+
+@register("NestedIndex", "build", "lookup", "update")
+def _nested_index(scale, shape):
+    config = make_config(scale, "shallow")
+    if shape == "build":
+        return lambda: dict_utils.NestedIndex(config)
+    index = dict_utils.NestedIndex(config)
+    paths = list(dict_utils.flatten_dict(config))
+    if shape == "lookup":
+        get = index.get
+        return lambda: [get(path) for path in paths]
+    section = next(iter(config))
+    return lambda: index.update(section, config[section])
+
+
+@register("flatten_dict", "shallow", "deep")
+def _flatten_dict(scale, shape):
+    config = make_config(scale, shape)
+    return lambda: dict_utils.flatten_dict(config)
+
+
+def make_events(count: int) -> List[Dict[str, Any]]:
+    """Build count nested event records sharing one schema."""
+    return [
+        {"id": i, "user": {"id": i % 97, "name": f"user{i % 97}"}, "page": {"url": "/home", "ref": None}}
+        for i in range(count)
+    ]
+
+
+@register("flatten_records", "records")
+def _flatten_records(scale, shape):
+    events = make_events(scale)
+    return lambda: consume(dict_utils.flatten_records(events))
+
+
+@register("FlatRecord", "lookup", "to_dict")
+def _flat_record(scale, shape):
+    rows = list(dict_utils.flatten_records(make_events(scale)))
+    if shape == "lookup":
+        return lambda: [row["user.name"] for row in rows]
+    return lambda: [row.to_dict() for row in rows]
+
+
+@register("fingerprint", "shallow", "deep", "records")
+def _fingerprint(scale, shape):
+    data = make_events(scale) if shape == "records" else make_config(scale, shape)
+    return lambda: dict_utils.fingerprint(data)
+
+
+@register("Fingerprinter", "update")
+def _fingerprinter(scale, shape):
+    config = make_config(scale, "shallow")
+    section = next(iter(config))
+    key = next(iter(config[section]))
+    tracker = dict_utils.Fingerprinter(config)
+    tracker.fingerprint()
+    values = iter(range(1 << 62))
+    return lambda: tracker.update(f"{section}.{key}", next(values))
+
+
+def make_changed_config(scale: int, shape: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Build a config and a freshly built copy of it with one leaf changed."""
+    config = make_config(scale, shape)
+    flat = dict_utils.flatten_dict(config)
+    flat[next(iter(flat))] = "changed"
+    return config, dict_utils.unflatten_dict(flat)
+
+
+@register("diff_nested", "shallow", "deep")
+def _diff_nested(scale, shape):
+    old, new = make_changed_config(scale, shape)
+    return lambda: dict_utils.diff_nested(old, new)
+
+
+@register("apply_patch", "shallow", "deep")
+def _apply_patch(scale, shape):
+    old, new = make_changed_config(scale, shape)
+    patch = dict_utils.diff_nested(old, new)
+    return lambda: dict_utils.apply_patch(old, patch)
+
+
+@register("iter_flat_items", "shallow", "deep")
+def _iter_flat_items(scale, shape):
+    config = make_config(scale, shape)
+    return lambda: consume(dict_utils.iter_flat_items(config))
+
+
+@register("unflatten_dict", "shallow", "deep")
+def _unflatten_dict(scale, shape):
+    flat = dict_utils.flatten_dict(make_config(scale, shape))
+    return lambda: dict_utils.unflatten_dict(flat)
+
+
+@register("convert_keys", "shallow", "deep")
+def _convert_keys(scale, shape):
+    config = make_config(scale, shape)
+    return lambda: dict_utils.convert_keys(config, string_utils.camel_to_snake)
+
+
+def missing_cases() -> List[str]:
+    """Return public pyutils functions that have no benchmark case."""
+    return [name for name in pyutils.__all__ if name not in CASES]
+
+
+def measure(
+    operation: Callable[[], Any], min_time: float = 0.2, max_runs: int = 10_000
+) -> Dict[str, float]:
+    """
+    Time an operation repeatedly and report throughput and latency.
+    
+    Args:
+        operation: Zero-argument callable to time
+        min_time: Minimum total seconds spent in timed runs
+        max_runs: Maximum number of timed runs
+    
+    Returns:
+        Dictionary with ops_per_sec, p50_us, p99_us, runs and peak_kb
+    """
+    operation()  # warm-up (fills caches, first-call allocations)
+    samples = []
+    timer = time.perf_counter
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        total = 0.0
+        while total < min_time and len(samples) < max_runs:
+            start = timer()
+            operation()
+            elapsed = timer() - start
+            samples.append(elapsed)
+            total += elapsed
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    samples.sort()
+    
+    tracemalloc.start()
+    try:
+        operation()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        "ops_per_sec": len(samples) / total if total else float("inf"),
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+        "runs": len(samples),
+        "peak_kb": peak / 1024,
+    }
+
+
+def case_name(function: str, shape: str, scale: int) -> str:
+    """Stable identifier used as the key in result and baseline files."""
+    return f"{function}[{shape}-{scale}]"
+
+
+def run(
+    scales=DEFAULT_SCALES,
+    functions: Optional[List[str]] = None,
+    min_time: float = 0.2,
+    report: Optional[Callable[[str, Dict[str, float]], None]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run every registered case (or those of the given functions).
+    
+    Args:
+        scales: Input sizes to run each case at
+        functions: Restrict to these function names (default: all)
+        min_time: Minimum timed seconds per case
+        report: Optional callback(name, result) invoked after each case
+    
+    Returns:
+        Dictionary mapping case name to its measurements
+    """
+    results = {}
+    for function in functions or sorted(CASES):
+        if function not in CASES:
+            raise ValueError(f"No benchmark cases for {function!r}")
+        for shape, builder in CASES[function].items():
+            for scale in scales:
+                operation = builder(scale, shape)
+                name = case_name(function, shape, scale)
+                results[name] = measure(operation, min_time=min_time)
+                del operation
+                if report is not None:
+                    report(name, results[name])
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Tuple[str, float]]:
+    """
+    Find cases whose throughput dropped by more than threshold.
+    
+    Args:
+        results: Current measurements (from run)
+        baseline: Baseline measurements for the same case names
+        threshold: Maximum tolerated relative slowdown (0.25 = 25%)
+    
+    Returns:
+        List of (case name, current/baseline ops ratio) for regressions,
+        sorted worst first; cases missing from either side are not
+        compared (see missing_from_baseline)
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if not reference or not reference.get("ops_per_sec"):
+            continue
+        ratio = current["ops_per_sec"] / reference["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append((name, ratio))
+    return sorted(regressions, key=lambda item: item[1])
+
+
+def missing_from_baseline(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]
+) -> List[str]:
+    """
+    Return the measured cases that compare could not check.
+    
+    Args:
+        results: Current measurements (from run)
+        baseline: Baseline measurements
+    
+    Returns:
+        Sorted names of cases with no baseline throughput
+    """
+    return sorted(
+        name for name in results
+        if not baseline.get(name) or not baseline[name].get("ops_per_sec")
+    )
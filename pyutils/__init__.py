@@ -1,19 +1,163 @@
-"""Python Utilities Package - Collection of utility functions."""
+"""Python Utilities Package - Collection of utility functions.
+
+Submodules are loaded lazily: ``import pyutils`` only defines the names
+below, and the module providing a function is imported the first time the
+function (or the submodule itself) is accessed.
+"""
+
+import os as _os
+
+# Equivalent to typing.TYPE_CHECKING without paying for importing typing;
+# private so it does not leak as a pyutils attribute
+_TYPE_CHECKING = False
 
 __version__ = "0.1.0"
 
-from pyutils.string_utils import slugify, truncate, camel_to_snake
-from pyutils.list_utils import chunk_list, flatten_list, remove_duplicates
-from pyutils.dict_utils import merge_dicts, get_nested, flatten_dict
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "slugify": "string_utils",
+    "slugify_many": "string_utils",
+    "truncate": "string_utils",
+    "truncate_many": "string_utils",
+    "TextPipeline": "string_utils",
+    "camel_to_snake": "string_utils",
+    "snake_to_camel": "string_utils",
+    "snake_to_pascal": "string_utils",
+    "chunk_list": "list_utils",
+    "flatten_list": "list_utils",
+    "iter_flatten": "list_utils",
+    "iter_chunks": "list_utils",
+    "iter_unique": "list_utils",
+    "remove_duplicates": "list_utils",
+    "SpaceSaving": "frequency_utils",
+    "CountMinSketch": "frequency_utils",
+    "top_k": "frequency_utils",
+    "MergedView": "dict_utils",
+    "NestedIndex": "dict_utils",
+    "FlatRecord": "dict_utils",
+    "Fingerprinter": "dict_utils",
+    "merge_dicts": "dict_utils",
+    "get_nested": "dict_utils",
+    "query_nested": "dict_utils",
+    "compile_query": "dict_utils",
+    "flatten_dict": "dict_utils",
+    "flatten_records": "dict_utils",
+    "fingerprint": "dict_utils",
+    "diff_nested": "dict_utils",
+    "apply_patch": "dict_utils",
+    "iter_flat_items": "dict_utils",
+    "unflatten_dict": "dict_utils",
+    "compile_path": "dict_utils",
+    "extract_columns": "dict_utils",
+    "convert_keys": "dict_utils",
+}
+
+_SUBMODULES = frozenset({
+    "aio", "dict_utils", "frequency_utils", "list_utils", "string_utils", "instrumentation",
+    "parallel", "stream",
+})
+
+if _TYPE_CHECKING:
+    from pyutils.string_utils import (
+        slugify,
+        slugify_many,
+        truncate,
+        truncate_many,
+        TextPipeline,
+        camel_to_snake,
+        snake_to_camel,
+        snake_to_pascal,
+    )
+    from pyutils.list_utils import (
+        chunk_list,
+        flatten_list,
+        iter_flatten,
+        iter_chunks,
+        iter_unique,
+        remove_duplicates,
+    )
+    from pyutils.frequency_utils import (
+        SpaceSaving,
+        CountMinSketch,
+        top_k,
+    )
+    from pyutils.dict_utils import (
+        MergedView,
+        NestedIndex,
+        FlatRecord,
+        Fingerprinter,
+        merge_dicts,
+        get_nested,
+        query_nested,
+        compile_query,
+        flatten_dict,
+        flatten_records,
+        fingerprint,
+        diff_nested,
+        apply_patch,
+        iter_flat_items,
+        unflatten_dict,
+        compile_path,
+        extract_columns,
+        convert_keys,
+    )
 
 __all__ = [
     "slugify",
+    "slugify_many",
     "truncate",
+    "truncate_many",
+    "TextPipeline",
     "camel_to_snake",
+    "snake_to_camel",
+    "snake_to_pascal",
     "chunk_list",
     "flatten_list",
     "remove_duplicates",
+    "iter_flatten",
+    "iter_chunks",
+    "iter_unique",
+    "SpaceSaving",
+    "CountMinSketch",
+    "top_k",
     "merge_dicts",
+    "MergedView",
+    "NestedIndex",
+    "FlatRecord",
+    "Fingerprinter",
     "get_nested",
+    "query_nested",
+    "compile_query",
     "flatten_dict",
+    "flatten_records",
+    "fingerprint",
+    "diff_nested",
+    "apply_patch",
+    "iter_flat_items",
+    "unflatten_dict",
+    "compile_path",
+    "extract_columns",
+    "convert_keys",
 ]
+
+
+def __getattr__(name):
+    """Import the submodule behind a public name on first access."""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None and name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    module = import_module(f"{__name__}.{module_name or name}")
+    value = module if module_name is None else getattr(module, name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
+
+
+if _os.environ.get("PYUTILS_INSTRUMENTATION"):
+    from pyutils.instrumentation import enable_from_env as _enable_from_env
+    _enable_from_env()
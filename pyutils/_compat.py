@@ -0,0 +1,31 @@
+"""Optional dependency helpers."""
+
+import importlib
+import sys
+from typing import Any
+
+
+def numpy_if_loaded() -> Any:
+    """
+    Return the numpy module if it has already been imported, else None.
+    
+    Used for input-type dispatch: if numpy was never imported, the input
+    cannot be an ndarray, so numpy is never imported just to check.
+    """
+    return sys.modules.get("numpy")
+
+
+def require_numpy(feature: str) -> Any:
+    """
+    Import and return numpy, raising a helpful ImportError if missing.
+    
+    Args:
+        feature: Description of the feature that needs numpy
+        
+    Returns:
+        The numpy module
+    """
+    try:
+        return importlib.import_module("numpy")
+    except ImportError as exc:
+        raise ImportError(f"numpy is required for {feature}") from exc
@@ -0,0 +1,241 @@
+"""Asyncio-friendly batch processing that does not block the event loop.
+
+CPU-bound work on a large batch runs in time-sliced chunks, yielding to
+the event loop whenever the time budget of a slice is used up, so other
+tasks on the same loop keep their latency. Work can also be offloaded
+to a thread or process executor.
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor
+from itertools import islice
+from typing import (
+    Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar,
+)
+
+from pyutils.list_utils import iter_chunks, iter_flatten
+from pyutils.parallel import _apply_chunk
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Seconds of work between yields to the event loop
+DEFAULT_TIME_BUDGET = 0.005
+
+# Chunks submitted to an executor but not yet collected
+MAX_PENDING_CHUNKS = 8
+
+# Bounds on the adaptive number of items processed per time slice
+_MIN_SLICE = 1
+_MAX_SLICE = 1 << 16
+
+# Loop iterations from a due timer or I/O event to its task running
+_YIELD_HOPS = 3
+
+
+def _check_time_budget(time_budget: float) -> None:
+    if not time_budget > 0:
+        raise ValueError("time_budget parameter must be positive")
+
+
+async def _yield_to_loop() -> None:
+    # A single sleep(0) only runs callbacks already queued: a due timer or
+    # socket read fires a callback that resolves a future, which in turn
+    # schedules the waiting task. Yielding once per hop lets those tasks
+    # run before the next slice starts.
+    for _ in range(_YIELD_HOPS):
+        await asyncio.sleep(0)
+
+
+class _TimeSlicer:
+    """Yields to the event loop once time_budget has passed since the last yield."""
+    
+    __slots__ = ("time_budget", "deadline")
+    
+    def __init__(self, time_budget: float):
+        self.time_budget = time_budget
+        self.deadline = time.perf_counter() + time_budget
+    
+    async def pause_if_due(self) -> None:
+        if time.perf_counter() >= self.deadline:
+            await _yield_to_loop()
+            self.deadline = time.perf_counter() + self.time_budget
+
+
+async def _iter_slices(
+    func: Callable[[T], R], iterator: Iterator[T], time_budget: float
+) -> AsyncIterator[List[R]]:
+    """Apply func in slices sized to fill time_budget, yielding to the loop after each."""
+    size = 16
+    timer = time.perf_counter
+    while True:
+        start = timer()
+        results = [func(item) for item in islice(iterator, size)]
+        if not results:
+            return
+        elapsed = timer() - start
+        yield results
+        if len(results) < size:
+            return
+        # Aim the next slice at the budget, growing at most 2x per slice
+        if elapsed > 0:
+            size = int(size * time_budget / elapsed)
+        else:
+            size *= 2
+        size = max(_MIN_SLICE, min(size, 2 * len(results), _MAX_SLICE))
+        await _yield_to_loop()
+
+
+async def _iter_executor_chunks(
+    func: Callable[[T], R], iterator: Iterator[T], executor: Executor, chunk_size: int
+) -> AsyncIterator[List[R]]:
+    loop = asyncio.get_running_loop()
+    pending: deque = deque()
+    try:
+        for chunk in iter_chunks(iterator, chunk_size):
+            pending.append(loop.run_in_executor(executor, _apply_chunk, func, chunk))
+            if len(pending) >= MAX_PENDING_CHUNKS:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _result_chunks(
+    func: Callable[[T], R],
+    iterable: Iterable[T],
+    time_budget: float,
+    executor: Optional[Executor],
+    chunk_size: int,
+) -> AsyncIterator[List[R]]:
+    _check_time_budget(time_budget)
+    iterator = iter(iterable)
+    if executor is not None:
+        return _iter_executor_chunks(func, iterator, executor, chunk_size)
+    return _iter_slices(func, iterator, time_budget)
+
+
+async def imap_async(
+    func: Callable[[T], R],
+    iterable: Iterable[T],
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 1024,
+) -> AsyncIterator[R]:
+    """
+    Asynchronously apply func to every item, in input order.
+    
+    Args:
+        func: Function of one argument (picklable for process executors)
+        iterable: Input items
+        time_budget: Seconds of work between yields to the event loop
+        executor: Thread or process executor to run chunks in instead of
+            the event loop thread
+        chunk_size: Items sent to the executor per task
+    
+    Yields:
+        func(item) for each item
+    """
+    async for results in _result_chunks(func, iterable, time_budget, executor, chunk_size):
+        for result in results:
+            yield result
+
+
+async def map_async(
+    func: Callable[[T], R],
+    iterable: Iterable[T],
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 1024,
+) -> List[R]:
+    """
+    Apply func to every item without blocking the event loop.
+    
+    In the event loop thread, items are processed in slices whose size
+    adapts so that each slice takes about time_budget seconds, with a
+    yield to the event loop after every slice. With an executor, chunks
+    of chunk_size items run there (a bounded number at a time) while the
+    loop stays free.
+    
+    Args:
+        func: Function of one argument, e.g. slugify or flatten_dict
+        iterable: Input items
+        time_budget: Seconds of work between yields to the event loop
+            (default: 5 ms)
+        executor: Thread or process executor to offload to
+        chunk_size: Items sent to the executor per task
+    
+    Returns:
+        List of results in input order
+    
+    Example:
+        >>> from pyutils.string_utils import slugify
+        >>> asyncio.run(map_async(slugify, ["Hello World", "Foo Bar"]))
+        ['hello-world', 'foo-bar']
+    """
+    results: List[R] = []
+    async for chunk in _result_chunks(func, iterable, time_budget, executor, chunk_size):
+        results.extend(chunk)
+    return results
+
+
+def aiter_chunks(
+    data: Iterable[T],
+    chunk_size: int,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+) -> AsyncIterator[Any]:
+    """
+    Async iterator form of iter_chunks.
+    
+    Yields to the event loop between chunks once time_budget has passed,
+    including time the consumer spent on earlier chunks.
+    
+    Args:
+        data: Iterable to split into chunks
+        chunk_size: Size of each chunk
+        time_budget: Seconds between yields to the event loop
+    
+    Returns:
+        Async iterator over chunks (lists, or views for buffers)
+    
+    Example:
+        >>> async def total():
+        ...     return sum([len(chunk) async for chunk in aiter_chunks(range(5), 2)])
+        >>> asyncio.run(total())
+        5
+    """
+    _check_time_budget(time_budget)
+    return _aiter_sliced(iter_chunks(data, chunk_size), time_budget)
+
+
+def aiter_flatten(
+    nested: Iterable[Any],
+    container_types: Tuple[type, ...] = (list,),
+    max_depth: Optional[int] = None,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+) -> AsyncIterator[Any]:
+    """
+    Async iterator form of iter_flatten.
+    
+    Args:
+        nested: Nested iterable to flatten
+        container_types: Types to descend into (default: list only)
+        max_depth: Maximum number of levels to descend (default: unlimited)
+        time_budget: Seconds between yields to the event loop
+    
+    Returns:
+        Async iterator over non-container items in depth-first order
+    """
+    _check_time_budget(time_budget)
+    return _aiter_sliced(iter_flatten(nested, container_types, max_depth), time_budget)
+
+
+async def _aiter_sliced(iterator: Iterator[T], time_budget: float) -> AsyncIterator[T]:
+    slicer = _TimeSlicer(time_budget)
+    for item in iterator:
+        yield item
+        await slicer.pause_if_due()
@@ -1,14 +1,154 @@
 """Dictionary manipulation utilities."""
 
-from typing import Dict, Any, Optional
+import marshal
+import sys
+from bisect import bisect_left, insort
+from collections.abc import Mapping
+from functools import lru_cache
+from hashlib import blake2b
+from itertools import compress, count
+from operator import not_
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
 
+from pyutils._compat import require_numpy
+from pyutils.list_utils import remove_duplicates
+from pyutils.string_utils import camel_to_snake, snake_to_camel
 
-def merge_dicts(*dicts: Dict[str, Any]) -> Dict[str, Any]:
+# Maximum number of compiled paths kept by get_nested's internal cache
+PATH_CACHE_SIZE = 1024
+
+# Sentinel for missing keys, distinct from any stored value (including None)
+_MISSING = object()
+
+
+class CompiledPath:
+    """
+    Reusable accessor for a dot-separated path.
+    
+    The path is split once at construction time, so repeated lookups
+    only walk the data.
+    
+    Attributes:
+        path: Original dot-separated path
+        keys: Tuple of keys the path resolves to
+        
+    Example:
+        >>> city = compile_path("user.address.city")
+        >>> city({'user': {'address': {'city': 'NYC'}}})
+        'NYC'
+    """
+    
+    __slots__ = ("path", "keys")
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.keys: Tuple[str, ...] = tuple(path.split(".")) if path else ()
+    
+    def __call__(self, data: Dict[str, Any], default: Any = None) -> Any:
+        current = data
+        try:
+            for key in self.keys:
+                current = current[key]
+        except (KeyError, TypeError):
+            return default
+        return current
+    
+    def __repr__(self) -> str:
+        return f"CompiledPath({self.path!r})"
+
+
+def compile_path(path: str) -> CompiledPath:
+    """
+    Compile a dot-separated path into a reusable accessor.
+    
+    Args:
+        path: Dot-separated path (e.g., "user.address.city")
+        
+    Returns:
+        CompiledPath callable as accessor(data, default=None)
+        
+    Example:
+        >>> get_name = compile_path("user.name")
+        >>> get_name({'user': {'name': 'John'}})
+        'John'
+    """
+    return CompiledPath(path)
+
+
+_cached_compile_path = lru_cache(maxsize=PATH_CACHE_SIZE)(compile_path)
+
+
+def path_cache_info():
+    """
+    Return hit/miss statistics of get_nested's compiled path cache.
+    
+    Returns:
+        functools CacheInfo namedtuple (hits, misses, maxsize, currsize)
+    """
+    return _cached_compile_path.cache_info()
+
+
+def clear_path_cache() -> None:
+    """Clear the compiled path and query caches and reset their counters."""
+    _cached_compile_path.cache_clear()
+    _cached_compile_query.cache_clear()
+
+
+# List handling strategies accepted by merge_dicts and MergedView
+LIST_STRATEGIES = ("replace", "append", "unique")
+
+
+def _merge_lists(current: List[Any], incoming: List[Any], list_strategy: str) -> List[Any]:
+    if list_strategy == "append":
+        return current + incoming
+    if list_strategy == "unique":
+        return remove_duplicates(current + incoming)
+    return incoming
+
+
+def _deep_merge_into(
+    target: Dict[str, Any], source: Dict[str, Any], owned: set, list_strategy: str
+) -> None:
+    """
+    Deep-merge source into target without modifying any input.
+    
+    Dicts in target whose id is in owned were created by the merge and may
+    be updated in place; any other dict is an input subtree and is copied
+    (one level) before it is written to.
+    """
+    stack = [(target, source)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key, _MISSING)
+            if isinstance(value, dict) and isinstance(current, dict):
+                if id(current) not in owned:
+                    current = target[key] = dict(current)
+                    owned.add(id(current))
+                stack.append((current, value))
+            elif isinstance(value, list) and isinstance(current, list):
+                target[key] = _merge_lists(current, value, list_strategy)
+            else:
+                target[key] = value
+
+
+def merge_dicts(
+    *dicts: Dict[str, Any], deep: bool = False, list_strategy: str = "replace"
+) -> Dict[str, Any]:
     """
     Merge multiple dictionaries into one.
     
+    The inputs are never modified. In deep mode, subtrees that only one
+    input contributes are shared with that input rather than copied, and
+    a nested dict is copied (one level at a time) only when a later input
+    merges into it.
+    
     Args:
         *dicts: Variable number of dictionaries to merge
+        deep: Recursively merge nested dictionaries (default: False)
+        list_strategy: How deep mode combines two lists at the same key:
+            "replace" (later wins), "append" or "unique" (append, then
+            remove duplicates)
         
     Returns:
         Merged dictionary (later dicts override earlier ones)
@@ -16,15 +156,95 @@ def merge_dicts(*dicts: Dict[str, Any]) -> Dict[str, Any]:
     Example:
         >>> merge_dicts({'a': 1}, {'b': 2}, {'a': 3})
         {'a': 3, 'b': 2}
+        >>> merge_dicts({'db': {'host': 'x', 'port': 1}}, {'db': {'port': 2}}, deep=True)
+        {'db': {'host': 'x', 'port': 2}}
+    """
+    if list_strategy not in LIST_STRATEGIES:
+        raise ValueError(f"list_strategy must be one of {LIST_STRATEGIES}")
+    result: Dict[str, Any] = {}
+    if not deep:
+        for d in dicts:
+            result.update(d)
+        return result
+    owned = {id(result)}
+    for d in dicts:
+        _deep_merge_into(result, d, owned, list_strategy)
+    return result
+
+
+class MergedView(Mapping):
+    """
+    Lazy, read-only merged view over several dictionaries.
+    
+    Keys are resolved on access, with later dictionaries taking priority.
+    In deep mode, a key whose winning value is a dict that is also a dict
+    in earlier inputs resolves to a nested MergedView over those dicts.
+    Nothing is copied, so changes to the inputs show through the view.
+    
+    Example:
+        >>> view = MergedView({'db': {'host': 'x'}}, {'db': {'port': 2}})
+        >>> view['db']['host'], view['db']['port']
+        ('x', 2)
     """
-    # TODO: Implement merge_dicts logic
-    raise NotImplementedError("merge_dicts not yet implemented")
+    
+    __slots__ = ("maps", "deep", "list_strategy")
+    
+    def __init__(
+        self, *maps: Dict[str, Any], deep: bool = True, list_strategy: str = "replace"
+    ):
+        if list_strategy not in LIST_STRATEGIES:
+            raise ValueError(f"list_strategy must be one of {LIST_STRATEGIES}")
+        self.maps = maps
+        self.deep = deep
+        self.list_strategy = list_strategy
+    
+    def __getitem__(self, key: str) -> Any:
+        found = [m[key] for m in self.maps if key in m]
+        if not found:
+            raise KeyError(key)
+        value = found[-1]
+        if not self.deep:
+            return value
+        if isinstance(value, dict):
+            start = len(found) - 1
+            while start > 0 and isinstance(found[start - 1], dict):
+                start -= 1
+            if start < len(found) - 1:
+                return MergedView(*found[start:], deep=True, list_strategy=self.list_strategy)
+        elif isinstance(value, list) and self.list_strategy != "replace":
+            start = len(found) - 1
+            while start > 0 and isinstance(found[start - 1], list):
+                start -= 1
+            merged = found[start]
+            for incoming in found[start + 1:]:
+                merged = _merge_lists(merged, incoming, self.list_strategy)
+            return merged
+        return value
+    
+    def __contains__(self, key: object) -> bool:
+        return any(key in m for m in self.maps)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict.fromkeys(key for m in self.maps for key in m))
+    
+    def __len__(self) -> int:
+        return len(set().union(*self.maps))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the view with merge_dicts."""
+        return merge_dicts(*self.maps, deep=self.deep, list_strategy=self.list_strategy)
+    
+    def __repr__(self) -> str:
+        return f"MergedView({', '.join(repr(m) for m in self.maps)}, deep={self.deep!r})"
 
 
 def get_nested(data: Dict[str, Any], path: str, default: Any = None) -> Any:
     """
     Get a value from a nested dictionary using dot notation.
     
+    Parsed paths are kept in a bounded LRU cache (PATH_CACHE_SIZE entries);
+    use path_cache_info() to read its hit/miss counters.
+    
     Args:
         data: Dictionary to search
         path: Dot-separated path (e.g., "user.address.city")
@@ -37,17 +257,560 @@ def get_nested(data: Dict[str, Any], path: str, default: Any = None) -> Any:
         >>> get_nested({'user': {'name': 'John'}}, 'user.name')
         'John'
     """
-    # TODO: Implement get_nested logic
-    raise NotImplementedError("get_nested not yet implemented")
+    current = data
+    try:
+        for key in _cached_compile_path(path).keys:
+            current = current[key]
+    except (KeyError, TypeError):
+        return default
+    return current
+
+
+# Opcodes of compiled path queries
+QUERY_STEP = "step"            # arg: ((key, ...), (segment text, ...), has_index)
+QUERY_WILDCARD = "wildcard"    # every value of a dict / item of a list
+QUERY_RECURSIVE = "recursive"  # the current node and all its descendants;
+                               # arg: whether leaves can match (only ** follows)
+
+
+def _parse_query_segments(query: str) -> List[Tuple[str, bool]]:
+    """Split a query on unescaped dots into (segment, was_escaped) pairs."""
+    segments = []
+    current: List[str] = []
+    escaped = False
+    chars = iter(query)
+    for char in chars:
+        if char == "\\":
+            current.append(next(chars, "\\"))
+            escaped = True
+        elif char == ".":
+            segments.append(("".join(current), escaped))
+            current, escaped = [], False
+        else:
+            current.append(char)
+    segments.append(("".join(current), escaped))
+    return segments
+
+
+def _step_instruction(keys: List[Any], texts: List[str]) -> Tuple[str, Any]:
+    has_index = any(isinstance(key, int) for key in keys)
+    return (QUERY_STEP, (tuple(keys), tuple(texts), has_index))
+
+
+def _compile_query_program(query: str) -> Tuple[Tuple[str, Any], ...]:
+    program: List[Tuple[str, Any]] = []
+    keys: List[Any] = []
+    texts: List[str] = []
+    for segment, escaped in _parse_query_segments(query) if query else ():
+        if not escaped and segment in ("*", "**"):
+            if keys:
+                program.append(_step_instruction(keys, texts))
+                keys, texts = [], []
+            program.append((QUERY_WILDCARD if segment == "*" else QUERY_RECURSIVE, None))
+            continue
+        index = segment.lstrip("-")
+        if not escaped and index.isdigit() and index.isascii() and segment.count("-") <= 1:
+            keys.append(int(segment))
+        else:
+            keys.append(segment)
+        texts.append(segment)
+    if keys:
+        program.append(_step_instruction(keys, texts))
+    # ** matches the node it starts from, leaf or not, so leaves can match
+    # the rest of the query only if it consists of ** alone
+    keep_leaves = True
+    for pc in reversed(range(len(program))):
+        op = program[pc][0]
+        if op is QUERY_RECURSIVE:
+            program[pc] = (op, keep_leaves)
+        else:
+            keep_leaves = False
+    return tuple(program)
+
+
+# Values that wildcards and ** descend into
+_CONTAINER_TYPES = (dict, list, tuple, Mapping)
+
+# Common leaf types, skipped by ** without an isinstance check
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None), bytes})
+
+
+def _children(value: Any) -> Iterable[Any]:
+    """Child values visited by wildcards: dict values or list/tuple items."""
+    if isinstance(value, dict):
+        return value.values()
+    if isinstance(value, (list, tuple)):
+        return value
+    if isinstance(value, Mapping):
+        return value.values()
+    return ()
+
 
+def _walk(value: Any, step: Tuple[Any, ...]) -> Any:
+    """Walk one QUERY_STEP, returning _MISSING if it does not match."""
+    keys, texts, has_index = step
+    try:
+        if not has_index:
+            for key in keys:
+                value = value[key]
+            return value
+        # Integer segments index lists and tuples, and are plain keys elsewhere
+        for key, text in zip(keys, texts):
+            if key.__class__ is int and isinstance(value, (list, tuple)):
+                value = value[key]
+            else:
+                value = value[text]
+    except (KeyError, IndexError, TypeError):
+        return _MISSING
+    return value
 
-def flatten_dict(data: Dict[str, Any], separator: str = ".") -> Dict[str, Any]:
+
+def _iter_descendants(value: Any, keep_leaves: bool) -> Iterator[Any]:
+    """
+    Lazy pre-order walk of value and its descendants, as ** visits them.
+    
+    Unless keep_leaves is set (nothing but ** follows), only containers
+    can match the rest of the query, so leaves are skipped.
+    """
+    containers = _CONTAINER_TYPES
+    scalars = _SCALAR_TYPES
+    if not keep_leaves and not isinstance(value, containers):
+        return
+    yield value
+    # Stack of iterators over the children still to visit at each depth
+    stack = [iter(_children(value))]
+    while stack:
+        for child in stack[-1]:
+            if child.__class__ in scalars:
+                if keep_leaves:
+                    yield child
+                continue
+            if not isinstance(child, containers):
+                if keep_leaves:
+                    yield child
+                continue
+            yield child
+            stack.append(iter(child.values() if child.__class__ is dict else _children(child)))
+            break
+        else:
+            stack.pop()
+
+
+def _iter_query(program: Tuple[Tuple[str, Any], ...], documents: Iterable[Any]) -> Iterator[Any]:
+    """
+    Pull-based evaluation of a query program, yielding matches one by one.
+    
+    Keeps a stack of (instruction index, iterator over the values reaching
+    it), so only the path to the current match is held, and nothing past
+    the last requested match is evaluated. Documents are consumed one at a
+    time, as the matches are requested.
+    """
+    end = len(program)
+    walk = _walk
+    stack = [(0, iter(documents))]
+    while stack:
+        start, values = stack[-1]
+        for value in values:
+            # Steps match at most once, so they are applied inline
+            pc = start
+            while pc < end:
+                op, arg = program[pc]
+                if op is not QUERY_STEP:
+                    break
+                value = walk(value, arg)
+                if value is _MISSING:
+                    break
+                pc += 1
+            else:
+                yield value
+                continue
+            if value is _MISSING:
+                continue
+            if op is QUERY_WILDCARD:
+                stack.append((pc + 1, iter(value if isinstance(value, list) else _children(value))))
+            else:
+                stack.append((pc + 1, _iter_descendants(value, arg)))
+            break
+        else:
+            stack.pop()
+
+
+class PathQuery:
+    """
+    Compiled path query matching any number of values in nested data.
+    
+    A query is a dot-separated sequence of segments:
+    
+    - ``key``: dict key (escape a literal dot as ``\\.`` and a
+      backslash as ``\\\\``)
+    - ``0`` / ``-1``: list index (or the key "0" on a dict)
+    - ``*``: every value of a dict or item of a list
+    - ``**``: the current node and all its descendants, at any depth
+    
+    The query is compiled once into a short instruction sequence, in which
+    runs of plain keys and indices form a single step. Calling the query
+    evaluates it lazily, stopping as soon as the caller stops iterating
+    (so first() returns at the first match).
+    
+    Attributes:
+        query: Original query string
+        program: Tuple of (opcode, argument) instructions
+        
+    Example:
+        >>> skus = compile_query("orders.*.items.0.sku")
+        >>> list(skus({'orders': [{'items': [{'sku': 'A'}]}, {'items': [{'sku': 'B'}]}]}))
+        ['A', 'B']
+    """
+    
+    __slots__ = ("query", "program", "_single_step")
+    
+    def __init__(self, query: str):
+        self.query = query
+        self.program = _compile_query_program(query)
+        # Queries without wildcards match at most once and skip the walk
+        self._single_step = None
+        if len(self.program) == 1 and self.program[0][0] is QUERY_STEP:
+            self._single_step = self.program[0][1]
+    
+    def __call__(self, data: Any) -> Iterator[Any]:
+        """
+        Iterate over every value matching the query, in document order.
+        
+        Args:
+            data: Nested dicts/lists to search
+            
+        Returns:
+            Generator over the matching values (missing keys, out-of-range
+            indices and non-container values simply produce no match);
+            the document is only walked as far as the matches requested
+        """
+        return _iter_query(self.program, (data,))
+    
+    def iter_many(self, documents: Iterable[Any]) -> Iterator[Any]:
+        """
+        Lazily yield the matches in each of many documents, in order.
+        
+        Equivalent to chaining self(document) for every document, without
+        creating a generator per document. Documents are consumed one at
+        a time, as the matches are requested.
+        
+        Args:
+            documents: Iterable of nested dicts/lists
+            
+        Returns:
+            Generator over the matching values of all documents
+        """
+        return _iter_query(self.program, documents)
+    
+    def first(self, data: Any, default: Any = None) -> Any:
+        """Return the first matching value, or default if nothing matches."""
+        if self._single_step is not None:
+            value = _walk(data, self._single_step)
+            return default if value is _MISSING else value
+        return next(self(data), default)
+    
+    def findall(self, data: Any) -> List[Any]:
+        """Return all matching values as a list."""
+        return list(_iter_query(self.program, (data,)))
+    
+    def __repr__(self) -> str:
+        return f"PathQuery({self.query!r})"
+
+
+def compile_query(query: str) -> PathQuery:
+    """
+    Compile a path query with indices, wildcards and recursive descent.
+    
+    Args:
+        query: Query such as "orders.*.items.0.sku" or "**.id"
+            (see PathQuery for the syntax)
+        
+    Returns:
+        PathQuery; call it on data to get a generator of matches
+        
+    Example:
+        >>> ids = compile_query("**.id")
+        >>> list(ids({'id': 1, 'child': {'id': 2}}))
+        [1, 2]
+    """
+    return PathQuery(query)
+
+
+_cached_compile_query = lru_cache(maxsize=PATH_CACHE_SIZE)(compile_query)
+
+
+def query_nested(data: Any, query: str) -> Iterator[Any]:
+    """
+    Lazily yield every value in nested data matching a path query.
+    
+    Compiled queries are kept in a bounded LRU cache (PATH_CACHE_SIZE
+    entries), like the paths of get_nested.
+    
+    Args:
+        data: Nested dicts/lists to search
+        query: Query such as "orders.*.items.0.sku" (see PathQuery)
+        
+    Returns:
+        Generator over the matching values, in document order
+        
+    Example:
+        >>> data = {'orders': [{'id': 1}, {'id': 2}]}
+        >>> list(query_nested(data, 'orders.*.id'))
+        [1, 2]
+    """
+    return _cached_compile_query(query)(data)
+
+
+def _build_path_trie(paths: Iterable[str], columns: Dict[str, List[Any]]) -> tuple:
+    """
+    Build a prefix trie of paths for extract_columns.
+    
+    Each node is a tuple (keys, children, terminal_columns, subtree_columns).
+    Chains of single-child nodes are collapsed, so keys is a tuple of one or
+    more keys walked in one step. terminal_columns receive the value at the
+    node and subtree_columns are every column at or below it (used to fill
+    defaults when the walk stops early).
+    """
+    root: Dict[str, Any] = {}
+    root_terminals = []
+    for path in paths:
+        column = columns[path]
+        keys = _cached_compile_path(path).keys
+        if not keys:
+            root_terminals.append(column)
+            continue
+        level = root
+        for i, key in enumerate(keys):
+            node = level.setdefault(key, [{}, [], []])
+            node[2].append(column)
+            if i == len(keys) - 1:
+                node[1].append(column)
+            level = node[0]
+    
+    def freeze(level):
+        nodes = []
+        for key, (children, terminals, subtree) in level.items():
+            keys = [key]
+            while len(children) == 1 and not terminals:
+                (key, (children, terminals, _)), = children.items()
+                keys.append(key)
+            nodes.append((tuple(keys), freeze(children), tuple(terminals), tuple(subtree)))
+        return tuple(nodes)
+    
+    return tuple(root_terminals), freeze(root)
+
+
+def extract_columns(
+    records: Iterable[Dict[str, Any]],
+    paths: Iterable[str],
+    default: Any = None,
+    as_numpy: bool = False,
+    dtypes: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Extract several dot-paths from many records into columns.
+    
+    Paths sharing a prefix are walked together, so "user.address.city"
+    and "user.address.zip" descend to "user.address" only once per record.
+    
+    Args:
+        records: Iterable of (nested) dictionaries
+        paths: Dot-separated paths to extract
+        default: Value used when a path is missing from a record
+        as_numpy: Return NumPy arrays instead of lists (requires numpy)
+        dtypes: Optional mapping of path to NumPy dtype; other columns
+            use dtype=object (only with as_numpy=True)
+        
+    Returns:
+        Dictionary mapping each path to its column of values
+        
+    Example:
+        >>> records = [{'user': {'id': 1}}, {'user': {'id': 2}}]
+        >>> extract_columns(records, ['user.id'])
+        {'user.id': [1, 2]}
+    """
+    columns: Dict[str, List[Any]] = {path: [] for path in paths}
+    root_terminals, root = _build_path_trie(columns, columns)
+    
+    for record in records:
+        for column in root_terminals:
+            column.append(record)
+        stack = [(root, record)]
+        while stack:
+            nodes, value = stack.pop()
+            for keys, children, terminals, subtree in nodes:
+                child = value
+                try:
+                    for key in keys:
+                        child = child[key]
+                except (KeyError, TypeError):
+                    for column in subtree:
+                        column.append(default)
+                    continue
+                for column in terminals:
+                    column.append(child)
+                if children:
+                    stack.append((children, child))
+    
+    if not as_numpy:
+        return columns
+    np = require_numpy("extract_columns(as_numpy=True)")
+    dtypes = dtypes or {}
+    result = {}
+    for path, column in columns.items():
+        array = np.empty(len(column), dtype=dtypes.get(path, object))
+        array[:] = column
+        result[path] = array
+    return result
+
+
+def convert_keys(
+    data: Any,
+    key_func: Callable[[str], str],
+    cache: Optional[Dict[str, str]] = None,
+) -> Any:
+    """
+    Return a copy of a nested dict/list structure with all keys converted.
+    
+    Dictionaries and lists are rebuilt in a single iterative pass (no
+    recursion limit); other values are shared with the input. Only string
+    keys are passed to key_func.
+    
+    Args:
+        data: Nested structure of dicts and lists
+        key_func: Function converting one key (e.g. camel_to_snake)
+        cache: Optional dict of already converted keys. Pass the same dict
+            across calls to convert each distinct key only once.
+        
+    Returns:
+        Converted copy of data
+        
+    Example:
+        >>> convert_keys({'userId': 1, 'tags': [{'tagName': 'a'}]}, camel_to_snake)
+        {'user_id': 1, 'tags': [{'tag_name': 'a'}]}
+    """
+    if cache is None:
+        cache = {}
+    
+    def copy_container(value):
+        # Returns an empty container to fill later, or None for leaves
+        if isinstance(value, dict):
+            new = {}
+        elif isinstance(value, list):
+            new = []
+        else:
+            return None
+        stack.append((value, new))
+        return new
+    
+    stack: List[Tuple[Any, Any]] = []
+    result = copy_container(data)
+    if result is None:
+        return data
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
+                if isinstance(key, str):
+                    new_key = cache.get(key)
+                    if new_key is None:
+                        new_key = cache[key] = key_func(key)
+                else:
+                    new_key = key
+                new_value = copy_container(value)
+                target[new_key] = value if new_value is None else new_value
+        else:
+            for value in source:
+                new_value = copy_container(value)
+                target.append(value if new_value is None else new_value)
+    return result
+
+
+def keys_to_snake(data: Any) -> Any:
+    """
+    Convert all keys of a nested structure from camelCase to snake_case.
+    
+    Uses camel_to_snake's memo cache, so keys repeated across calls are
+    converted once.
+    
+    Example:
+        >>> keys_to_snake({'userId': {'firstName': 'A'}})
+        {'user_id': {'first_name': 'A'}}
+    """
+    return convert_keys(data, _camel_to_snake_cached)
+
+
+def keys_to_camel(data: Any) -> Any:
+    """
+    Convert all keys of a nested structure from snake_case to camelCase.
+    
+    Uses snake_to_camel's memo cache, so keys repeated across calls are
+    converted once.
+    
+    Example:
+        >>> keys_to_camel({'user_id': {'first_name': 'A'}})
+        {'userId': {'firstName': 'A'}}
+    """
+    return convert_keys(data, _snake_to_camel_cached)
+
+
+def _camel_to_snake_cached(key: str) -> str:
+    return camel_to_snake(key, cached=True)
+
+
+def _snake_to_camel_cached(key: str) -> str:
+    return snake_to_camel(key, cached=True)
+
+
+def iter_flat_items(
+    data: Dict[str, Any], separator: str = ".", flatten_lists: bool = False
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Lazily yield (flattened_key, value) pairs of a nested dictionary.
+    
+    Walks an explicit stack (no recursion limit) and builds each key prefix
+    once per nested container. Empty dicts (and empty lists when
+    flatten_lists is set) are yielded as leaf values.
+    
+    Args:
+        data: Nested dictionary to flatten
+        separator: Separator for nested keys (default: ".")
+        flatten_lists: Also descend into lists, using indices as keys
+        
+    Yields:
+        Tuples of (flattened key, leaf value) in depth-first order
+        
+    Example:
+        >>> list(iter_flat_items({'items': [{'id': 1}]}, flatten_lists=True))
+        [('items.0.id', 1)]
+    """
+    stack = [("", iter(data.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            key = prefix + (key if type(key) is str else str(key))
+            if isinstance(value, dict) and value:
+                stack.append((key + separator, iter(value.items())))
+                break
+            if flatten_lists and isinstance(value, list) and value:
+                stack.append((key + separator, enumerate(value)))
+                break
+            yield key, value
+        else:
+            stack.pop()
+
+
+def flatten_dict(
+    data: Dict[str, Any], separator: str = ".", flatten_lists: bool = False
+) -> Dict[str, Any]:
     """
     Flatten a nested dictionary using dot notation for keys.
     
     Args:
         data: Nested dictionary to flatten
         separator: Separator for nested keys (default: ".")
+        flatten_lists: Also descend into lists, using indices as keys
+            (e.g. "items.0.id")
         
     Returns:
         Flattened dictionary
@@ -56,5 +819,991 @@ def flatten_dict(data: Dict[str, Any], separator: str = ".") -> Dict[str, Any]:
         >>> flatten_dict({'a': {'b': {'c': 1}}})
         {'a.b.c': 1}
     """
-    # TODO: Implement flatten_dict logic
-    raise NotImplementedError("flatten_dict not yet implemented")
+    return _flatten_into({}, data, "", separator, flatten_lists)
+
+
+def _flatten_into(
+    result: Dict[str, Any], data: Any, prefix: str, separator: str, flatten_lists: bool
+) -> Dict[str, Any]:
+    """Add the flattened items of data to result, each key starting with prefix."""
+    # Same walk as iter_flat_items, inlined to avoid generator overhead
+    items = enumerate(data) if isinstance(data, list) else iter(data.items())
+    stack = [(prefix, items)]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            key = prefix + (key if type(key) is str else str(key))
+            if isinstance(value, dict) and value:
+                stack.append((key + separator, iter(value.items())))
+                break
+            if flatten_lists and isinstance(value, list) and value:
+                stack.append((key + separator, enumerate(value)))
+                break
+            result[key] = value
+        else:
+            stack.pop()
+    return result
+
+
+class RecordSchema:
+    """
+    Ordered, interned key set shared by flattened records.
+    
+    Holds the keys once (as interned strings) together with a key to
+    position index, so records only need to store their values.
+    
+    Example:
+        >>> schema = RecordSchema(['user.id', 'user.name'])
+        >>> schema.index['user.name']
+        1
+    """
+    
+    __slots__ = ("keys", "index")
+    
+    def __init__(self, keys: Iterable[str]):
+        self.keys = tuple(sys.intern(key) for key in keys)
+        self.index = {key: position for position, key in enumerate(self.keys)}
+        if len(self.index) != len(self.keys):
+            raise ValueError("schema keys must be unique")
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys)
+    
+    def __repr__(self) -> str:
+        return f"RecordSchema({list(self.keys)!r})"
+
+
+class FlatRecord(Mapping):
+    """
+    Compact, read-only flat record: a shared RecordSchema plus a value tuple.
+    
+    Supports the read-only dict API (lookup, get, in, iteration, items,
+    equality with dicts). Records are hashable when their values are, so
+    they can be deduplicated directly. Use to_dict() where a real dict is
+    needed.
+    
+    Example:
+        >>> record = FlatRecord(RecordSchema(['a.b', 'c']), (1, 2))
+        >>> record['a.b'], record.to_dict()
+        (1, {'a.b': 1, 'c': 2})
+    """
+    
+    __slots__ = ("schema", "values")
+    
+    def __init__(self, schema: RecordSchema, values: Tuple[Any, ...]):
+        if len(values) != len(schema.keys):
+            raise ValueError("values must match the schema keys")
+        self.schema = schema
+        self.values = values
+    
+    def __getitem__(self, key: str) -> Any:
+        return self.values[self.schema.index[key]]
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self.schema.index.get(key)
+        return default if position is None else self.values[position]
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self.schema.index
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.schema.keys)
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FlatRecord) and other.schema is self.schema:
+            return self.values == other.values
+        return Mapping.__eq__(self, other)
+    
+    def __hash__(self) -> int:
+        # Order-insensitive, like equality with records of another schema
+        return hash(frozenset(zip(self.schema.keys, self.values)))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain dict."""
+        return dict(zip(self.schema.keys, self.values))
+    
+    def __repr__(self) -> str:
+        return f"FlatRecord({self.to_dict()!r})"
+
+
+def flatten_records(
+    records: Iterable[Dict[str, Any]],
+    separator: str = ".",
+    flatten_lists: bool = False,
+    schemas: Optional[Dict[Tuple[str, ...], RecordSchema]] = None,
+) -> Iterator[FlatRecord]:
+    """
+    Lazily flatten records into FlatRecords that share interned schemas.
+    
+    Records with the same flattened keys (in the same order) share one
+    RecordSchema, so each record stores only a tuple of values instead of
+    a dict repeating every key string. For many records with a common
+    schema this takes a fraction of the memory of flatten_dict results.
+    
+    Args:
+        records: Nested dictionaries
+        separator: Separator for nested keys (default: ".")
+        flatten_lists: Also descend into lists, using indices as keys
+        schemas: Mapping of key tuple to RecordSchema, filled in as new
+            key sets are seen; pass the same dict to share schemas across
+            calls (default: a new mapping per call)
+    
+    Yields:
+        FlatRecord for each record
+    
+    Example:
+        >>> rows = list(flatten_records([{'a': {'b': 1}}, {'a': {'b': 2}}]))
+        >>> rows[0]['a.b'], rows[0].schema is rows[1].schema
+        (1, True)
+    """
+    if schemas is None:
+        schemas = {}
+    for record in records:
+        flat = _flatten_into({}, record, "", separator, flatten_lists)
+        keys = tuple(flat)
+        schema = schemas.get(keys)
+        if schema is None:
+            schema = RecordSchema(keys)
+            schemas[schema.keys] = schema
+        yield FlatRecord(schema, tuple(flat.values()))
+
+
+def _restore_lists(root: Dict[str, Any], owned: set) -> Any:
+    """Replace dicts created by unflatten_dict whose keys are 0..n-1 with lists."""
+    order = []
+    stack = [(None, None, root)]
+    while stack:
+        parent, key, node = stack.pop()
+        order.append((parent, key, node))
+        for child_key, child in node.items():
+            if isinstance(child, dict) and id(child) in owned:
+                stack.append((node, child_key, child))
+    
+    # Children come after their parents in order, so walk it backwards
+    for parent, key, node in reversed(order):
+        if not node or not all(isinstance(k, str) and k.isascii() and k.isdigit() for k in node):
+            continue
+        by_index = {int(k): v for k, v in node.items()}
+        if len(by_index) != len(node) or set(by_index) != set(range(len(node))):
+            continue
+        converted = [by_index[i] for i in range(len(node))]
+        if parent is None:
+            return converted
+        parent[key] = converted
+    return root
+
+
+def _unflatten_parent(
+    root: Dict[str, Any],
+    path: str,
+    separator: str,
+    parents: Dict[str, Dict[str, Any]],
+    owned: set,
+) -> Dict[str, Any]:
+    """Create (or copy) the dicts along path for unflatten_dict and return the last one."""
+    missing = [path]
+    while True:
+        head, found, _ = missing[-1].rpartition(separator)
+        if not found:
+            node = root
+            break
+        node = parents.get(head)
+        if node is not None:
+            break
+        missing.append(head)
+    
+    for prefix in reversed(missing):
+        key = prefix.rpartition(separator)[2]
+        child = node.get(key, _MISSING)
+        if child is _MISSING:
+            child = node[key] = {}
+            owned.add(id(child))
+        elif not isinstance(child, dict):
+            raise ValueError(f"Key conflict at {prefix!r}: value is not a dict")
+        elif id(child) not in owned:
+            child = node[key] = dict(child)
+            owned.add(id(child))
+        parents[prefix] = child
+        node = child
+    return node
+
+
+def unflatten_dict(
+    data: Dict[str, Any], separator: str = ".", restore_lists: bool = False
+) -> Any:
+    """
+    Rebuild a nested dictionary from flattened keys.
+    
+    Inverse of flatten_dict. Input values are never modified: dict values
+    that later keys descend into are copied first.
+    
+    Args:
+        data: Flattened dictionary
+        separator: Separator used in the flattened keys (default: ".")
+        restore_lists: Turn nested dicts whose keys are exactly "0".."n-1"
+            back into lists (inverse of flatten_lists=True)
+        
+    Returns:
+        Nested dictionary (or list, if restore_lists applies to the root)
+        
+    Raises:
+        ValueError: If a key is both a leaf and a prefix of another key
+        
+    Example:
+        >>> unflatten_dict({'a.b': 1, 'a.c': 2})
+        {'a': {'b': 1, 'c': 2}}
+    """
+    result: Dict[str, Any] = {}
+    owned = {id(result)}
+    # Parent dicts by flattened prefix, so shared prefixes are walked once
+    parents: Dict[str, Dict[str, Any]] = {}
+    for flat_key, value in data.items():
+        parent_path, found, last = flat_key.rpartition(separator)
+        if not found:
+            node = result
+        else:
+            node = parents.get(parent_path)
+            if node is None:
+                node = _unflatten_parent(result, parent_path, separator, parents, owned)
+        existing = node.get(last, _MISSING)
+        if existing is not _MISSING:
+            # Only an empty-dict leaf may coincide with an existing subtree
+            if value == {} and isinstance(existing, dict):
+                continue
+            raise ValueError(f"Key conflict at {flat_key!r}")
+        node[last] = value
+    if restore_lists:
+        return _restore_lists(result, owned)
+    return result
+
+
+class _Delete:
+    """Type of the DELETE marker in patches."""
+    
+    __slots__ = ()
+    
+    def __repr__(self) -> str:
+        return "DELETE"
+    
+    def __reduce__(self) -> str:
+        return "DELETE"
+
+
+# Patch value marking a removed key (see diff_nested)
+DELETE = _Delete()
+
+
+def diff_nested(
+    old: Dict[str, Any], new: Dict[str, Any], separator: str = "."
+) -> Dict[str, Any]:
+    """
+    Compute the changes between two nested dictionaries as a flat patch.
+    
+    Dicts present on both sides are walked key by key; any other value
+    (including lists) is compared with == and replaced as a whole.
+    Subtrees that are the same object are skipped without looking inside,
+    so diffing against the result of apply_patch only visits the dicts
+    that were copied, and each dict is visited once. The walk is
+    iterative, so deep nesting does not hit the recursion limit.
+    
+    Args:
+        old: Previous nested dictionary
+        new: Current nested dictionary
+        separator: Separator for nested keys (default: ".")
+    
+    Returns:
+        Dictionary of flattened path to new value, or DELETE for removed
+        keys; apply_patch(old, patch) rebuilds new
+    
+    Raises:
+        ValueError: If a key on a changed path is not a string or contains
+            the separator, since the patch could not be applied faithfully
+    
+    Example:
+        >>> diff_nested({'db': {'host': 'x', 'port': 1}, 'debug': True},
+        ...             {'db': {'host': 'x', 'port': 2}})
+        {'debug': DELETE, 'db.port': 2}
+    """
+    changes: Dict[str, Any] = {}
+    stack = [("", old, new)]
+    while stack:
+        prefix, old_node, new_node = stack.pop()
+        if old_node is new_node:
+            continue
+        for key, value in new_node.items():
+            previous = old_node.get(key, _MISSING)
+            if previous is value:
+                continue
+            if type(key) is not str or separator in key:
+                _check_patch_key(key, separator)
+            path = prefix + key
+            if isinstance(value, dict) and isinstance(previous, dict):
+                stack.append((path + separator, previous, value))
+            elif previous is _MISSING or previous != value:
+                changes[path] = value
+        for key in old_node:
+            if key not in new_node:
+                _check_patch_key(key, separator)
+                changes[prefix + key] = DELETE
+    return changes
+
+
+def _check_patch_key(key: Any, separator: str) -> None:
+    """Raise ValueError if key cannot be part of a patch path that round-trips."""
+    if not isinstance(key, str):
+        raise ValueError(f"Cannot diff non-string key {key!r}: patch paths are strings")
+    if separator in key:
+        raise ValueError(f"Cannot diff key {key!r}: it contains the separator {separator!r}")
+
+
+def _find_dict(root: Dict[str, Any], path: str, separator: str) -> Optional[Dict[str, Any]]:
+    """Return the dict at path, or None if the path is missing or not a dict."""
+    node: Any = root
+    for key in path.split(separator):
+        node = node.get(key) if isinstance(node, dict) else None
+    return node if isinstance(node, dict) else None
+
+
+def apply_patch(
+    data: Dict[str, Any], patch: Dict[str, Any], separator: str = "."
+) -> Dict[str, Any]:
+    """
+    Return a copy of a nested dictionary with a flat patch applied.
+    
+    Copy-on-write: only the dicts along patched paths are copied, and all
+    other subtrees are shared with data, which is never modified. Missing
+    parent dicts are created; deleting a missing key does nothing.
+    
+    Args:
+        data: Nested dictionary
+        patch: Flattened path to new value, or DELETE (as from diff_nested)
+        separator: Separator for nested keys (default: ".")
+    
+    Returns:
+        Patched nested dictionary
+    
+    Raises:
+        ValueError: If a path descends into a value that is not a dict
+    
+    Example:
+        >>> apply_patch({'db': {'host': 'x', 'port': 1}}, {'db.port': 2, 'debug': DELETE})
+        {'db': {'host': 'x', 'port': 2}}
+    """
+    result = dict(data)
+    owned = {id(result)}
+    # Parent dicts by flattened prefix, so shared prefixes are walked once
+    parents: Dict[str, Dict[str, Any]] = {}
+    for path, value in patch.items():
+        parent_path, found, last = path.rpartition(separator)
+        if not found:
+            node = result
+        else:
+            node = parents.get(parent_path)
+            if node is None:
+                if value is DELETE and _find_dict(result, parent_path, separator) is None:
+                    continue
+                node = _unflatten_parent(result, parent_path, separator, parents, owned)
+        existing = node.pop(last, None) if value is DELETE else node.get(last)
+        if value is not DELETE:
+            node[last] = value
+        if isinstance(existing, dict):
+            # A replaced subtree invalidates the cached parents below it
+            parents.clear()
+    return result
+
+
+class NestedIndex:
+    """
+    Flat path -> value index over a large, read-mostly nested document.
+    
+    The document is flattened once (as by flatten_dict) into a hash index
+    for O(1) leaf lookups, plus a sorted array of paths for prefix queries
+    with bisect. update() and delete() re-index only the changed subtree.
+    The index holds references to the document's leaf values, and does not
+    see later changes made to the document directly.
+    
+    Attributes:
+        separator: Separator used in paths
+        flatten_lists: Whether lists are indexed by position ("items.0.id")
+        
+    Example:
+        >>> index = NestedIndex({'db': {'host': 'x', 'port': 1}, 'debug': True})
+        >>> index['db.port']
+        1
+        >>> list(index.items_with_prefix('db'))
+        [('db.host', 'x'), ('db.port', 1)]
+    """
+    
+    __slots__ = ("separator", "flatten_lists", "_values", "_keys")
+    
+    def __init__(
+        self, data: Dict[str, Any], separator: str = ".", flatten_lists: bool = False
+    ):
+        self.separator = separator
+        self.flatten_lists = flatten_lists
+        self._values = _flatten_into({}, data, "", separator, flatten_lists)
+        self._keys = sorted(self._values)
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def __getitem__(self, path: str) -> Any:
+        value = self.get(path, _MISSING)
+        if value is _MISSING:
+            raise KeyError(path)
+        return value
+    
+    def __contains__(self, path: object) -> bool:
+        if path in self._values:
+            return True
+        return isinstance(path, str) and self._prefix_start(path) is not None
+    
+    def get(self, path: str, default: Any = None) -> Any:
+        """
+        Return the value at path, like get_nested on the original document.
+        
+        Leaf paths are a single hash lookup. A path to an inner dict is
+        rebuilt from its leaves (O(log n + size of the subtree)).
+        
+        Args:
+            path: Path of a leaf or inner node
+            default: Value returned if the path does not exist
+            
+        Returns:
+            Value at path, or default
+        """
+        value = self._values.get(path, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self._prefix_start(path) is None:
+            return default
+        offset = len(path) + len(self.separator) if path else 0
+        subtree = {key[offset:]: value for key, value in self.items_with_prefix(path)}
+        return unflatten_dict(subtree, self.separator, restore_lists=self.flatten_lists)
+    
+    def _prefix_start(self, path: str) -> Optional[int]:
+        """Position in the sorted keys of the first path below path, if any."""
+        prefix = path + self.separator if path else ""
+        keys = self._keys
+        start = bisect_left(keys, prefix)
+        if start < len(keys) and keys[start].startswith(prefix):
+            return start
+        return None
+    
+    def _prefix_range(self, path: str) -> Tuple[int, int]:
+        """Slice of the sorted keys holding every path strictly below path."""
+        keys = self._keys
+        if not path:
+            return 0, len(keys)
+        prefix = path + self.separator
+        start = bisect_left(keys, prefix)
+        # Keys with this prefix sort before the prefix with its last character incremented
+        end = bisect_left(keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        return start, end
+    
+    def keys_with_prefix(self, path: str) -> List[str]:
+        """
+        Return the leaf paths at or below path, in sorted order.
+        
+        Args:
+            path: Inner node or leaf path ("" for all paths)
+            
+        Returns:
+            Sorted list of leaf paths
+        """
+        start, end = self._prefix_range(path)
+        keys = self._keys[start:end]
+        if path in self._values:
+            keys.insert(0, path)
+        return keys
+    
+    def items_with_prefix(self, path: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Lazily yield (leaf path, value) pairs at or below path, sorted by path.
+        
+        Args:
+            path: Inner node or leaf path ("" for all paths)
+            
+        Yields:
+            Tuples of (leaf path, value)
+        """
+        values = self._values
+        for key in self.keys_with_prefix(path):
+            yield key, values[key]
+    
+    def _remove(self, path: str) -> None:
+        """Drop path and everything below it from both structures."""
+        values = self._values
+        keys = self._keys
+        start, end = self._prefix_range(path)
+        for key in keys[start:end]:
+            del values[key]
+        del keys[start:end]
+        if path in values:
+            del values[path]
+            del keys[bisect_left(keys, path)]
+    
+    def update(self, path: str, value: Any) -> None:
+        """
+        Replace the value (or whole subtree) at path and re-index only it.
+        
+        Leaves that were ancestors of path (including empty dicts) are
+        replaced, as setting a nested key in the document would.
+        
+        Args:
+            path: Path to set ("" replaces the whole document)
+            value: New leaf value or nested dict
+            
+        Raises:
+            ValueError: If path is "" and value is not a dict
+        """
+        separator = self.separator
+        if not path and not isinstance(value, dict):
+            raise ValueError("The document root must be a dict")
+        self._remove(path)
+        if path:
+            # An ancestor that was a leaf now becomes an inner node
+            head = path
+            while separator in head:
+                head = head.rpartition(separator)[0]
+                if head in self._values:
+                    self._remove(head)
+                    break
+        
+        is_container = isinstance(value, dict) or (self.flatten_lists and isinstance(value, list))
+        if not is_container or not value:
+            if path:
+                self._values[path] = value
+                insort(self._keys, path)
+            return
+        added = _flatten_into({}, value, path + separator if path else "", separator, self.flatten_lists)
+        self._values.update(added)
+        # The new paths share a prefix, so they form one contiguous run
+        start = self._prefix_range(path)[0]
+        self._keys[start:start] = sorted(added)
+    
+    def delete(self, path: str) -> None:
+        """
+        Remove the value (or whole subtree) at path.
+        
+        If this leaves the parent without children, the parent becomes an
+        empty dict leaf, as in flatten_dict. List items are not renumbered.
+        
+        Args:
+            path: Path to remove
+            
+        Raises:
+            KeyError: If path does not exist
+        """
+        if path not in self:
+            raise KeyError(path)
+        self._remove(path)
+        parent = path.rpartition(self.separator)[0]
+        if parent and self._prefix_start(parent) is None:
+            self._values[parent] = {}
+            insort(self._keys, parent)
+    
+    def to_dict(self) -> Any:
+        """Rebuild the nested document from the index."""
+        return unflatten_dict(self._values, self.separator, restore_lists=self.flatten_lists)
+    
+    def memory_footprint(self) -> Dict[str, int]:
+        """
+        Report the memory held by the index itself, in bytes.
+        
+        Values are shared with the document and not counted; path strings
+        are shared by both structures and counted once.
+        
+        Returns:
+            Dictionary with hash_index, sorted_keys, key_strings and total
+        """
+        hash_index = sys.getsizeof(self._values)
+        sorted_keys = sys.getsizeof(self._keys)
+        key_strings = sum(map(sys.getsizeof, self._keys))
+        return {
+            "hash_index": hash_index,
+            "sorted_keys": sorted_keys,
+            "key_strings": key_strings,
+            "total": hash_index + sorted_keys + key_strings,
+        }
+    
+    def __repr__(self) -> str:
+        return f"NestedIndex({len(self)} paths, separator={self.separator!r})"
+
+
+# Scalars serialized directly; exact types only (subclasses are normalized)
+_FINGERPRINT_SCALARS = frozenset({str, int, float, bool, type(None), bytes})
+
+# Nodes hashed as one payload: the values of a container plus those of the
+# child containers inlined into it. Children that do not fit get their own
+# digest, which Fingerprinter can reuse
+_FINGERPRINT_INLINE_BUDGET = 64
+
+# Container tags of the exact built-in types, checked before isinstance
+_FINGERPRINT_KINDS = {dict: "d", list: "l", tuple: "t", set: "s", frozenset: "s"}
+
+
+def _dumps(payload: Any) -> bytes:
+    # marshal format 2 tags every value with its type and, unlike later
+    # formats, has no reference or interning flags, so the bytes depend
+    # only on the content
+    return marshal.dumps(payload, 2)
+
+
+def _fingerprint_kind(value: Any) -> str:
+    """Return the container tag of value, or "" for scalars."""
+    kind = _FINGERPRINT_KINDS.get(type(value))
+    if kind is not None:
+        return kind
+    if isinstance(value, Mapping):
+        return "d"
+    if isinstance(value, list):
+        return "l"
+    if isinstance(value, tuple):
+        return "t"
+    if isinstance(value, (set, frozenset)):
+        return "s"
+    return ""
+
+
+def _fingerprint_scalar(value: Any) -> Any:
+    """Normalize a scalar subclass (e.g. an IntEnum member) to its base type."""
+    if isinstance(value, str):
+        return str.__str__(value)
+    for base in (int, float, bytes):
+        if isinstance(value, base):
+            return base(value)
+    raise TypeError(f"Object of type {type(value).__name__} cannot be fingerprinted")
+
+
+def _fingerprint_key(key: Any, digest_size: int) -> Any:
+    """Stand-in for a dict key: a scalar, or a (digest,) tuple for tuples and frozensets."""
+    if type(key) in _FINGERPRINT_SCALARS:
+        return key
+    if _fingerprint_kind(key):
+        return (_fingerprint_digest(key, digest_size, {}),)
+    return _fingerprint_scalar(key)
+
+
+def _type_repr_key(key: Any) -> Tuple[str, str]:
+    return (type(key).__name__, repr(key))
+
+
+def _sorted_items(node: Any, digest_size: int) -> Tuple[List[Any], List[Any]]:
+    """Keys (as stand-ins) and values of a mapping, in canonical key order."""
+    if _FINGERPRINT_SCALARS.issuperset(map(type, node.keys())):
+        try:
+            keys = sorted(node)
+        except TypeError:
+            keys = sorted(node, key=_type_repr_key)
+        return keys, list(map(node.__getitem__, keys))
+    items = [(_fingerprint_key(k, digest_size), v) for k, v in node.items()]
+    try:
+        # Stand-ins are distinct, so values are never compared
+        items.sort()
+    except TypeError:
+        items.sort(key=lambda item: _type_repr_key(item[0]))
+    return [k for k, _ in items], [v for _, v in items]
+
+
+def _fingerprint_fill(
+    values: List[Any],
+    budget: int,
+    digest_size: int,
+    children: Optional[List[Tuple[int, Any, str]]],
+) -> int:
+    """
+    Replace the non-scalar entries of values with their canonical forms.
+    
+    Child containers are inlined while they fit in budget nodes. The others
+    are appended to children as (position, child, kind), or, when children
+    is None, make the whole fill fail.
+    
+    Returns:
+        The unused budget, or -1 if the fill failed
+    """
+    scalars = _FINGERPRINT_SCALARS
+    if scalars.issuperset(map(type, values)):
+        return budget
+    if len(values) > 16:
+        # Positions of non-scalar values, found without a Python-level loop
+        positions = compress(count(), map(not_, map(scalars.__contains__, map(type, values))))
+    else:
+        positions = range(len(values))
+    for position in positions:
+        value = values[position]
+        if type(value) in scalars:
+            continue
+        kind = _FINGERPRINT_KINDS.get(type(value)) or _fingerprint_kind(value)
+        if not kind:
+            values[position] = _fingerprint_scalar(value)
+            continue
+        inline, remaining = _fingerprint_inline(value, kind, budget, digest_size)
+        if inline is not None:
+            values[position] = inline
+            budget = remaining
+        elif children is None:
+            return -1
+        else:
+            children.append((position, value, kind))
+    return budget
+
+
+def _fingerprint_inline(
+    value: Any, kind: str, budget: int, digest_size: int
+) -> Tuple[Optional[Tuple[Any, ...]], int]:
+    """
+    Canonical form of a dict, list or tuple whose subtree fits in budget nodes.
+    
+    Returns:
+        The form and the unused budget, or (None, budget) if it does not fit
+    """
+    if kind == "s" or len(value) > budget:
+        return None, budget
+    if kind == "d":
+        keys, values = _sorted_items(value, digest_size)
+    else:
+        keys, values = None, list(value)
+    remaining = _fingerprint_fill(values, budget - len(values), digest_size, None)
+    if remaining < 0:
+        return None, budget
+    return (kind, values) if keys is None else (kind, keys, values), remaining
+
+
+def _fingerprint_payload(
+    node: Any, kind: str, digest_size: int
+) -> Tuple[Optional[List[Any]], List[Any], List[Tuple[int, Any, str]]]:
+    """
+    Canonical keys (None unless a mapping) and values of one container.
+    
+    Child containers are inlined while the payload stays within
+    _FINGERPRINT_INLINE_BUDGET nodes, in canonical order, so whether a
+    child is inlined depends only on the content. Sets have no canonical
+    order until their values are sorted, so their children are never
+    inlined. For the others, also returns their (position, child, kind),
+    whose position in values is filled with the child's digest before
+    hashing.
+    """
+    if kind == "d":
+        keys, values = _sorted_items(node, digest_size)
+    else:
+        keys, values = None, list(node)
+    children: List[Tuple[int, Any, str]] = []
+    budget = -1 if kind == "s" else _FINGERPRINT_INLINE_BUDGET - len(values)
+    _fingerprint_fill(values, budget, digest_size, children)
+    return keys, values, children
+
+
+def _fingerprint_digest(
+    data: Any,
+    digest_size: int,
+    digests: Dict[int, bytes],
+    refs: Optional[Dict[int, Tuple[Any, Tuple[int, ...]]]] = None,
+) -> bytes:
+    """
+    Digest of data in one iterative post-order walk.
+    
+    Container digests are stored in digests by id, and containers already
+    there are not walked again. When refs is given, each new entry also
+    records the container (keeping its id valid) and its child containers.
+    """
+    kind = _fingerprint_kind(data)
+    if not kind:
+        if type(data) not in _FINGERPRINT_SCALARS:
+            data = _fingerprint_scalar(data)
+        return blake2b(b"v" + _dumps(data), digest_size=digest_size).digest()
+    active = set()
+    stack = [(data, kind, None)]
+    while stack:
+        node, kind, payload = stack.pop()
+        node_id = id(node)
+        if payload is None:
+            if node_id in digests:
+                continue
+            if node_id in active:
+                raise ValueError("cannot fingerprint a cyclic structure")
+            payload = _fingerprint_payload(node, kind, digest_size)
+            pending = [child for child in payload[2] if id(child[1]) not in digests]
+            if pending:
+                # Revisit once the children have digests
+                active.add(node_id)
+                stack.append((node, kind, payload))
+                stack.extend((child, child_kind, None) for _, child, child_kind in pending)
+                continue
+        else:
+            active.discard(node_id)
+        keys, values, children = payload
+        for position, child, _ in children:
+            values[position] = (digests[id(child)],)
+        if kind == "s":
+            values.sort(key=_dumps)
+        encoded = _dumps(values if keys is None else (keys, values))
+        digests[node_id] = blake2b(kind.encode() + encoded, digest_size=digest_size).digest()
+        if refs is not None:
+            refs[node_id] = (node, tuple(id(child) for _, child, _ in children))
+    return digests[id(data)]
+
+
+def _check_bits(bits: int) -> None:
+    if bits % 8 or not 8 <= bits <= 512:
+        raise ValueError("bits must be a multiple of 8 between 8 and 512")
+
+
+def _digest_size(bits: int) -> int:
+    # Child digests keep at least 128 bits even for short fingerprints
+    return max(bits // 8, 16)
+
+
+def fingerprint(data: Any, bits: int = 64) -> int:
+    """
+    Stable content hash of a nested structure.
+    
+    Large containers are hashed once each (BLAKE2b over their scalars,
+    the small containers inlined into them, and the digests of the other
+    child containers) in one iterative walk. The result does not depend on
+    hash randomization, so it is the same across processes and runs, and
+    it equals Fingerprinter(data).fingerprint().
+    
+    The walk runs in Python, so a one-off fingerprint of dict-heavy data
+    costs more than hashing json.dumps(data, sort_keys=True); use it where
+    json cannot tell values apart (tuples, sets, bytes, non-string keys),
+    and use Fingerprinter to detect changes in a long-lived structure,
+    where only the changed path is rehashed.
+    
+    Dict (and set) ordering is ignored; list order matters, and lists and
+    tuples differ. Scalars are compared by type and value, so 1, 1.0 and
+    True give different fingerprints.
+    
+    Args:
+        data: Dicts (or other mappings), lists, tuples, sets and scalars
+            (str, int, float, bool, None, bytes)
+        bits: Size of the fingerprint (default: 64; 128 for fewer
+            collisions across very large collections)
+    
+    Returns:
+        Non-negative integer below 2**bits
+    
+    Raises:
+        TypeError: For values of any other type
+        ValueError: For cyclic structures
+    
+    Example:
+        >>> fingerprint({'a': 1, 'b': [1, 2]}) == fingerprint({'b': [1, 2], 'a': 1})
+        True
+    """
+    _check_bits(bits)
+    digest = _fingerprint_digest(data, _digest_size(bits), {})
+    return int.from_bytes(digest[:bits // 8], "big")
+
+
+class Fingerprinter:
+    """
+    Incrementally maintained fingerprint of a nested structure.
+    
+    Container digests are kept between calls, so after update() only the
+    changed subtree and its ancestors are rehashed. For changes made to
+    data directly, call invalidate() with the path of each modified
+    container.
+    
+    Attributes:
+        data: Structure being fingerprinted
+        bits: Size of the fingerprint
+    
+    Example:
+        >>> tracker = Fingerprinter({'db': {'host': 'x'}, 'cache': {'ttl': 60}})
+        >>> before = tracker.fingerprint()
+        >>> tracker.update('cache.ttl', 30) != before
+        True
+    """
+    
+    __slots__ = ("data", "bits", "_digests", "_refs")
+    
+    def __init__(self, data: Any, bits: int = 64):
+        _check_bits(bits)
+        self.data = data
+        self.bits = bits
+        self._digests: Dict[int, bytes] = {}
+        self._refs: Dict[int, Tuple[Any, Tuple[int, ...]]] = {}
+    
+    def fingerprint(self) -> int:
+        """Return the fingerprint of data, rehashing only invalidated containers."""
+        digest = _fingerprint_digest(self.data, _digest_size(self.bits), self._digests, self._refs)
+        return int.from_bytes(digest[:self.bits // 8], "big")
+    
+    def _resolve(self, path: str) -> List[Any]:
+        """Return the containers from the root down to path (inclusive)."""
+        nodes = [self.data]
+        if path:
+            for key in path.split("."):
+                node = nodes[-1]
+                nodes.append(node[int(key)] if isinstance(node, (list, tuple)) else node[key])
+        return nodes
+    
+    def _forget(self, node_ids: Iterable[int]) -> None:
+        """Drop cached digests of the given containers and everything hashed below them."""
+        stack = list(node_ids)
+        while stack:
+            entry = self._refs.pop(stack.pop(), None)
+            if entry is not None:
+                del self._digests[id(entry[0])]
+                stack.extend(entry[1])
+    
+    def _forget_one(self, node: Any) -> None:
+        if self._refs.pop(id(node), None) is not None:
+            del self._digests[id(node)]
+    
+    def invalidate(self, path: str = "") -> None:
+        """
+        Forget cached digests after data was modified in place.
+        
+        Args:
+            path: Dot path of the modified container ("" for the root);
+                integer segments index lists
+        """
+        nodes = self._resolve(path)
+        for node in nodes[:-1]:
+            self._forget_one(node)
+        self._forget([id(nodes[-1])])
+    
+    def update(self, path: str, value: Any) -> int:
+        """
+        Set the value at path and return the new fingerprint.
+        
+        Args:
+            path: Dot path of a key (added if missing) or list index
+                (e.g. "db.port" or "servers.0"); "" replaces the root
+            value: New value
+        
+        Returns:
+            Fingerprint of the updated data
+        
+        Raises:
+            KeyError, IndexError: If the parent of path does not exist
+        """
+        if not path:
+            self._forget([id(self.data)])
+            self.data = value
+            return self.fingerprint()
+        parent_path, _, key = path.rpartition(".")
+        nodes = self._resolve(parent_path)
+        parent = nodes[-1]
+        if isinstance(parent, list):
+            key = int(key)
+            old = parent[key]
+        else:
+            old = parent.get(key)
+        # Forget the replaced subtree before it can be freed and its ids reused
+        self._forget([id(old)])
+        parent[key] = value
+        for node in nodes:
+            self._forget_one(node)
+        return self.fingerprint()
+    
+    def __repr__(self) -> str:
+        return f"Fingerprinter(bits={self.bits}, cached={len(self._digests)})"
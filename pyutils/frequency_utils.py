@@ -0,0 +1,447 @@
+"""Bounded-memory frequency counting for very large streams.
+
+SpaceSaving finds the most frequent items (heavy hitters) with a fixed
+number of counters, and CountMinSketch estimates the count of any item in
+a fixed-size table. Both have configurable error bounds, can be merged
+(e.g. partial results from worker processes) and round-trip through
+to_dict/from_dict for shipping between nodes.
+"""
+
+import heapq
+import itertools
+import math
+from array import array
+from collections import Counter
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from pyutils.dict_utils import fingerprint
+
+# Items pre-aggregated with a Counter per update() batch
+_UPDATE_BATCH = 1 << 16
+
+
+def _check_error(error: float) -> None:
+    if not 0 < error < 1:
+        raise ValueError("error parameter must be between 0 and 1")
+
+
+def _check_count(value: int) -> None:
+    if value <= 0:
+        raise ValueError("count parameter must be positive")
+
+
+def _iter_batch_counts(data: Iterable[Hashable]) -> Iterable[Tuple[Hashable, int]]:
+    """Yield (item, occurrences) for each distinct item of each batch of data."""
+    iterator = iter(data)
+    while True:
+        batch = Counter(itertools.islice(iterator, _UPDATE_BATCH))
+        if not batch:
+            return
+        yield from batch.items()
+
+
+class SpaceSaving:
+    """
+    Approximate top-k counter using a fixed number of counters.
+    
+    Implements the Space-Saving algorithm: once all capacity counters are
+    used, a new item takes over the counter of the least frequent tracked
+    item. Reported counts never undercount, and overcount by at most
+    error * total, so every item occurring more than error * total times
+    is tracked. Memory is O(1 / error) regardless of the stream.
+    
+    Attributes:
+        error: Maximum overcount, as a fraction of total
+        capacity: Number of counters, ceil(1 / error)
+        total: Sum of all counts added
+    
+    Example:
+        >>> top = SpaceSaving(error=0.01)
+        >>> top.update(["/home", "/about", "/home", "/cart", "/home"])
+        >>> top.top_k(2)
+        [('/home', 3), ('/about', 1)]
+    """
+    
+    __slots__ = ("error", "capacity", "total", "_counts", "_errors", "_heap", "_order")
+    
+    def __init__(self, error: float = 0.001):
+        _check_error(error)
+        self.error = error
+        self.capacity = math.ceil(1 / error)
+        self.total = 0
+        self._counts: Dict[Hashable, int] = {}
+        # Overcount of each tracked item: the count it inherited on takeover
+        self._errors: Dict[Hashable, int] = {}
+        self._reset_heap()
+    
+    def _reset_heap(self) -> None:
+        # Min-heap of (count, tiebreak, item). Counts only grow, so an entry
+        # may be stale; it is refreshed when it reaches the top.
+        self._order = itertools.count()
+        order = self._order
+        self._heap = [(value, next(order), item) for item, value in self._counts.items()]
+        heapq.heapify(self._heap)
+    
+    def _pop_min(self) -> Tuple[int, Hashable]:
+        heap = self._heap
+        counts = self._counts
+        while True:
+            value, _, item = heap[0]
+            current = counts[item]
+            if value == current:
+                heapq.heappop(heap)
+                return value, item
+            heapq.heapreplace(heap, (current, next(self._order), item))
+    
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """
+        Add occurrences of a hashable item.
+        
+        Args:
+            item: Item to count
+            count: Number of occurrences (default: 1)
+        """
+        _check_count(count)
+        counts = self._counts
+        self.total += count
+        if item in counts:
+            counts[item] += count
+            return
+        inherited = 0
+        if len(counts) >= self.capacity:
+            inherited, victim = self._pop_min()
+            del counts[victim]
+            del self._errors[victim]
+        counts[item] = inherited + count
+        self._errors[item] = inherited
+        heapq.heappush(self._heap, (inherited + count, next(self._order), item))
+    
+    def update(self, data: Iterable[Hashable]) -> None:
+        """
+        Count every item of an iterable.
+        
+        Items are aggregated in batches before updating the counters, so
+        repeated items cost one dict increment each.
+        
+        Args:
+            data: Hashable items
+        """
+        counts = self._counts
+        add = self.add
+        for item, occurrences in _iter_batch_counts(data):
+            if item in counts:
+                counts[item] += occurrences
+                self.total += occurrences
+            else:
+                add(item, occurrences)
+    
+    def __getitem__(self, item: Hashable) -> int:
+        """Estimated count of item (0 if it is not tracked)."""
+        return self._counts.get(item, 0)
+    
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._counts
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+    
+    def _min_count(self) -> int:
+        """Upper bound on the count of any untracked item."""
+        if len(self._counts) < self.capacity:
+            return 0
+        return min(self._counts.values())
+    
+    def bounds(self, item: Hashable) -> Tuple[int, int]:
+        """
+        Guaranteed range of the true count of item.
+        
+        Returns:
+            Tuple of (lower bound, upper bound)
+        """
+        if item in self._counts:
+            value = self._counts[item]
+            return value - self._errors[item], value
+        return 0, self._min_count()
+    
+    def top_k(self, k: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """
+        Most frequent tracked items with their estimated counts.
+        
+        An item certainly belongs to the true top k if its lower bound
+        (see bounds) is at least the estimated count of the (k+1)-th item.
+        
+        Args:
+            k: Number of items (default: all tracked items)
+        
+        Returns:
+            List of (item, count), most frequent first
+        """
+        items = self._counts.items()
+        if k is None:
+            return sorted(items, key=lambda pair: pair[1], reverse=True)
+        return heapq.nlargest(k, items, key=lambda pair: pair[1])
+    
+    def merge(self, other: "SpaceSaving") -> None:
+        """
+        Add the counts of another SpaceSaving (e.g. from another worker).
+        
+        An item missing from one summary is assumed to have the largest
+        count that summary could have dropped, so the merged counts keep
+        the same guarantees, with error bounds adding up.
+        
+        Args:
+            other: Summary of another part of the stream
+        """
+        own_min = self._min_count()
+        other_min = other._min_count()
+        merged = []
+        for item in self._counts.keys() | other._counts.keys():
+            merged.append((
+                self._counts.get(item, own_min) + other._counts.get(item, other_min),
+                self._errors.get(item, own_min) + other._errors.get(item, other_min),
+                item,
+            ))
+        kept = heapq.nlargest(self.capacity, merged, key=lambda entry: entry[0])
+        self._counts = {item: value for value, _, item in kept}
+        self._errors = {item: overcount for _, overcount, item in kept}
+        self.total += other.total
+        self._reset_heap()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializable state, JSON-compatible when the items are strings or numbers.
+        
+        Returns:
+            Dictionary accepted by from_dict
+        """
+        return {
+            "error": self.error,
+            "total": self.total,
+            "counters": [
+                [item, value, self._errors[item]] for item, value in self.top_k()
+            ],
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "SpaceSaving":
+        """
+        Rebuild a SpaceSaving from to_dict output.
+        
+        Args:
+            state: Dictionary produced by to_dict
+        
+        Returns:
+            New SpaceSaving
+        """
+        summary = cls(state["error"])
+        if len(state["counters"]) > summary.capacity:
+            raise ValueError("more counters than the capacity allows")
+        summary.total = state["total"]
+        for item, value, overcount in state["counters"]:
+            summary._counts[item] = value
+            summary._errors[item] = overcount
+        summary._reset_heap()
+        return summary
+    
+    def __repr__(self) -> str:
+        return f"SpaceSaving(error={self.error!r}, tracked={len(self)}, total={self.total})"
+
+
+def _stable_hash(item: Hashable) -> bytes:
+    """128-bit hash of item that does not depend on hash randomization."""
+    if type(item) is str:
+        return blake2b(item.encode("utf-8", "surrogatepass"), digest_size=16, person=b"str").digest()
+    if type(item) is bytes:
+        return blake2b(item, digest_size=16, person=b"bytes").digest()
+    return fingerprint(item, bits=128).to_bytes(16, "big")
+
+
+def _sketch_key(item: Any) -> Hashable:
+    """
+    Key grouping the items of an update() batch.
+    
+    Items with equal keys have equal _stable_hash. Grouping by the items
+    themselves would merge 1, True and 1.0 (or 0.0 and -0.0), which equal
+    each other but hash differently.
+    """
+    item_type = type(item)
+    if item_type is str:
+        return item
+    if item_type is float:
+        return (float, item.hex(), item)
+    if item_type is int or item_type is bool or item_type is bytes or item is None:
+        return (item_type, item)
+    return (_stable_hash(item),)
+
+
+def _sketch_digest(key: Hashable) -> bytes:
+    """_stable_hash of the items grouped under a _sketch_key."""
+    if type(key) is str:
+        return _stable_hash(key)
+    if len(key) == 1:
+        return key[0]
+    return _stable_hash(key[-1])
+
+
+class CountMinSketch:
+    """
+    Fixed-size table estimating the count of any item.
+    
+    Each item increments one counter in each of depth rows. Estimates
+    never undercount, and overcount by at most error * total with
+    probability confidence. Items are hashed with BLAKE2b (or
+    dict_utils.fingerprint for non-strings), so sketches built in
+    different processes can be merged.
+    
+    Attributes:
+        error: Maximum overcount, as a fraction of total
+        confidence: Probability that an estimate is within the error bound
+        width: Counters per row, ceil(e / error)
+        depth: Number of rows, ceil(ln(1 / (1 - confidence)))
+        total: Sum of all counts added
+    
+    Example:
+        >>> sketch = CountMinSketch(error=0.01)
+        >>> sketch.update(["a", "b", "a"])
+        >>> sketch["a"]
+        2
+    """
+    
+    __slots__ = ("error", "confidence", "width", "depth", "total", "_table")
+    
+    def __init__(self, error: float = 0.001, confidence: float = 0.99):
+        _check_error(error)
+        if not 0 < confidence < 1:
+            raise ValueError("confidence parameter must be between 0 and 1")
+        self.error = error
+        self.confidence = confidence
+        self.width = math.ceil(math.e / error)
+        self.depth = max(1, math.ceil(math.log(1 / (1 - confidence))))
+        self.total = 0
+        self._table = array("Q", bytes(8 * self.width * self.depth))
+    
+    def _positions(self, digest: bytes) -> List[int]:
+        # Double hashing: row i uses column (h1 + i * h2) % width
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+    
+    def add(self, item: Hashable, count: int = 1) -> None:
+        """
+        Add occurrences of an item.
+        
+        Args:
+            item: String, bytes, or any value dict_utils.fingerprint accepts
+            count: Number of occurrences (default: 1)
+        """
+        _check_count(count)
+        self._add_digest(_stable_hash(item), count)
+    
+    def _add_digest(self, digest: bytes, count: int) -> None:
+        table = self._table
+        for pos in self._positions(digest):
+            table[pos] += count
+        self.total += count
+    
+    def update(self, data: Iterable[Hashable]) -> None:
+        """
+        Count every item of an iterable, hashing each distinct item once per batch.
+        
+        Args:
+            data: Items to count
+        """
+        for key, occurrences in _iter_batch_counts(map(_sketch_key, data)):
+            self._add_digest(_sketch_digest(key), occurrences)
+    
+    def __getitem__(self, item: Hashable) -> int:
+        """Estimated count of item."""
+        table = self._table
+        return min(table[pos] for pos in self._positions(_stable_hash(item)))
+    
+    def merge(self, other: "CountMinSketch") -> None:
+        """
+        Add the counts of another sketch with the same error and confidence.
+        
+        Args:
+            other: Sketch of another part of the stream
+        """
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("cannot merge sketches with different error or confidence")
+        table = self._table
+        for pos, value in enumerate(other._table):
+            if value:
+                table[pos] += value
+        self.total += other.total
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-compatible state.
+        
+        Returns:
+            Dictionary accepted by from_dict
+        """
+        return {
+            "error": self.error,
+            "confidence": self.confidence,
+            "total": self.total,
+            "table": self._table.tolist(),
+        }
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "CountMinSketch":
+        """
+        Rebuild a CountMinSketch from to_dict output.
+        
+        Args:
+            state: Dictionary produced by to_dict
+        
+        Returns:
+            New CountMinSketch
+        """
+        sketch = cls(state["error"], state["confidence"])
+        if len(state["table"]) != len(sketch._table):
+            raise ValueError("table size does not match error and confidence")
+        sketch._table = array("Q", state["table"])
+        sketch.total = state["total"]
+        return sketch
+    
+    def __repr__(self) -> str:
+        return (
+            f"CountMinSketch(error={self.error!r}, confidence={self.confidence!r}, "
+            f"total={self.total})"
+        )
+
+
+def top_k(
+    data: Iterable[Any],
+    k: int,
+    key: Optional[Callable[[Any], Hashable]] = None,
+    error: Optional[float] = None,
+) -> List[Tuple[Hashable, int]]:
+    """
+    Approximate most frequent items of a stream in bounded memory.
+    
+    A bounded-memory alternative to Counter(data).most_common(k), using
+    SpaceSaving.
+    
+    Args:
+        data: Iterable of items
+        k: Number of items to return
+        key: Function computing the value to count (e.g. a record's URL)
+        error: Maximum overcount as a fraction of the stream length
+            (default: 1 / max(1000, 10 * k))
+    
+    Returns:
+        List of (value, estimated count), most frequent first
+    
+    Example:
+        >>> top_k(["a", "b", "a", "c", "a", "b"], 2)
+        [('a', 3), ('b', 2)]
+    """
+    if k < 0:
+        raise ValueError("k parameter must not be negative")
+    summary = SpaceSaving(error if error is not None else 1 / max(1000, 10 * k))
+    summary.update(data if key is None else map(key, data))
+    return summary.top_k(k)
@@ -0,0 +1,314 @@
+"""Opt-in call instrumentation for the public pyutils functions.
+
+When enabled, the public functions are replaced (in their defining module
+and on the pyutils package) by wrappers that record call counts, latency
+histograms and input-size histograms. When disabled, the original
+functions are put back, so there is no overhead at all.
+
+Only the outermost instrumented call in a thread is recorded, so a public
+function calling another (flatten_list calling iter_flatten) counts once.
+For functions returning an iterator, the call is recorded when the
+iterator is exhausted or closed, and the latency is the time spent
+producing items rather than creating the iterator.
+
+Enable at runtime with enable(), or before startup by setting the
+PYUTILS_INSTRUMENTATION environment variable to 1/true/yes/on. Code that
+bound a function directly (``from pyutils import slugify``) before
+instrumentation was enabled keeps calling the original.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+ENV_VAR = "PYUTILS_INSTRUMENTATION"
+
+# Histogram upper bounds; values above the last bound count as "+Inf"
+LATENCY_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)  # seconds
+SIZE_BUCKETS = (0, 10, 100, 1_000, 10_000, 100_000, 1_000_000)  # len() of first argument
+
+_lock = threading.Lock()
+_stats: Dict[str, "_FunctionStats"] = {}
+# name -> (defining module, original function)
+_originals: Dict[str, Tuple[Any, Callable]] = {}
+# Set while an instrumented call runs in the current thread
+_active = threading.local()
+
+
+class _FunctionStats:
+    """Counters for one instrumented function."""
+    
+    __slots__ = (
+        "calls", "errors", "total_seconds", "latency_counts",
+        "sized_calls", "size_total", "size_counts",
+    )
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sized_calls = 0
+        self.size_total = 0
+        self.size_counts = [0] * (len(SIZE_BUCKETS) + 1)
+
+
+def _input_size(args: tuple) -> Optional[int]:
+    if not args:
+        return None
+    try:
+        return len(args[0])
+    except TypeError:
+        return None
+
+
+def _record(stats: _FunctionStats, elapsed: float, failed: bool, size: Optional[int]) -> None:
+    with _lock:
+        stats.calls += 1
+        stats.errors += failed
+        stats.total_seconds += elapsed
+        stats.latency_counts[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        if size is not None:
+            stats.sized_calls += 1
+            stats.size_total += size
+            stats.size_counts[bisect_left(SIZE_BUCKETS, size)] += 1
+
+
+def _timed_iter(
+    stats: _FunctionStats, iterator: Iterator, elapsed: float, size: Optional[int]
+) -> Iterator:
+    """Yield from iterator, adding the time spent in it to elapsed."""
+    timer = time.perf_counter
+    failed = False
+    try:
+        while True:
+            outer = getattr(_active, "value", False)
+            _active.value = True
+            start = timer()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                elapsed += timer() - start
+                _active.value = outer
+            yield item
+    finally:
+        _record(stats, elapsed, failed, size)
+
+
+def _wrap(name: str, func: Callable) -> Callable:
+    stats = _stats.setdefault(name, _FunctionStats())
+    timer = time.perf_counter
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_active, "value", False):
+            # Called from another instrumented function: not a separate call
+            return func(*args, **kwargs)
+        size = _input_size(args)
+        failed = True
+        _active.value = True
+        start = timer()
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+        finally:
+            elapsed = timer() - start
+            _active.value = False
+            if failed:
+                _record(stats, elapsed, failed, size)
+        if isinstance(result, Iterator):
+            return _timed_iter(stats, result, elapsed, size)
+        _record(stats, elapsed, failed, size)
+        return result
+    
+    wrapper.__pyutils_instrumented__ = True
+    return wrapper
+
+
+def _public_functions(names: Optional[Iterable[str]]) -> List[Tuple[str, Any, Callable]]:
+    import pyutils
+    selected = []
+    for name in names or pyutils.__all__:
+        func = getattr(pyutils, name)
+        if isinstance(func, type) or not callable(func):
+            continue
+        module = sys.modules[func.__module__]
+        selected.append((name, module, func))
+    return selected
+
+
+def is_enabled() -> bool:
+    """Return True if any function is currently instrumented."""
+    return bool(_originals)
+
+
+def enable(functions: Optional[Iterable[str]] = None) -> None:
+    """
+    Start recording calls to public pyutils functions.
+    
+    Args:
+        functions: Names from pyutils.__all__ to instrument (default: all
+            public functions; classes are skipped)
+    """
+    import pyutils
+    with _lock:
+        for name, module, func in _public_functions(functions):
+            if name in _originals:
+                continue
+            wrapper = _wrap(name, func)
+            _originals[name] = (module, func)
+            setattr(module, name, wrapper)
+            setattr(pyutils, name, wrapper)
+
+
+def disable() -> None:
+    """Restore the original functions. Recorded statistics are kept."""
+    import pyutils
+    with _lock:
+        for name, (module, func) in _originals.items():
+            setattr(module, name, func)
+            setattr(pyutils, name, func)
+        _originals.clear()
+
+
+def enable_from_env() -> bool:
+    """
+    Enable instrumentation if PYUTILS_INSTRUMENTATION is set to a true value.
+    
+    Returns:
+        True if instrumentation was enabled
+    """
+    if os.environ.get(ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on"):
+        enable()
+        return True
+    return False
+
+
+def reset() -> None:
+    """Clear all recorded statistics."""
+    with _lock:
+        for stats in _stats.values():
+            stats.__init__()
+
+
+def _bucket_labels(bounds: tuple) -> List[str]:
+    return [repr(bound) for bound in bounds] + ["+Inf"]
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Return a copy of the recorded statistics.
+    
+    Returns:
+        Dictionary mapping function name to calls, errors, total_seconds,
+        size_sum, and latency_buckets / size_buckets (count of calls per
+        bucket, keyed by the bucket's upper bound). Functions that have
+        not been called are omitted.
+    """
+    latency_labels = _bucket_labels(LATENCY_BUCKETS)
+    size_labels = _bucket_labels(SIZE_BUCKETS)
+    result = {}
+    with _lock:
+        for name, stats in _stats.items():
+            if not stats.calls:
+                continue
+            result[name] = {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "total_seconds": stats.total_seconds,
+                "latency_buckets": dict(zip(latency_labels, stats.latency_counts)),
+                "sized_calls": stats.sized_calls,
+                "size_sum": stats.size_total,
+                "size_buckets": dict(zip(size_labels, stats.size_counts)),
+            }
+    return result
+
+
+def _histogram_lines(metric: str, name: str, buckets: Dict[str, int], total: float, count: int) -> List[str]:
+    lines = []
+    cumulative = 0
+    for label, value in buckets.items():
+        cumulative += value
+        lines.append(f'{metric}_bucket{{function="{name}",le="{label}"}} {cumulative}')
+    lines.append(f'{metric}_sum{{function="{name}"}} {total}')
+    lines.append(f'{metric}_count{{function="{name}"}} {count}')
+    return lines
+
+
+def prometheus_text() -> str:
+    """
+    Render the recorded statistics in the Prometheus text exposition format.
+    
+    Returns:
+        Metrics text (calls, errors, latency and input-size histograms)
+    """
+    data = snapshot()
+    lines = [
+        "# HELP pyutils_calls_total Calls to instrumented pyutils functions.",
+        "# TYPE pyutils_calls_total counter",
+    ]
+    lines += [f'pyutils_calls_total{{function="{name}"}} {s["calls"]}' for name, s in data.items()]
+    lines += [
+        "# HELP pyutils_errors_total Calls that raised an exception.",
+        "# TYPE pyutils_errors_total counter",
+    ]
+    lines += [f'pyutils_errors_total{{function="{name}"}} {s["errors"]}' for name, s in data.items()]
+    lines += [
+        "# HELP pyutils_call_duration_seconds Call latency.",
+        "# TYPE pyutils_call_duration_seconds histogram",
+    ]
+    for name, s in data.items():
+        lines += _histogram_lines(
+            "pyutils_call_duration_seconds", name, s["latency_buckets"], s["total_seconds"], s["calls"]
+        )
+    lines += [
+        "# HELP pyutils_input_size Length of the first argument.",
+        "# TYPE pyutils_input_size histogram",
+    ]
+    for name, s in data.items():
+        lines += _histogram_lines(
+            "pyutils_input_size", name, s["size_buckets"], s["size_sum"], s["sized_calls"]
+        )
+    return "\n".join(lines) + "\n"
+
+
+def serve_metrics(port: int = 9464, addr: str = "127.0.0.1") -> Any:
+    """
+    Serve prometheus_text() over HTTP from a background daemon thread.
+    
+    Args:
+        port: Port to listen on (0 picks a free port)
+        addr: Address to bind (default: localhost only)
+        
+    Returns:
+        The running http.server.ThreadingHTTPServer; call shutdown() on it
+        to stop serving
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="pyutils-metrics", daemon=True)
+    thread.start()
+    return server
@@ -1,68 +1,636 @@
 """List manipulation utilities."""
 
-from typing import List, Any, TypeVar
+import math
+import operator
+from array import array
+from collections.abc import Mapping
+from hashlib import blake2b
+from itertools import islice
+from typing import (
+    List, Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple, TypeVar, Union,
+)
+
+from pyutils._compat import numpy_if_loaded
 
 T = TypeVar('T')
 
+# Inputs that iter_chunks slices through a memoryview instead of copying
+_BUFFER_TYPES = (bytes, bytearray, memoryview, array)
+
+
+def _numpy_for(data: Any) -> Any:
+    """Return the numpy module if data is an ndarray, else None."""
+    np = numpy_if_loaded()
+    if np is not None and isinstance(data, np.ndarray):
+        return np
+    return None
+
+
+def _check_chunk_size(chunk_size: int) -> int:
+    chunk_size = operator.index(chunk_size)
+    if chunk_size <= 0:
+        raise ValueError("chunk_size parameter must be positive")
+    return chunk_size
+
 
-def chunk_list(data: List[T], chunk_size: int) -> List[List[T]]:
+def _iter_sliced(data: Any, chunk_size: int) -> Iterator[Any]:
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+def _iter_islice(
+    data: Iterable[T], chunk_size: int, pad: bool, fillvalue: Any
+) -> Iterator[List[T]]:
+    iterator = iter(data)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        if pad and len(chunk) < chunk_size:
+            chunk.extend([fillvalue] * (chunk_size - len(chunk)))
+        yield chunk
+
+
+def iter_chunks(
+    data: Iterable[T],
+    chunk_size: int,
+    pad: bool = False,
+    fillvalue: Any = None,
+) -> Iterator[Any]:
+    """
+    Lazily split any iterable into chunks of specified size.
+    
+    bytes, bytearray, memoryview, array.array and NumPy arrays yield
+    zero-copy views (memoryview slices, or ndarray slices for NumPy).
+    Other inputs yield one list per chunk, built only when requested.
+    
+    Args:
+        data: Iterable to split into chunks
+        chunk_size: Size of each chunk
+        pad: Pad the final chunk to chunk_size with fillvalue
+            (not supported for buffer inputs, which are never copied)
+        fillvalue: Value used for padding (default: None)
+        
+    Returns:
+        Iterator over chunks
+        
+    Example:
+        >>> list(iter_chunks(range(5), 2, pad=True))
+        [[0, 1], [2, 3], [4, None]]
+    """
+    chunk_size = _check_chunk_size(chunk_size)
+    is_ndarray = _numpy_for(data) is not None
+    if is_ndarray or isinstance(data, _BUFFER_TYPES):
+        if pad:
+            raise ValueError("pad is not supported for buffer inputs")
+        view = data if is_ndarray else memoryview(data)
+        return _iter_sliced(view, chunk_size)
+    if isinstance(data, list) and not pad:
+        return _iter_sliced(data, chunk_size)
+    return _iter_islice(data, chunk_size, pad, fillvalue)
+
+
+def chunk_list(
+    data: List[T], chunk_size: int, lazy: bool = False
+) -> Union[List[List[T]], Iterator[List[T]]]:
     """
     Split a list into chunks of specified size.
     
+    A NumPy array is split along its first axis into views of the input
+    (like np.array_split, but with fixed-size chunks), so no data is copied;
+    converting a list to an array first would cost more than it saves.
+    
     Args:
-        data: List to split into chunks
+        data: List (or ndarray) to split into chunks
         chunk_size: Size of each chunk
+        lazy: Return an iterator producing one chunk at a time instead of
+            building every chunk up front (default: False)
         
     Returns:
-        List of chunks (each chunk is a list)
+        List of chunks (each chunk is a list, or an ndarray view for
+        ndarray input), or an iterator of chunks when lazy is True
         
     Example:
         >>> chunk_list([1, 2, 3, 4, 5], 2)
         [[1, 2], [3, 4], [5]]
     """
-    if chunk_size <= 0:
-        raise ValueError("chunk_size parameter must be positive")
+    chunk_size = _check_chunk_size(chunk_size)
+    if lazy:
+        return _iter_sliced(data, chunk_size)
     return [data[i:i+chunk_size] for i in range(0, len(data), chunk_size)]
 
 
-def flatten_list(nested_list: List[Any]) -> List[Any]:
+def iter_flatten(
+    nested: Iterable[Any],
+    container_types: Tuple[type, ...] = (list,),
+    max_depth: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Lazily flatten a nested iterable.
+    
+    Uses an explicit stack of iterators instead of recursion, so nesting
+    depth is not limited by the recursion limit and no intermediate lists
+    are built.
+    
+    Args:
+        nested: Nested iterable to flatten
+        container_types: Types to descend into (default: list only). Add
+            tuple or types.GeneratorType to flatten those as well. str and
+            bytes must not be included, since they contain themselves.
+        max_depth: Maximum number of levels to descend (default: unlimited)
+        
+    Yields:
+        Non-container items in depth-first order
+        
+    Example:
+        >>> list(iter_flatten([1, [2, [3, [4]]]], max_depth=1))
+        [1, 2, [3, [4]]]
+    """
+    if max_depth is None:
+        max_depth = -1
+    stack = [iter(nested)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, container_types) and len(stack) != max_depth + 1:
+                stack.append(iter(item))
+                break
+            yield item
+        else:
+            stack.pop()
+
+
+def flatten_list(
+    nested_list: List[Any],
+    container_types: Tuple[type, ...] = (list,),
+    max_depth: Optional[int] = None,
+) -> List[Any]:
     """
     Flatten a nested list into a single-level list.
     
+    When np.ndarray is one of the container_types, NumPy input is
+    flattened without a Python loop: an ndarray is treated as nested along
+    its axes and reshaped (a view where possible), and a list made up only
+    of ndarrays is concatenated. Both return an ndarray. Otherwise arrays
+    are items like any other value, and only the first axis of a
+    top-level ndarray is iterated.
+    
     Args:
         nested_list: Nested list to flatten
+        container_types: Types to descend into (default: list only)
+        max_depth: Maximum number of levels to descend (default: unlimited)
         
     Returns:
-        Flattened list
+        Flattened list (or ndarray for NumPy input flattened as a container)
         
     Example:
         >>> flatten_list([[1, 2], [3, 4], [5]])
         [1, 2, 3, 4, 5]
     """
-    result = []
-    for item in nested_list:
-        if isinstance(item, list):
-            result.extend(flatten_list(item))
+    np = _numpy_for(nested_list)
+    if np is not None and issubclass(np.ndarray, tuple(container_types)):
+        if max_depth is None or max_depth + 1 >= nested_list.ndim:
+            return nested_list.ravel()
+        return nested_list.reshape(-1, *nested_list.shape[max_depth + 1:])
+    if (
+        max_depth is None
+        and isinstance(nested_list, list)
+        and nested_list
+        and _numpy_for(nested_list[0]) is not None
+    ):
+        np = _numpy_for(nested_list[0])
+        if issubclass(np.ndarray, tuple(container_types)) and all(
+            isinstance(item, np.ndarray) for item in nested_list
+        ):
+            return np.concatenate([item.ravel() for item in nested_list])
+    return list(iter_flatten(nested_list, container_types, max_depth))
+
+class _Frozen:
+    """
+    Hashable stand-in for an unhashable container.
+    
+    The hash is computed from the content. Equality is identity: _canonical
+    interns instances in a table, so equal structures share one instance,
+    comparing two keys never recurses into nested containers, and a _Frozen
+    can never collide with a tuple or string that happens to look like it.
+    """
+    
+    __slots__ = ("kind", "items", "_hash", "_digest")
+    
+    def __init__(self, kind: type, items: Hashable):
+        self.kind = kind
+        self.items = items
+        self._hash = hash((kind, items))
+        # Stable content digest, computed on demand by _stable_digest
+        self._digest: Optional[bytes] = None
+    
+    def __hash__(self) -> int:
+        return self._hash
+
+
+def _freeze(kind: type, items: Hashable, table: Optional[Dict[Any, _Frozen]]) -> _Frozen:
+    if table is None:
+        return _Frozen(kind, items)
+    # Children are already interned, so this lookup only hashes and
+    # compares one level of items
+    key = (kind, items)
+    frozen = table.get(key)
+    if frozen is None:
+        frozen = table[key] = _Frozen(kind, items)
+    return frozen
+
+
+# Exact types that are always hashable, and exact container types with
+# their _Frozen kind, checked before the slower generic paths
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None), bytes})
+_CONTAINER_KINDS = {dict: dict, list: list, set: set, frozenset: set, tuple: tuple}
+
+
+def _freeze_kind(value: Any) -> type:
+    if isinstance(value, Mapping):
+        return dict
+    if isinstance(value, (set, frozenset)):
+        return set
+    if isinstance(value, list):
+        return list
+    if isinstance(value, tuple):
+        return tuple
+    raise TypeError(f"unhashable type: '{type(value).__name__}'")
+
+
+def _freeze_shallow(
+    kind: type, value: Any, table: Optional[Dict[Any, _Frozen]]
+) -> Optional[_Frozen]:
+    """Freeze a container whose items are all scalars, else return None."""
+    if kind is set:
+        return _freeze(set, frozenset(value), table)
+    scalar_types = _SCALAR_TYPES
+    if kind is dict:
+        # Other mappings only promise items() (FlatRecord.values is a tuple)
+        items = value.values() if type(value) is dict else [item for _, item in value.items()]
+        if all(type(item) in scalar_types for item in items):
+            return _freeze(dict, frozenset(value.items()), table)
+    elif all(type(item) in scalar_types for item in value):
+        return _freeze(kind, tuple(value), table)
+    return None
+
+
+def _canonical(value: Any, table: Optional[Dict[Any, _Frozen]] = None) -> Hashable:
+    """
+    Return a hashable stand-in for value.
+    
+    Hashable values are returned unchanged. Dicts (and other mappings),
+    lists, sets and tuples containing unhashable values are converted to _Frozen keys with equal
+    hashes for equal structures (dict key order is ignored). Keys from the
+    same intern table are also equal to each other; without a table they
+    are only good for hashing. The walk is iterative, so deeply nested
+    records do not hit the recursion limit.
+    
+    Args:
+        value: Value to convert
+        table: Intern table shared by all keys that are compared
+    
+    Raises:
+        TypeError: For unhashable values of other types
+        ValueError: For cyclic structures
+    """
+    kind = _CONTAINER_KINDS.get(type(value))
+    if kind is None or kind is tuple:
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            kind = kind or _freeze_kind(value)
+    frozen = _freeze_shallow(kind, value, table)
+    if frozen is not None:
+        return frozen
+    scalar_types = _SCALAR_TYPES
+    # Frames of [kind, item iterator, converted items, pending dict key, id]
+    stack = [[kind, iter(value.items() if kind is dict else value), [], None, id(value)]]
+    active = {id(value)}
+    while True:
+        frame = stack[-1]
+        kind, items, out = frame[0], frame[1], frame[2]
+        for item in items:
+            key = None
+            if kind is dict:
+                key, item = item
+            item_type = type(item)
+            if item_type not in scalar_types:
+                child_kind = _CONTAINER_KINDS.get(item_type)
+                if child_kind is None or child_kind is tuple:
+                    try:
+                        hash(item)
+                        child_kind = None
+                    except TypeError:
+                        child_kind = child_kind or _freeze_kind(item)
+                if child_kind is not None:
+                    frozen = _freeze_shallow(child_kind, item, table)
+                    if frozen is None:
+                        if id(item) in active:
+                            raise ValueError("cannot canonicalize a cyclic structure")
+                        active.add(id(item))
+                        frame[3] = key
+                        stack.append([
+                            child_kind,
+                            iter(item.items() if child_kind is dict else item),
+                            [],
+                            None,
+                            id(item),
+                        ])
+                        break
+                    item = frozen
+            out.append((key, item) if kind is dict else item)
+        else:
+            stack.pop()
+            frozen = _freeze(kind, frozenset(out) if kind is dict or kind is set else tuple(out), table)
+            if not stack:
+                return frozen
+            active.discard(frame[4])
+            parent = stack[-1]
+            parent[2].append((parent[3], frozen) if parent[0] is dict else frozen)
+
+
+def _stable_piece(item: Any) -> Optional[bytes]:
+    """
+    Type-tagged encoding of a scalar, or None for tuples, frozensets and _Frozen.
+    
+    Values that compare equal encode equally (True, 1 and 1.0 share the int
+    encoding), so the Bloom filter agrees with set membership.
+    """
+    item_type = type(item)
+    if item_type is str:
+        return b"s" + item.encode("utf-8", "surrogatepass")
+    if item_type is float:
+        if not item.is_integer():
+            return b"f" + item.hex().encode()
+        item = int(item)
+    elif item_type is tuple or item_type is frozenset or item_type is _Frozen:
+        return None
+    if isinstance(item, int):
+        return b"i" + item.to_bytes(item.bit_length() // 8 + 1, "little", signed=True)
+    if item is None:
+        return b"n"
+    if item_type is bytes:
+        return b"b" + item
+    # Other hashables have no portable content encoding
+    return b"h" + hash(item).to_bytes(8, "little", signed=True)
+
+
+def _stable_container(item: Any) -> Tuple[bytes, Iterator[Any], bool]:
+    """Return the tag, the children and whether their order is irrelevant."""
+    if type(item) is _Frozen:
+        items = item.items
+        return b"F" + item.kind.__name__.encode(), iter(items), type(items) is frozenset
+    if type(item) is frozenset:
+        return b"S", iter(item), True
+    return b"T", iter(item), False
+
+
+def _stable_digest(item: Hashable) -> bytes:
+    """
+    128-bit BLAKE2b digest of item's content.
+    
+    Unlike hash(), which maps -1 and -2 to the same value and carries that
+    collision through tuple and frozenset hashes, the digest depends only on
+    the content. The walk is iterative, and digests of _Frozen keys are
+    cached on the key.
+    """
+    piece = _stable_piece(item)
+    if piece is not None:
+        return blake2b(piece, digest_size=16).digest()
+    # Frames of [tag, child iterator, encoded children, unordered, node]
+    tag, children, unordered = _stable_container(item)
+    stack = [[tag, children, [], unordered, item]]
+    while True:
+        frame = stack[-1]
+        out = frame[2]
+        for child in frame[1]:
+            piece = _stable_piece(child)
+            if piece is None:
+                digest = child._digest if type(child) is _Frozen else None
+                if digest is None:
+                    tag, children, unordered = _stable_container(child)
+                    stack.append([tag, children, [], unordered, child])
+                    break
+                piece = b"d" + digest
+            out.append(len(piece).to_bytes(8, "little") + piece)
         else:
-            result.append(item)
-    return result
+            stack.pop()
+            if frame[3]:
+                out.sort()
+            digest = blake2b(frame[0] + b"".join(out), digest_size=16).digest()
+            node = frame[4]
+            if type(node) is _Frozen:
+                node._digest = digest
+            if not stack:
+                return digest
+            piece = b"d" + digest
+            stack[-1][2].append(len(piece).to_bytes(8, "little") + piece)
+
+
+def _bloom_hashes(item: Hashable) -> Tuple[int, int]:
+    """
+    Two hashes of item for double hashing.
+    
+    Strings use hash(). Everything else uses _stable_digest, since hash()
+    collides for small integers (hash(-1) == hash(-2)) and for tuples and
+    records built from them, and both hashes would collide together.
+    """
+    if type(item) is str:
+        h1 = hash(item)
+        return h1, hash((h1, 0x9E3779B97F4A7C15)) | 1
+    digest = _stable_digest(item)
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """
+    Fixed-memory probabilistic set membership.
+    
+    Membership tests may return false positives at roughly error_rate once
+    capacity items have been added, but never false negatives.
+    
+    Attributes:
+        capacity: Expected number of items
+        error_rate: Target false-positive rate at capacity
+        num_bits: Size of the bit array
+        num_hashes: Number of bit positions per item
+        
+    Example:
+        >>> seen = BloomFilter(capacity=1000, error_rate=0.01)
+        >>> seen.add("a")
+        >>> "a" in seen
+        True
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity <= 0:
+            raise ValueError("capacity parameter must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate parameter must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, item: Hashable) -> Iterator[int]:
+        # Double hashing: position_i = h1 + i * h2
+        h1, h2 = _bloom_hashes(item)
+        num_bits = self.num_bits
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % num_bits
+    
+    def add(self, item: Hashable) -> None:
+        """Add a hashable item to the filter."""
+        bits = self._bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def add_if_missing(self, item: Hashable) -> bool:
+        """
+        Add item and report whether it was (probably) absent before.
+        
+        Returns:
+            True if at least one of the item's bits was unset
+        """
+        bits = self._bits
+        missing = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                missing = True
+        return missing
+    
+    def __contains__(self, item: Hashable) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def iter_unique(
+    data: Iterable[T],
+    key: Optional[Callable[[T], Any]] = None,
+    approximate: bool = False,
+    capacity: int = 1_000_000,
+    error_rate: float = 0.001,
+) -> Iterator[T]:
+    """
+    Lazily yield the first occurrence of each distinct item.
+    
+    Unhashable items (dicts, lists, ...) are compared through a canonical
+    hashable form, so JSON-like records can be deduplicated directly.
+    
+    Args:
+        data: Iterable with potential duplicates
+        key: Function computing the value used to detect duplicates
+        approximate: Track seen keys in a fixed-size BloomFilter instead of
+            a set. Memory stays bounded, but a small fraction (about
+            error_rate) of distinct items may be dropped as duplicates.
+        capacity: Expected number of distinct items (approximate mode)
+        error_rate: Target false-positive rate (approximate mode)
+        
+    Yields:
+        Items in original order, without duplicates
+        
+    Example:
+        >>> list(iter_unique([{'id': 1}, {'id': 1}, {'id': 2}]))
+        [{'id': 1}, {'id': 2}]
+    """
+    if approximate:
+        add_if_missing = BloomFilter(capacity, error_rate).add_if_missing
+        for item in data:
+            marker = item if key is None else key(item)
+            if add_if_missing(_canonical(marker)):
+                yield item
+        return
+    
+    seen = set()
+    add = seen.add
+    # Interns the keys of unhashable items, so equal keys are identical
+    table: Dict[Any, _Frozen] = {}
+    for item in data:
+        marker = item if key is None else key(item)
+        try:
+            if marker in seen:
+                continue
+        except TypeError:
+            marker = _canonical(marker, table)
+            if marker in seen:
+                continue
+        add(marker)
+        yield item
+
 
-def remove_duplicates(data: List[T], preserve_order: bool = True) -> List[T]:
+# dtype kinds (bool, integer, float, complex, datetime, timedelta) that
+# remove_duplicates sorts with NumPy; others (object, str) take the generic path
+_SORTABLE_KINDS = frozenset("biufcmM")
+
+
+def _unique_ndarray(np: Any, data: Any, preserve_order: bool) -> Any:
+    """Vectorized remove_duplicates for an ndarray (rows if it is not 1-D)."""
+    if data.ndim != 1:
+        if not preserve_order:
+            return np.unique(data, axis=0)
+        _, first = np.unique(data, return_index=True, axis=0)
+        first.sort()
+        return data[first]
+    if not preserve_order:
+        ordered = np.sort(data)
+        return ordered[_run_starts(np, ordered)]
+    # An unstable argsort is much faster than np.unique(return_index=True);
+    # the first occurrence of each value is the smallest index in its run
+    order = np.argsort(data)
+    starts = np.flatnonzero(_run_starts(np, data[order]))
+    first = np.minimum.reduceat(order, starts) if len(order) else order
+    first.sort()
+    return data[first]
+
+
+def _run_starts(np: Any, ordered: Any) -> Any:
+    """Boolean mask marking the first element of each run of equal values."""
+    mask = np.empty(len(ordered), dtype=bool)
+    mask[:1] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=mask[1:])
+    return mask
+
+
+def remove_duplicates(
+    data: List[T],
+    preserve_order: bool = True,
+    key: Optional[Callable[[T], Any]] = None,
+) -> List[T]:
     """
     Remove duplicates from a list.
     
+    A numeric (or bool or datetime) NumPy array without a key is
+    deduplicated with np.unique, using the first-occurrence indices to keep
+    the original order (rows are compared for arrays with more than one
+    dimension) and returned as an ndarray. Other arrays are deduplicated
+    item by item like a list.
+    
     Args:
-        data: List with potential duplicates
+        data: List (or ndarray) with potential duplicates
         preserve_order: Whether to maintain original order (default: True)
+        key: Function computing the value used to detect duplicates; the
+            first item for each key is kept
         
     Returns:
-        List without duplicates
+        List without duplicates (unhashable items such as dicts are
+        supported, and always keep their original order)
         
     Example:
         >>> remove_duplicates([1, 2, 2, 3, 1])
         [1, 2, 3]
     """
-    if preserve_order:
-        return list(dict.fromkeys(data))
-    else:
-        return list(set(data))
\ No newline at end of file
+    if key is None:
+        np = _numpy_for(data)
+        if np is not None and data.dtype.kind in _SORTABLE_KINDS:
+            return _unique_ndarray(np, data, preserve_order)
+        try:
+            if preserve_order:
+                return list(dict.fromkeys(data))
+            return list(set(data))
+        except TypeError:
+            pass
+    return list(iter_unique(data, key=key))
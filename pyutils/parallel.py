@@ -0,0 +1,216 @@
+"""Parallel batch execution across process pools."""
+
+import math
+import os
+import pickle
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from pyutils.list_utils import iter_chunks
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Number of items timed by calibrate() when map_batch calibrates on its own
+CALIBRATION_SAMPLE = 256
+
+# Cutover points measured by calibrate(), keyed by _cutover_key()
+_cutovers: Dict[Any, int] = {}
+
+# Maximum number of cached cutovers; the oldest is evicted first
+CUTOVER_CACHE_SIZE = 128
+
+
+def _apply_chunk(func: Callable[[T], R], chunk: List[T]) -> List[R]:
+    return [func(item) for item in chunk]
+
+
+def _default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _cutover_key(func: Callable[..., Any], workers: int) -> Any:
+    """Cache key for func, equal for equivalent functools.partial objects."""
+    if isinstance(func, partial):
+        key = (func.func, func.args, tuple(sorted(func.keywords.items())), workers)
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable bound arguments: share the cutover of the function
+            return (func.func, workers)
+        return key
+    return (func, workers)
+
+
+def _remember_cutover(key: Any, cutover: int) -> None:
+    _cutovers.pop(key, None)
+    while len(_cutovers) >= CUTOVER_CACHE_SIZE:
+        del _cutovers[next(iter(_cutovers))]
+    _cutovers[key] = cutover
+
+
+def calibrate(
+    func: Callable[[T], Any],
+    sample: Iterable[T],
+    workers: Optional[int] = None,
+) -> int:
+    """
+    Measure the input size above which map_batch should use a process pool.
+    
+    Times func in-process over the sample, the cost of pickling the sample
+    to and from a worker, and the fixed cost of starting a pool and
+    completing one round trip per worker. Running n items in a pool costs
+    about overhead + n * (item / workers + transfer), so the cutover is
+    where that drops below n * item. The result is cached for map_batch.
+    
+    Args:
+        func: Picklable function that map_batch will apply
+        sample: Representative input items (a few hundred is enough)
+        workers: Pool size to calibrate for (default: os.cpu_count())
+    
+    Returns:
+        Minimum number of items worth parallelizing (sys.maxsize if a
+        pool never pays off, e.g. with a single worker)
+    """
+    sample = list(sample)
+    if not sample:
+        raise ValueError("sample must not be empty")
+    workers = workers or _default_workers()
+    
+    start = time.perf_counter()
+    results = _apply_chunk(func, sample)
+    item_cost = (time.perf_counter() - start) / len(sample)
+    
+    start = time.perf_counter()
+    pickle.loads(pickle.dumps(sample))
+    pickle.loads(pickle.dumps(results))
+    transfer_cost = (time.perf_counter() - start) / len(sample)
+    
+    if workers > 1:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(workers) as pool:
+            for future in [pool.submit(_apply_chunk, func, sample[:1]) for _ in range(workers)]:
+                future.result()
+        overhead = time.perf_counter() - start
+    
+    saving = item_cost * (1 - 1 / workers) - transfer_cost
+    if workers <= 1 or saving <= 0:
+        cutover = sys.maxsize
+    else:
+        cutover = max(1, math.ceil(overhead / saving))
+    _remember_cutover(_cutover_key(func, workers), cutover)
+    return cutover
+
+
+def imap_batch(
+    func: Callable[[T], R],
+    iterable: Iterable[T],
+    workers: Optional[int] = None,
+    chunk_size: int = 1024,
+    min_items: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[R]:
+    """
+    Lazily apply func to every item, in input order, using a process pool.
+    
+    The input is split with iter_chunks and at most two chunks per worker
+    are in flight, so memory stays bounded for long streams. Inputs with
+    fewer than min_items items run in-process, where pool start-up and
+    pickling would dominate; the first min_items items are buffered to
+    decide. With a single worker, or when a pool never pays off, the
+    input is streamed in-process without buffering.
+    
+    Args:
+        func: Picklable (module-level) function of one argument
+        iterable: Input items
+        workers: Number of worker processes (default: os.cpu_count())
+        chunk_size: Items sent to a worker per task
+        min_items: Cutover below which work stays in-process. By default
+            the cutover comes from calibrate(), which runs automatically on
+            the first CALIBRATION_SAMPLE items the first time func is seen.
+            With an executor, the default is 0: there is no pool start-up
+            to amortize, and calibrate() only measures process pools.
+        executor: Existing executor to reuse instead of starting a pool
+    
+    Yields:
+        func(item) for each item, in input order
+    """
+    workers = workers or _default_workers()
+    iterator = iter(iterable)
+    if executor is None and workers <= 1:
+        yield from map(func, iterator)
+        return
+    head: List[T] = []
+    if min_items is None and executor is not None:
+        min_items = 0
+    if min_items is None:
+        min_items = _cutovers.get(_cutover_key(func, workers))
+        if min_items is None:
+            head = list(islice(iterator, CALIBRATION_SAMPLE))
+            if len(head) < CALIBRATION_SAMPLE:
+                yield from _apply_chunk(func, head)
+                return
+            min_items = calibrate(func, head, workers)
+    
+    if min_items >= sys.maxsize:
+        # A pool never pays off: stream in-process instead of buffering
+        yield from map(func, chain(head, iterator))
+        return
+    if min_items > len(head):
+        head.extend(islice(iterator, min_items - len(head)))
+        if len(head) < min_items:
+            yield from _apply_chunk(func, head)
+            return
+    
+    chunks = iter_chunks(chain(head, iterator), chunk_size)
+    del head
+    own_pool = executor is None
+    pool = ProcessPoolExecutor(workers) if own_pool else executor
+    try:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_apply_chunk, func, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def map_batch(
+    func: Callable[[T], R],
+    iterable: Iterable[T],
+    workers: Optional[int] = None,
+    chunk_size: int = 1024,
+    min_items: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[R]:
+    """
+    Apply func to every item using a process pool, keeping input order.
+    
+    Args:
+        func: Picklable function of one argument, e.g. slugify or
+            functools.partial(truncate, max_length=50)
+        iterable: Input items
+        workers: Number of worker processes (default: os.cpu_count())
+        chunk_size: Items sent to a worker per task
+        min_items: Cutover below which work stays in-process (default:
+            measured by calibrate(), or 0 with an executor)
+        executor: Existing executor to reuse instead of starting a pool
+    
+    Returns:
+        List of results in input order
+    
+    Example:
+        >>> from pyutils.string_utils import slugify
+        >>> map_batch(slugify, ["Hello World", "Foo Bar"], workers=2)
+        ['hello-world', 'foo-bar']
+    """
+    return list(imap_batch(func, iterable, workers, chunk_size, min_items, executor))
@@ -0,0 +1,350 @@
+"""Composable generator stages for streaming JSON-lines processing.
+
+Each stage takes an iterable and returns a lazy iterator, so a pipeline
+holds only the records in flight and memory stays constant regardless of
+file size. For example, to project two fields out of a large file:
+    
+    from functools import partial
+    from pyutils import stream
+    
+    written = stream.pipeline(
+        stream.read_lines("events.jsonl"),
+        stream.parse_json,
+        partial(stream.project, paths={"id": "event.id", "userName": "event.userName"}),
+        stream.rename_keys,
+        partial(stream.write_lines, path="out.jsonl"),
+    )
+"""
+
+import json
+import mmap
+import os
+import stat
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+from pyutils.dict_utils import (
+    FlatRecord, RecordSchema, compile_path, convert_keys, flatten_dict, flatten_records,
+)
+from pyutils.list_utils import iter_chunks, iter_unique
+from pyutils.string_utils import camel_to_snake
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Bytes read (or mapped and split) per bulk operation
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+PARSE_ERRORS = ("raise", "skip")
+
+
+def _map_file(file: Any) -> Optional[mmap.mmap]:
+    info = os.fstat(file.fileno())
+    # Pipes, sockets, devices and procfs-style files report no usable size
+    if not stat.S_ISREG(info.st_mode) or info.st_size == 0:
+        return None
+    try:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def _iter_mapped_lines(mapped: mmap.mmap, chunk_size: int) -> Iterator[bytes]:
+    with mapped:
+        size = len(mapped)
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                # Split at the last newline in the window (or the next one,
+                # for lines longer than chunk_size)
+                newline = mapped.rfind(b"\n", start, end)
+                if newline < 0:
+                    newline = mapped.find(b"\n", end)
+                end = size if newline < 0 else newline + 1
+            lines = mapped[start:end].split(b"\n")
+            if lines[-1] == b"":
+                lines.pop()
+            yield from lines
+            start = end
+
+
+def _iter_buffered_lines(file: Any, chunk_size: int) -> Iterator[bytes]:
+    remainder = b""
+    while True:
+        block = file.read(chunk_size)
+        if not block:
+            break
+        lines = block.split(b"\n")
+        if remainder:
+            lines[0] = remainder + lines[0]
+        remainder = lines.pop()
+        yield from lines
+    if remainder:
+        yield remainder
+
+
+def read_lines(
+    path: PathLike, chunk_size: int = DEFAULT_CHUNK_SIZE, use_mmap: bool = True
+) -> Iterator[bytes]:
+    """
+    Lazily read the lines of a file as bytes, without line terminators.
+    
+    The file is memory-mapped (or read in bulk blocks of chunk_size bytes)
+    and each block is split into lines in one call, instead of reading line
+    by line. At most one block is held in memory at a time.
+    
+    Args:
+        path: File to read
+        chunk_size: Bytes split per block (default: 1 MiB)
+        use_mmap: Memory-map the file instead of reading blocks; useful
+            for files in the page cache. Files that cannot be mapped
+            (pipes, devices, empty files) are read in blocks (default: True)
+    
+    Returns:
+        Iterator over lines as bytes ("\\r" of CRLF endings is kept; json
+        ignores it)
+    
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix=".jsonl") as file:
+        ...     _ = file.write(b'{"id": 1}\\n{"id": 2}\\n')
+        ...     file.flush()
+        ...     list(read_lines(file.name))
+        [b'{"id": 1}', b'{"id": 2}']
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size parameter must be positive")
+    return _iter_file_lines(path, chunk_size, use_mmap)
+
+
+def _iter_file_lines(path: PathLike, chunk_size: int, use_mmap: bool) -> Iterator[bytes]:
+    with open(path, "rb") as file:
+        mapped = _map_file(file) if use_mmap else None
+        if mapped is not None:
+            yield from _iter_mapped_lines(mapped, chunk_size)
+        else:
+            yield from _iter_buffered_lines(file, chunk_size)
+
+
+def parse_json(lines: Iterable[Union[str, bytes]], errors: str = "raise") -> Iterator[Any]:
+    """
+    Parse one JSON document per line, skipping blank lines.
+    
+    Args:
+        lines: Lines as str or bytes (e.g. from read_lines)
+        errors: "raise" to propagate invalid JSON, or "skip" to drop it
+    
+    Returns:
+        Iterator over the parsed documents
+    """
+    if errors not in PARSE_ERRORS:
+        raise ValueError(f"errors must be one of {PARSE_ERRORS}")
+    return _iter_parsed(lines, errors == "skip")
+
+
+def _iter_parsed(lines: Iterable[Union[str, bytes]], skip_errors: bool) -> Iterator[Any]:
+    loads = json.loads
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield loads(line)
+        except ValueError:
+            if not skip_errors:
+                raise
+
+
+def project(
+    records: Iterable[Dict[str, Any]],
+    paths: Union[Iterable[str], Mapping[str, str]],
+    default: Any = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Select dot-paths from each record, like get_nested.
+    
+    Args:
+        records: Nested dictionaries
+        paths: Paths to keep (output keys are the paths), or a mapping of
+            output key to path
+        default: Value for paths missing from a record
+    
+    Yields:
+        Flat dictionaries of output key to value
+    
+    Example:
+        >>> list(project([{'user': {'id': 1}}], {'id': 'user.id'}))
+        [{'id': 1}]
+    """
+    if not isinstance(paths, Mapping):
+        paths = {path: path for path in paths}
+    # Compiled once for the whole stream
+    accessors = [(name, compile_path(path)) for name, path in paths.items()]
+    for record in records:
+        yield {name: accessor(record, default) for name, accessor in accessors}
+
+
+def flatten(
+    records: Iterable[Dict[str, Any]],
+    separator: str = ".",
+    flatten_lists: bool = False,
+    compact: bool = False,
+) -> Iterator[Mapping[str, Any]]:
+    """
+    Flatten each record with flatten_dict.
+    
+    Args:
+        records: Nested dictionaries
+        separator: Separator for nested keys (default: ".")
+        flatten_lists: Also descend into lists, using indices as keys
+        compact: Yield FlatRecords with shared schemas (flatten_records)
+            instead of dicts; useful when records are collected in memory
+    
+    Yields:
+        Flattened dictionaries (or FlatRecords)
+    """
+    if compact:
+        yield from flatten_records(records, separator, flatten_lists)
+        return
+    for record in records:
+        yield flatten_dict(record, separator, flatten_lists)
+
+
+def rename_keys(
+    records: Iterable[Any], key_func: Callable[[str], str] = camel_to_snake
+) -> Iterator[Any]:
+    """
+    Convert every key of each record (at all depths) with convert_keys.
+    
+    Converted keys are cached for the whole stream, so each distinct key
+    is converted once; the cache grows with the number of distinct keys,
+    not with the number of records. FlatRecords (from compact flatten)
+    are converted once per schema and stay compact.
+    
+    Args:
+        records: Nested dictionaries or lists, or FlatRecords
+        key_func: Key conversion (default: camel_to_snake)
+    
+    Yields:
+        Converted copies of the records
+    """
+    cache: Dict[str, str] = {}
+    # Converted schema per source schema, or None if keys would collide
+    schemas: Dict[RecordSchema, Optional[RecordSchema]] = {}
+    for record in records:
+        if type(record) is not FlatRecord:
+            yield convert_keys(record, key_func, cache)
+            continue
+        if record.schema in schemas:
+            schema = schemas[record.schema]
+        else:
+            keys = convert_keys(dict.fromkeys(record.schema.keys), key_func, cache)
+            schema = RecordSchema(keys) if len(keys) == len(record.schema) else None
+            schemas[record.schema] = schema
+        if schema is None:
+            yield convert_keys(record.to_dict(), key_func, cache)
+        else:
+            yield FlatRecord(schema, tuple(convert_keys(list(record.values), key_func, cache)))
+
+
+def dedupe(
+    records: Iterable[Any],
+    key: Optional[Callable[[Any], Any]] = None,
+    approximate: bool = False,
+    capacity: int = 1_000_000,
+    error_rate: float = 0.001,
+) -> Iterator[Any]:
+    """
+    Drop records seen before, keeping the first occurrence (iter_unique).
+    
+    Exact mode remembers every distinct key, so its memory grows with the
+    number of distinct records; approximate mode uses a fixed-size
+    BloomFilter and keeps memory constant.
+    
+    Args:
+        records: Records (dicts are compared by content)
+        key: Function computing the value used to detect duplicates
+        approximate: Use a BloomFilter (may drop about error_rate of the
+            distinct records)
+        capacity: Expected number of distinct records (approximate mode)
+        error_rate: Target false-positive rate (approximate mode)
+    
+    Yields:
+        Records without duplicates
+    """
+    return iter_unique(records, key, approximate, capacity, error_rate)
+
+
+def chunk(records: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """
+    Group records into lists of chunk_size (the last one may be shorter).
+    
+    Args:
+        records: Any iterable
+        chunk_size: Records per chunk
+    
+    Yields:
+        Lists of records
+    """
+    return iter_chunks(records, chunk_size)
+
+
+def _json_default(value: Any) -> Any:
+    # Mappings that are not dicts, such as FlatRecords from flatten(compact=True)
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_lines(
+    records: Iterable[Any], path: PathLike, batch_size: int = 1024
+) -> int:
+    """
+    Write each record as one line of compact JSON.
+    
+    Lines are encoded and written batch_size records at a time.
+    
+    Args:
+        records: JSON-serializable records (any Mapping is written as
+            an object)
+        path: Output file (overwritten)
+        batch_size: Records joined into a single write
+    
+    Returns:
+        Number of records written
+    """
+    dumps = json.JSONEncoder(
+        ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode
+    count = 0
+    with open(path, "wb") as file:
+        for batch in iter_chunks(records, batch_size):
+            lines = [dumps(record) for record in batch]
+            lines.append("")
+            file.write("\n".join(lines).encode("utf-8"))
+            count += len(batch)
+    return count
+
+
+def pipeline(source: Iterable[Any], *stages: Callable[[Iterable[Any]], Any]) -> Any:
+    """
+    Feed source through each stage in turn.
+    
+    Stages are functions of one iterable; use functools.partial to bind
+    their other arguments. Nothing is read until the result is consumed,
+    unless the last stage consumes it (as write_lines does).
+    
+    Args:
+        source: Initial iterable (e.g. read_lines(path))
+        *stages: Stage functions, applied in order
+    
+    Returns:
+        Whatever the last stage returns (an iterator, or the count from
+        write_lines)
+    
+    Example:
+        >>> records = pipeline([b'{"userId": 1}'], parse_json, rename_keys)
+        >>> list(records)
+        [{'user_id': 1}]
+    """
+    for stage in stages:
+        source = stage(source)
+    return source
@@ -1,13 +1,166 @@
 """String manipulation utilities."""
 
+import codecs
+import re
+import time
+import unicodedata
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-def slugify(text: str, separator: str = "-") -> str:
+# Non-ASCII path: drop everything except word characters, whitespace and "-"
+_UNICODE_STRIP_RE = re.compile(r"[^\w\s-]")
+
+
+def _build_slug_table(lowercase: bool) -> Tuple[bytes, bytes]:
+    """
+    Build bytes.translate arguments for ASCII slug characters.
+    
+    Letters, digits and "_" are kept (optionally lowercased), whitespace
+    and "-" become spaces so bytes.split() can collapse them, and all
+    other ASCII characters are deleted.
+    
+    Returns:
+        Tuple of (translation table, characters to delete)
+    """
+    table = bytearray(range(256))
+    delete = bytearray()
+    for code in range(128):
+        char = chr(code)
+        if char.isalnum() or char == "_":
+            table[code] = ord(char.lower()) if lowercase else code
+        elif char.isspace() or char == "-":
+            table[code] = ord(" ")
+        else:
+            delete.append(code)
+    return bytes(table), bytes(delete)
+
+
+_SLUG_TABLES = {True: _build_slug_table(True), False: _build_slug_table(False)}
+
+
+class Slugifier:
+    """
+    Reusable slug generator holding a precompiled configuration.
+    
+    Each string is transliterated to ASCII via NFKD decomposition (unless
+    allow_unicode is set), then mapped, filtered and separator-collapsed
+    in a single bytes.translate pass plus one split/join.
+    
+    Attributes:
+        separator: Separator placed between words
+        max_length: Maximum slug length, or None for no limit
+        allow_unicode: Keep non-ASCII word characters instead of
+            transliterating them
+        lowercase: Lowercase the result
+        
+    Example:
+        >>> to_slug = Slugifier(separator="_", max_length=12)
+        >>> to_slug("Crème Brûlée Recipe")
+        'creme_brulee'
+    """
+    
+    __slots__ = (
+        "separator", "max_length", "allow_unicode", "lowercase",
+        "_table", "_delete", "_join",
+    )
+    
+    def __init__(
+        self,
+        separator: str = "-",
+        max_length: Optional[int] = None,
+        allow_unicode: bool = False,
+        lowercase: bool = True,
+    ):
+        if max_length is not None and max_length < 0:
+            raise ValueError("max_length parameter must not be negative")
+        self.separator = separator
+        self.max_length = max_length
+        self.allow_unicode = allow_unicode
+        self.lowercase = lowercase
+        self._table, self._delete = _SLUG_TABLES[lowercase]
+        self._join = separator.encode("ascii").join if separator.isascii() else None
+    
+    def __call__(self, text: str) -> str:
+        if self.allow_unicode and not text.isascii():
+            text = _UNICODE_STRIP_RE.sub("", unicodedata.normalize("NFKC", text))
+            if self.lowercase:
+                text = text.lower()
+            slug = self.separator.join(text.replace("-", " ").split())
+        else:
+            if text.isascii():
+                data = text.encode("ascii")
+            else:
+                data = unicodedata.normalize("NFKD", text).encode("ascii", "ignore")
+            words = data.translate(self._table, self._delete).split()
+            if self._join is not None:
+                slug = self._join(words).decode("ascii")
+            else:
+                slug = self.separator.join(word.decode("ascii") for word in words)
+        if self.max_length is not None and len(slug) > self.max_length:
+            slug = self._cut(slug)
+        return slug
+    
+    def _cut(self, slug: str) -> str:
+        separator = self.separator
+        slug = slug[:self.max_length]
+        # Drop a trailing, possibly partial, separator
+        for size in range(len(separator), 0, -1):
+            if slug.endswith(separator[:size]):
+                return slug[:-size]
+        return slug
+    
+    def many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Slugify many strings with this configuration.
+        
+        Args:
+            texts: Iterable of input strings
+            
+        Returns:
+            List of slugs in input order
+        """
+        if self.max_length is not None or self._join is None:
+            return [self(text) for text in texts]
+        join = self._join
+        table = self._table
+        delete = self._delete
+        return [
+            join(text.encode("ascii").translate(table, delete).split()).decode("ascii")
+            if text.isascii() else self(text)
+            for text in texts
+        ]
+    
+    def __repr__(self) -> str:
+        return (
+            f"Slugifier(separator={self.separator!r}, max_length={self.max_length!r}, "
+            f"allow_unicode={self.allow_unicode!r}, lowercase={self.lowercase!r})"
+        )
+
+
+@lru_cache(maxsize=32)
+def _get_slugifier(separator: str, max_length: Optional[int], allow_unicode: bool) -> Slugifier:
+    return Slugifier(separator, max_length, allow_unicode)
+
+
+def slugify(
+    text: str,
+    separator: str = "-",
+    max_length: Optional[int] = None,
+    allow_unicode: bool = False,
+) -> str:
     """
     Convert a string to a URL-friendly slug.
     
+    Accented letters are transliterated to ASCII, punctuation is removed
+    and runs of whitespace or "-" collapse into a single separator.
+    
     Args:
         text: Input text to slugify
         separator: Character to use as separator (default: "-")
+        max_length: Maximum slug length; a trailing separator left by the
+            cut is removed (default: no limit)
+        allow_unicode: Keep non-ASCII letters instead of transliterating
         
     Returns:
         Slugified string (lowercase, alphanumeric, with separators)
@@ -16,19 +169,263 @@ def slugify(text: str, separator: str = "-") -> str:
         >>> slugify("Hello World!")
         'hello-world'
     """
-    # TODO: Implement slugify logic
-    # raise NotImplementedError("slugify not yet implemented")
-    return text.lower().strip().replace('!','').replace('?','').replace('.','').replace(' ', '-')
+    return _get_slugifier(separator, max_length, allow_unicode)(text)
 
 
-def truncate(text: str, max_length: int, suffix: str = "...") -> str:
+def slugify_many(
+    texts: Iterable[str],
+    separator: str = "-",
+    max_length: Optional[int] = None,
+    allow_unicode: bool = False,
+) -> List[str]:
+    """
+    Slugify a batch of strings, reusing one compiled configuration.
+    
+    Args:
+        texts: Iterable of input strings
+        separator: Character to use as separator (default: "-")
+        max_length: Maximum slug length (default: no limit)
+        allow_unicode: Keep non-ASCII letters instead of transliterating
+        
+    Returns:
+        List of slugs in input order
+        
+    Example:
+        >>> slugify_many(["Hello World", "Café Menu"])
+        ['hello-world', 'cafe-menu']
+    """
+    return _get_slugifier(separator, max_length, allow_unicode).many(texts)
+
+
+# Units truncate can measure max_length in
+TRUNCATE_MODES = ("chars", "graphemes", "width", "bytes")
+
+_ZWJ = "\u200d"
+
+
+@lru_cache(maxsize=4096)
+def _is_grapheme_extend(char: str) -> bool:
+    """True for characters that never start a grapheme cluster."""
+    code = ord(char)
+    return (
+        code == 0x200D                       # zero width joiner
+        or 0xFE00 <= code <= 0xFE0F          # variation selectors
+        or 0x1F3FB <= code <= 0x1F3FF        # emoji skin tone modifiers
+        or 0xE0020 <= code <= 0xE007F        # tag sequences (subdivision flags)
+        or 0xE0100 <= code <= 0xE01EF        # variation selectors supplement
+        or unicodedata.category(char) in ("Mn", "Me", "Mc")
+    )
+
+
+def _is_regional_indicator(char: str) -> bool:
+    return 0x1F1E6 <= ord(char) <= 0x1F1FF
+
+
+@lru_cache(maxsize=4096)
+def _is_cluster_special(char: str) -> bool:
+    """True for characters that may join a neighbour into one cluster."""
+    return _is_grapheme_extend(char) or _is_regional_indicator(char)
+
+
+def _single_code_point_clusters(text: str) -> bool:
+    """True if every grapheme cluster of text is a single code point."""
+    if text.isascii():
+        return "\r\n" not in text
+    return "\r\n" not in text and not any(map(_is_cluster_special, text))
+
+
+def _iter_grapheme_ends(text: str) -> Iterator[int]:
+    """
+    Yield the end index of each grapheme cluster in text.
+    
+    Approximates Unicode extended grapheme clusters: base characters keep
+    their combining marks, variation selectors and emoji modifiers,
+    ZWJ sequences stay joined, regional indicators pair up into flags and
+    CRLF is one cluster.
+    """
+    length = len(text)
+    i = 0
+    while i < length:
+        j = i + 1
+        if text[i] == "\r" and j < length and text[j] == "\n":
+            j += 1
+        elif _is_regional_indicator(text[i]) and j < length and _is_regional_indicator(text[j]):
+            j += 1
+        while j < length and (_is_grapheme_extend(text[j]) or text[j - 1] == _ZWJ):
+            j += 1
+        yield j
+        i = j
+
+
+def _grapheme_floor(text: str, index: int) -> int:
+    """Move index back to the nearest grapheme cluster boundary."""
+    while 0 < index < len(text) and (
+        _is_grapheme_extend(text[index])
+        or text[index - 1] == _ZWJ
+        or (text[index - 1] == "\r" and text[index] == "\n")
+    ):
+        index -= 1
+    if 0 < index < len(text) and _is_regional_indicator(text[index]):
+        # Break only between complete flag pairs
+        run = 0
+        while index - run > 0 and _is_regional_indicator(text[index - run - 1]):
+            run += 1
+        index -= run % 2
+    return index
+
+
+def _cluster_width(text: str, start: int, end: int) -> int:
+    """Terminal display width (0, 1 or 2 columns) of text[start:end]."""
+    char = text[start]
+    if char.isascii():
+        return 1 if char.isprintable() else 0
+    if unicodedata.east_asian_width(char) in ("W", "F"):
+        return 2
+    code = ord(char)
+    if 0x1F300 <= code <= 0x1FAFF or _is_regional_indicator(char) or "\ufe0f" in text[start:end]:
+        return 2
+    if unicodedata.category(char) in ("Cc", "Cf", "Mn", "Me"):
+        return 0
+    return 1
+
+
+def _counts_code_points(text: str, mode: str) -> bool:
+    """True if text measures one unit per code point in graphemes/width mode."""
+    return (mode == "graphemes" or text.isascii()) and _single_code_point_clusters(text)
+
+
+def _measure(text: str, mode: str, encoding: str) -> int:
+    if mode == "chars":
+        return len(text)
+    if mode != "bytes" and _counts_code_points(text, mode):
+        return len(text)
+    if mode == "bytes":
+        # Exclude any byte order mark, which only the full string carries
+        return len(text.encode(encoding)) - len("".encode(encoding))
+    if mode == "graphemes":
+        return sum(1 for _ in _iter_grapheme_ends(text))
+    width = 0
+    start = 0
+    for end in _iter_grapheme_ends(text):
+        width += _cluster_width(text, start, end)
+        start = end
+    return width
+
+
+def _byte_cut(text: str, encoded: bytes, budget: int, encoding: str) -> int:
+    """Largest character index whose prefix encodes to at most budget bytes."""
+    if encoding in ("utf-8", "ascii", "latin-1", "iso8859-1"):
+        cut = budget
+        if encoding == "utf-8":
+            # Step back over UTF-8 continuation bytes (0b10xxxxxx)
+            while cut > 0 and encoded[cut] & 0xC0 == 0x80:
+                cut -= 1
+        return len(encoded[:cut].decode(encoding))
+    # Decoding the byte prefix drops a trailing partial character (or
+    # surrogate pair), which leaves the characters that fit
+    head = encoded[:budget].decode(encoding, "ignore")
+    if encoding.startswith(("utf-16", "utf-32")):
+        return len(head)
+    cut = len(head)
+    if text.startswith(head) and len(text[:cut].encode(encoding)) <= budget:
+        return cut
+    # Stateful codecs (e.g. ISO-2022) add shift sequences when a prefix is
+    # encoded on its own: binary search on prefix length
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if len(text[:mid].encode(encoding)) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _find_cut(text: str, budget: int, mode: str, encoding: str, encoded: bytes) -> int:
+    """Character index where text must be cut to fit budget units."""
+    if mode == "chars":
+        return budget
+    if mode == "bytes":
+        return _grapheme_floor(text, _byte_cut(text, encoded, budget, encoding))
+    used = 0
+    start = 0
+    for end in _iter_grapheme_ends(text):
+        used += 1 if mode == "graphemes" else _cluster_width(text, start, end)
+        if used > budget:
+            return start
+        start = end
+    return len(text)
+
+
+def _truncate(
+    text: str,
+    max_length: int,
+    suffix: str,
+    suffix_size: int,
+    mode: str,
+    word_boundary: bool,
+    encoding: str,
+) -> str:
+    encoded = b""
+    if mode != "chars" and mode != "bytes" and _counts_code_points(text, mode):
+        mode = "chars"
+    if mode == "chars":
+        size = len(text)
+    elif mode == "bytes":
+        encoded = text.encode(encoding)
+        size = len(encoded)
+    else:
+        size = _measure(text, mode, encoding)
+    if size <= max_length:
+        return text
+    if suffix_size >= max_length:
+        # No room for any text next to the suffix: cut the text without it
+        suffix, suffix_size = "", 0
+    cut = _find_cut(text, max_length - suffix_size, mode, encoding, encoded)
+    if word_boundary and 0 < cut < len(text) and not text[cut].isspace():
+        space = max(text.rfind(" ", 0, cut), text.rfind("\n", 0, cut), text.rfind("\t", 0, cut))
+        if space > 0:
+            cut = space
+    head = text[:cut]
+    if word_boundary:
+        head = head.rstrip()
+    return head + suffix
+
+
+def _check_truncate_args(max_length: int, mode: str, encoding: str) -> str:
+    if max_length < 0:
+        raise ValueError("max_length parameter must not be negative")
+    if mode not in TRUNCATE_MODES:
+        raise ValueError(f"mode must be one of {TRUNCATE_MODES}")
+    return codecs.lookup(encoding).name if mode == "bytes" else encoding
+
+
+def truncate(
+    text: str,
+    max_length: int,
+    suffix: str = "...",
+    mode: str = "chars",
+    word_boundary: bool = False,
+    encoding: str = "utf-8",
+) -> str:
     """
     Truncate a string to a maximum length.
     
+    max_length (and the suffix) is measured in the unit selected by mode:
+    "chars" (code points), "graphemes" (user-perceived characters, so
+    emoji and combining sequences are never split), "width" (terminal
+    columns, wide CJK/emoji count as 2) or "bytes" (size once encoded with
+    encoding, for byte-limited columns and SMS payloads). Non-"chars" modes
+    only cut at grapheme boundaries.
+    
     Args:
         text: Input text to truncate
         max_length: Maximum length of the output string
-        suffix: String to append if truncated (default: "...")
+        suffix: String to append if truncated (default: "..."); dropped
+            when it would leave no room for any text
+        mode: Unit of max_length (default: "chars")
+        word_boundary: Cut at the last whitespace before the limit, if any
+        encoding: Encoding used by the "bytes" mode (default: "utf-8")
         
     Returns:
         Truncated string with suffix if needed
@@ -36,18 +433,352 @@ def truncate(text: str, max_length: int, suffix: str = "...") -> str:
     Example:
         >>> truncate("This is a long text", 10)
         'This is...'
+        >>> truncate("Héllo wörld", 8, mode="bytes")
+        'Héll...'
+    """
+    encoding = _check_truncate_args(max_length, mode, encoding)
+    suffix_size = _measure(suffix, mode, encoding)
+    return _truncate(text, max_length, suffix, suffix_size, mode, word_boundary, encoding)
+
+
+def truncate_many(
+    texts: Iterable[str],
+    max_length: int,
+    suffix: str = "...",
+    mode: str = "chars",
+    word_boundary: bool = False,
+    encoding: str = "utf-8",
+) -> List[str]:
     """
-    if(len(text) <= max_length):
+    Truncate a batch of strings with the same settings.
+    
+    Arguments are validated and the suffix is measured once for the whole
+    batch; in "chars" mode strings are cut with plain slicing.
+    
+    Args:
+        texts: Iterable of input strings
+        max_length: Maximum length of each output string
+        suffix: String to append if truncated (default: "...")
+        mode: Unit of max_length, as for truncate (default: "chars")
+        word_boundary: Cut at the last whitespace before the limit, if any
+        encoding: Encoding used by the "bytes" mode (default: "utf-8")
+        
+    Returns:
+        List of truncated strings in input order
+        
+    Example:
+        >>> truncate_many(["Short", "This is a long text"], 10)
+        ['Short', 'This is...']
+    """
+    encoding = _check_truncate_args(max_length, mode, encoding)
+    suffix_size = _measure(suffix, mode, encoding)
+    if mode == "chars" and not word_boundary:
+        if suffix_size >= max_length:
+            suffix, suffix_size = "", 0
+        cut = max_length - suffix_size
+        return [text if len(text) <= max_length else text[:cut] + suffix for text in texts]
+    return [
+        _truncate(text, max_length, suffix, suffix_size, mode, word_boundary, encoding)
+        for text in texts
+    ]
+
+
+class _Stage:
+    """One compiled pipeline step, with per-string and per-batch forms."""
+    
+    __slots__ = ("name", "func", "batch", "kind")
+    
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[str], str],
+        batch: Optional[Callable[[List[str]], List[str]]] = None,
+        kind: Optional[str] = None,
+    ):
+        self.name = name
+        self.func = func
+        self.batch = batch if batch is not None else (lambda texts: list(map(func, texts)))
+        # Steps slugify makes redundant ("strip", "lower"), if any
+        self.kind = kind
+
+
+# Largest replacement map applied as chained str.replace calls, which
+# beat one regex pass for a few keys
+_CHAINED_REPLACE_LIMIT = 8
+
+
+def _replaces_commute(mapping: Dict[str, str]) -> bool:
+    """
+    True if replacing each key in turn equals one single-pass replacement.
+    
+    Holds when key occurrences can never overlap one another and no
+    replacement can form a new occurrence of a key.
+    """
+    if len(mapping) == 1:
+        return True
+    for key in mapping:
+        for other in mapping:
+            if key != other and (
+                other in key or any(key.endswith(other[:size]) for size in range(1, len(other)))
+            ):
+                return False
+    key_chars = set("".join(mapping))
+    return all(value and key_chars.isdisjoint(value) for value in mapping.values())
+
+
+def _compile_replace(mapping: Dict[str, str]) -> Callable[[str], str]:
+    """Build a single-pass replacer for all keys of mapping."""
+    if len(mapping) <= _CHAINED_REPLACE_LIMIT and _replaces_commute(mapping):
+        pairs = tuple(mapping.items())
+        
+        def replace(text: str) -> str:
+            for old, new in pairs:
+                text = text.replace(old, new)
+            return text
+        
+        return replace
+    # Longest keys first, so each match is the longest key at its position
+    keys = sorted(mapping, key=len, reverse=True)
+    pattern = re.compile("|".join(map(re.escape, keys)))
+    lookup = mapping.__getitem__
+    return partial(pattern.sub, lambda match: lookup(match.group()))
+
+
+class TextPipeline:
+    """
+    Immutable builder composing text normalization steps.
+    
+    Each builder method returns a new pipeline with one more step, and
+    compiles that step once: a replacement map becomes one combined regex
+    (or a few chained str.replace calls when that is equivalent), and
+    slugify and truncate settings are validated up front. Steps that a later
+    slugify makes redundant (strip, and lower without allow_unicode) are
+    dropped. The result applies to one string, a list, or a stream.
+    
+    Example:
+        >>> clean = TextPipeline().strip().replace({"&": " and "}).slugify()
+        >>> clean("  Fish & Chips ")
+        'fish-and-chips'
+        >>> clean.many(["Salt & Pepper", "Tea"])
+        ['salt-and-pepper', 'tea']
+    """
+    
+    __slots__ = ("_stages", "_funcs")
+    
+    def __init__(self, stages: Tuple[_Stage, ...] = ()):
+        self._stages = stages
+        self._funcs = tuple(stage.func for stage in stages)
+    
+    def _then(self, stage: _Stage) -> "TextPipeline":
+        return TextPipeline(self._stages + (stage,))
+    
+    @property
+    def stages(self) -> Tuple[str, ...]:
+        """Names of the compiled steps, in order."""
+        return tuple(stage.name for stage in self._stages)
+    
+    def strip(self, chars: Optional[str] = None) -> "TextPipeline":
+        """Add a step removing leading and trailing chars (default: whitespace)."""
+        if chars is None:
+            return self._then(_Stage("strip", str.strip, kind="strip"))
+        return self._then(_Stage("strip", lambda text: text.strip(chars)))
+    
+    def lower(self) -> "TextPipeline":
+        """Add a step lowercasing the text."""
+        return self._then(_Stage("lower", str.lower, kind="lower"))
+    
+    def replace(self, mapping: Mapping[str, str]) -> "TextPipeline":
+        """
+        Add a step replacing every occurrence of each key of mapping.
+        
+        All keys are matched in one left-to-right pass; where several keys
+        match at the same position the longest wins, and replaced text is
+        not scanned again.
+        
+        Args:
+            mapping: Substring to replacement
+            
+        Returns:
+            New pipeline
+        """
+        mapping = dict(mapping)
+        if "" in mapping:
+            raise ValueError("replacement keys must not be empty")
+        if not mapping:
+            return self
+        return self._then(_Stage("replace", _compile_replace(mapping)))
+    
+    def slugify(
+        self,
+        separator: str = "-",
+        max_length: Optional[int] = None,
+        allow_unicode: bool = False,
+    ) -> "TextPipeline":
+        """Add a slugify step (see slugify for the arguments)."""
+        slugifier = Slugifier(separator, max_length, allow_unicode)
+        # Slugs never keep edge whitespace, and the ASCII path lowercases
+        # exactly like str.lower, so these earlier steps change nothing
+        redundant = ("strip",) if allow_unicode else ("strip", "lower")
+        stages = self._stages
+        while stages and stages[-1].kind in redundant:
+            stages = stages[:-1]
+        return TextPipeline(stages + (_Stage("slugify", slugifier, slugifier.many),))
+    
+    def truncate(
+        self,
+        max_length: int,
+        suffix: str = "...",
+        mode: str = "chars",
+        word_boundary: bool = False,
+        encoding: str = "utf-8",
+    ) -> "TextPipeline":
+        """Add a truncate step (see truncate for the arguments)."""
+        encoding = _check_truncate_args(max_length, mode, encoding)
+        suffix_size = _measure(suffix, mode, encoding)
+        
+        def func(text: str) -> str:
+            return _truncate(text, max_length, suffix, suffix_size, mode, word_boundary, encoding)
+        
+        def batch(texts: List[str]) -> List[str]:
+            return truncate_many(texts, max_length, suffix, mode, word_boundary, encoding)
+        
+        return self._then(_Stage("truncate", func, batch))
+    
+    def apply(self, func: Callable[[str], str], name: Optional[str] = None) -> "TextPipeline":
+        """
+        Add an arbitrary str -> str step.
+        
+        Args:
+            func: Function applied to each string
+            name: Step name for repr and profile (default: func.__name__)
+            
+        Returns:
+            New pipeline
+        """
+        return self._then(_Stage(name or getattr(func, "__name__", "apply"), func))
+    
+    def __call__(self, text: str) -> str:
+        for func in self._funcs:
+            text = func(text)
         return text
-    else:
-        return text[:max_length - len(suffix)] + suffix
+    
+    def many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Apply the pipeline to a batch of strings.
+        
+        Each step runs over the whole batch before the next one, so steps
+        use their batch fast paths (e.g. slugify_many, truncate_many).
+        
+        Args:
+            texts: Iterable of input strings
+            
+        Returns:
+            List of results in input order
+        """
+        texts = list(texts)
+        for stage in self._stages:
+            texts = stage.batch(texts)
+        return texts
+    
+    def stream(self, texts: Iterable[str], chunk_size: int = 1024) -> Iterator[str]:
+        """
+        Lazily apply the pipeline to a stream of strings.
+        
+        Args:
+            texts: Iterable of input strings
+            chunk_size: Strings processed per batch
+            
+        Yields:
+            Results in input order
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size parameter must be positive")
+        return self._iter_stream(iter(texts), chunk_size)
+    
+    def _iter_stream(self, iterator: Iterator[str], chunk_size: int) -> Iterator[str]:
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield from self.many(chunk)
+    
+    def profile(self, texts: Iterable[str]) -> List[Tuple[str, float]]:
+        """
+        Time each step over a batch of strings.
+        
+        Args:
+            texts: Iterable of input strings
+            
+        Returns:
+            List of (step name, seconds) in pipeline order
+            
+        Example:
+            >>> texts = ["Hello World", "A Much Longer Title"]
+            >>> timings = TextPipeline().lower().truncate(10).profile(texts)
+            >>> [name for name, seconds in timings]
+            ['lower', 'truncate']
+        """
+        timer = time.perf_counter
+        texts = list(texts)
+        timings = []
+        for stage in self._stages:
+            start = timer()
+            texts = stage.batch(texts)
+            timings.append((stage.name, timer() - start))
+        return timings
+    
+    def __repr__(self) -> str:
+        return f"TextPipeline({' | '.join(self.stages)})"
+
+
+# Maximum number of entries in each case-conversion memo cache
+CASE_CACHE_SIZE = 4096
+
+# ASCII boundaries where camel_to_snake inserts "_": before an uppercase
+# letter that follows a non-uppercase character, and before the last
+# capital of an acronym that starts a new word ("HTTPServer")
+_CAMEL_BOUNDARY_RE = re.compile(r"(?<=[^A-Z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+
+
+def _camel_to_snake(text: str) -> str:
+    if text.isascii():
+        return _CAMEL_BOUNDARY_RE.sub("_", text).lower()
+    parts = []
+    last = 0
+    length = len(text)
+    for i in range(1, length):
+        if text[i].isupper() and (
+            not text[i - 1].isupper() or (i + 1 < length and text[i + 1].islower())
+        ):
+            parts.append(text[last:i])
+            last = i
+    parts.append(text[last:])
+    return "_".join(parts).lower()
+
+
+def _snake_to_camel(text: str, upper_first: bool) -> str:
+    words = text.lstrip("_")
+    prefix = text[:len(text) - len(words)]
+    parts = [part for part in words.split("_") if part]
+    if not parts:
+        return text
+    first = parts[0]
+    head = first[:1].upper() + first[1:] if upper_first else first
+    return prefix + head + "".join(part[:1].upper() + part[1:] for part in parts[1:])
+
+
+_cached_camel_to_snake = lru_cache(maxsize=CASE_CACHE_SIZE)(_camel_to_snake)
+_cached_snake_to_camel = lru_cache(maxsize=CASE_CACHE_SIZE)(_snake_to_camel)
 
-def camel_to_snake(text: str) -> str:
+
+def camel_to_snake(text: str, cached: bool = False) -> str:
     """
     Convert camelCase to snake_case.
     
     Args:
         text: Input text in camelCase
+        cached: Memoize results in a bounded LRU cache, useful when the
+            same keys are converted repeatedly (default: False)
         
     Returns:
         String in snake_case format
@@ -56,10 +787,69 @@ def camel_to_snake(text: str) -> str:
         >>> camel_to_snake("myVariableName")
         'my_variable_name'
     """
-    result = ''
-    for i, c in enumerate(text):
-        if c.isupper() and i > 0:
-            if not text[i-1].isupper() or (i + 1 < len(text) and text[i+1].islower()):
-                result += '_'
-        result += c
-    return result.lower()
+    if cached:
+        return _cached_camel_to_snake(text)
+    return _camel_to_snake(text)
+
+
+def snake_to_camel(text: str, cached: bool = False) -> str:
+    """
+    Convert snake_case to camelCase.
+    
+    Leading underscores are preserved; repeated and trailing underscores
+    are dropped.
+    
+    Args:
+        text: Input text in snake_case
+        cached: Memoize results in a bounded LRU cache (default: False)
+        
+    Returns:
+        String in camelCase format
+        
+    Example:
+        >>> snake_to_camel("my_variable_name")
+        'myVariableName'
+    """
+    if cached:
+        return _cached_snake_to_camel(text, False)
+    return _snake_to_camel(text, False)
+
+
+def snake_to_pascal(text: str, cached: bool = False) -> str:
+    """
+    Convert snake_case to PascalCase.
+    
+    Args:
+        text: Input text in snake_case
+        cached: Memoize results in a bounded LRU cache (default: False)
+        
+    Returns:
+        String in PascalCase format
+        
+    Example:
+        >>> snake_to_pascal("http_server")
+        'HttpServer'
+    """
+    if cached:
+        return _cached_snake_to_camel(text, True)
+    return _snake_to_camel(text, True)
+
+
+def case_cache_info() -> Dict[str, Any]:
+    """
+    Return hit/miss statistics of the case-conversion memo caches.
+    
+    Returns:
+        Dictionary mapping "camel_to_snake" and "snake_to_camel" (shared by
+        snake_to_pascal) to functools CacheInfo namedtuples
+    """
+    return {
+        "camel_to_snake": _cached_camel_to_snake.cache_info(),
+        "snake_to_camel": _cached_snake_to_camel.cache_info(),
+    }
+
+
+def clear_case_caches() -> None:
+    """Clear the case-conversion memo caches and reset their counters."""
+    _cached_camel_to_snake.cache_clear()
+    _cached_snake_to_camel.cache_clear()
@@ -0,0 +1,127 @@
+"""Tests for aio module."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pyutils import aio
+from pyutils.dict_utils import flatten_dict
+from pyutils.string_utils import slugify
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def busy(x):
+    """Spin for about 20 microseconds, standing in for real CPU-bound work."""
+    end = time.perf_counter() + 2e-5
+    while time.perf_counter() < end:
+        pass
+    return x
+
+
+async def max_loop_lag(coro):
+    """Run coro next to a ticker; return (coro result, worst ticker delay in seconds)."""
+    lags = []
+    done = False
+    
+    async def ticker():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            lags.append(time.perf_counter() - start)
+    
+    task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    try:
+        result = await coro
+    finally:
+        done = True
+        await task
+    return result, max(lags)
+
+
+class TestMapAsync:
+    """Test cases for map_async and imap_async."""
+    
+    def test_results_in_order(self):
+        """Test results match a plain map."""
+        texts = [f'Item Number {i}!' for i in range(1000)]
+        assert run(aio.map_async(slugify, texts)) == [slugify(t) for t in texts]
+        assert run(aio.map_async(slugify, iter(texts), time_budget=1e-5)) == [slugify(t) for t in texts]
+    
+    def test_empty_input(self):
+        """Test empty input gives an empty list."""
+        assert run(aio.map_async(slugify, [])) == []
+    
+    def test_yields_to_event_loop(self):
+        """Test a concurrent task keeps running during a long batch."""
+        result, lag = run(max_loop_lag(aio.map_async(busy, range(5000), time_budget=0.002)))
+        assert result == list(range(5000))
+        # The whole batch takes about 100 ms; no single slice may come close
+        assert lag < 0.05
+    
+    def test_executor(self):
+        """Test offloading chunks to a thread pool keeps order."""
+        records = [{'a': {'b': i}} for i in range(100)]
+        with ThreadPoolExecutor(2) as executor:
+            result = run(aio.map_async(flatten_dict, records, executor=executor, chunk_size=7))
+        assert result == [{'a.b': i} for i in range(100)]
+    
+    def test_imap_async(self):
+        """Test the async iterator form."""
+        async def collect():
+            return [x async for x in aio.imap_async(str, range(50), time_budget=1e-5)]
+        
+        assert run(collect()) == [str(i) for i in range(50)]
+    
+    def test_invalid_time_budget(self):
+        """Test a non-positive time budget is rejected."""
+        with pytest.raises(ValueError):
+            run(aio.map_async(str, [1], time_budget=0))
+
+
+class TestAsyncIterators:
+    """Test cases for aiter_chunks and aiter_flatten."""
+    
+    def test_aiter_chunks(self):
+        """Test chunks match iter_chunks."""
+        async def collect():
+            return [chunk async for chunk in aio.aiter_chunks(range(5), 2)]
+        
+        assert run(collect()) == [[0, 1], [2, 3], [4]]
+    
+    def test_aiter_flatten(self):
+        """Test flattening with a depth limit."""
+        async def collect(**kwargs):
+            return [x async for x in aio.aiter_flatten([1, [2, [3, [4]]]], **kwargs)]
+        
+        assert run(collect()) == [1, 2, 3, 4]
+        assert run(collect(max_depth=1)) == [1, 2, [3, [4]]]
+    
+    def test_consumer_time_counts(self):
+        """Test slow consumers still let other tasks run between chunks."""
+        async def consume():
+            count = 0
+            async for chunk in aio.aiter_chunks(range(2000), 10, time_budget=0.002):
+                for x in chunk:
+                    busy(x)
+                count += 1
+            return count
+        
+        count, lag = run(max_loop_lag(consume()))
+        assert count == 200
+        assert lag < 0.05
+    
+    def test_eager_validation(self):
+        """Test invalid arguments raise before iteration."""
+        with pytest.raises(ValueError):
+            aio.aiter_chunks(range(5), 0)
+        with pytest.raises(ValueError):
+            aio.aiter_flatten([1], time_budget=-1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,100 @@
+"""Tests for the benchmark suite harness."""
+
+import json
+from pathlib import Path
+
+import pytest
+from benchmarks import suite
+from benchmarks.__main__ import main
+
+
+class TestBenchmarkCoverage:
+    """Test that every public function is benchmarked."""
+    
+    def test_all_exports_have_cases(self):
+        """Test each name in pyutils.__all__ has at least one case."""
+        assert suite.missing_cases() == []
+    
+    def test_cases_run_at_smallest_scale(self):
+        """Test every case builds and runs on a tiny input."""
+        for function, shapes in suite.CASES.items():
+            for shape, builder in shapes.items():
+                builder(10, shape)()
+
+
+class TestMeasure:
+    """Test cases for measure and run functions."""
+    
+    def test_measure_fields(self):
+        """Test measurements include throughput, latency and memory."""
+        result = suite.measure(lambda: sum(range(100)), min_time=0.001)
+        assert set(result) == {'ops_per_sec', 'p50_us', 'p99_us', 'runs', 'peak_kb'}
+        assert result['ops_per_sec'] > 0
+        assert result['p50_us'] <= result['p99_us']
+    
+    def test_run_selected_functions(self):
+        """Test running a subset of functions and scales."""
+        results = suite.run([10], ['slugify'], min_time=0.001)
+        assert set(results) == {'slugify[ascii-10]', 'slugify[unicode-10]'}
+    
+    def test_run_unknown_function(self):
+        """Test unknown function names are rejected."""
+        with pytest.raises(ValueError):
+            suite.run([10], ['not_a_function'], min_time=0.001)
+
+
+class TestCompare:
+    """Test cases for regression detection."""
+    
+    def test_flags_regression(self):
+        """Test a slowdown beyond the threshold is reported."""
+        baseline = {'f[x-10]': {'ops_per_sec': 1000.0}, 'g[x-10]': {'ops_per_sec': 1000.0}}
+        results = {'f[x-10]': {'ops_per_sec': 700.0}, 'g[x-10]': {'ops_per_sec': 900.0}}
+        assert suite.compare(results, baseline, threshold=0.25) == [('f[x-10]', 0.7)]
+    
+    def test_reports_new_cases(self):
+        """Test cases absent from the baseline are reported, not counted as regressions."""
+        results = {'new[x-10]': {'ops_per_sec': 1.0}, 'old[x-10]': {'ops_per_sec': 1.0}}
+        baseline = {'old[x-10]': {'ops_per_sec': 1.0}}
+        assert suite.compare(results, baseline) == []
+        assert suite.missing_from_baseline(results, baseline) == ['new[x-10]']
+    
+    def test_baseline_covers_suite(self):
+        """Test the committed baseline has an entry for every case at the default scales."""
+        with open(Path(suite.__file__).with_name('baseline.json')) as f:
+            baseline = json.load(f)['results']
+        expected = {
+            suite.case_name(function, shape, scale)
+            for function, shapes in suite.CASES.items()
+            for shape in shapes
+            for scale in suite.DEFAULT_SCALES
+        }
+        assert sorted(expected - set(baseline)) == []
+    
+    def test_cli_exit_status(self, tmp_path):
+        """Test the CLI fails on regression against a saved baseline."""
+        baseline_file = tmp_path / 'baseline.json'
+        args = ['--scales', '10', '--functions', 'truncate', '--min-time', '0.001']
+        assert main(args + ['--save', str(baseline_file)]) == 0
+        
+        payload = json.loads(baseline_file.read_text())
+        for result in payload['results'].values():
+            result['ops_per_sec'] *= 1000
+        baseline_file.write_text(json.dumps(payload))
+        assert main(args + ['--compare', str(baseline_file)]) == 1
+    
+    def test_cli_strict_missing_cases(self, tmp_path, capsys):
+        """Test cases missing from the baseline warn, and fail the run with --strict."""
+        baseline_file = tmp_path / 'baseline.json'
+        args = ['--scales', '10', '--functions', 'truncate', '--min-time', '0.001']
+        assert main(args + ['--save', str(baseline_file)]) == 0
+        # Timings this short are noisy; only the missing case may fail the run
+        args += ['--threshold', '1']
+        
+        payload = json.loads(baseline_file.read_text())
+        dropped = sorted(payload['results'])[0]
+        del payload['results'][dropped]
+        baseline_file.write_text(json.dumps(payload))
+        assert main(args + ['--compare', str(baseline_file)]) == 0
+        assert dropped in capsys.readouterr().err
+        assert main(args + ['--compare', str(baseline_file), '--strict']) == 1
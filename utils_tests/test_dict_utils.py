@@ -1,7 +1,36 @@
 """Tests for dict_utils module."""
 
+from collections.abc import Mapping
+from itertools import product
+
 import pytest
-from pyutils.dict_utils import merge_dicts, get_nested, flatten_dict
+from pyutils.list_utils import remove_duplicates
+from pyutils.dict_utils import (
+    MergedView,
+    NestedIndex,
+    DELETE,
+    FlatRecord,
+    Fingerprinter,
+    RecordSchema,
+    merge_dicts,
+    get_nested,
+    query_nested,
+    compile_query,
+    flatten_dict,
+    flatten_records,
+    fingerprint,
+    diff_nested,
+    apply_patch,
+    compile_path,
+    extract_columns,
+    convert_keys,
+    keys_to_snake,
+    keys_to_camel,
+    iter_flat_items,
+    unflatten_dict,
+    path_cache_info,
+    clear_path_cache,
+)
 
 
 class TestMergeDicts:
@@ -44,6 +73,86 @@ class TestMergeDicts:
             {'c': 'test'}
         )
         assert result == {'a': [1, 2], 'b': {'x': 1}, 'c': 'test'}
+    
+    def test_shallow_merge_replaces_nested(self):
+        """Test default merge replaces nested dicts wholesale."""
+        result = merge_dicts({'a': {'x': 1}}, {'a': {'y': 2}})
+        assert result == {'a': {'y': 2}}
+    
+    def test_deep_merge(self):
+        """Test deep merge combines nested dicts."""
+        result = merge_dicts(
+            {'db': {'host': 'x', 'opts': {'ssl': True}}},
+            {'db': {'port': 2, 'opts': {'timeout': 5}}},
+            {'db': {'host': 'y'}},
+            deep=True,
+        )
+        assert result == {'db': {'host': 'y', 'port': 2, 'opts': {'ssl': True, 'timeout': 5}}}
+    
+    def test_deep_merge_shares_untouched_subtrees(self):
+        """Test subtrees contributed by one input are shared, not copied."""
+        base = {'logging': {'level': 'info'}, 'db': {'host': 'x'}}
+        override = {'db': {'port': 2}}
+        result = merge_dicts(base, override, deep=True)
+        assert result['logging'] is base['logging']
+        assert result['db'] is not base['db']
+    
+    def test_deep_merge_does_not_modify_inputs(self):
+        """Test inputs are left untouched by a deep merge."""
+        base = {'db': {'host': 'x', 'opts': {'ssl': True}}, 'tags': ['a']}
+        override = {'db': {'opts': {'ssl': False}}, 'tags': ['b']}
+        merge_dicts(base, override, deep=True, list_strategy='append')
+        assert base == {'db': {'host': 'x', 'opts': {'ssl': True}}, 'tags': ['a']}
+        assert override == {'db': {'opts': {'ssl': False}}, 'tags': ['b']}
+    
+    def test_list_strategies(self):
+        """Test list handling in deep mode."""
+        a, b = {'tags': ['x', 'y']}, {'tags': ['y', 'z']}
+        assert merge_dicts(a, b, deep=True) == {'tags': ['y', 'z']}
+        assert merge_dicts(a, b, deep=True, list_strategy='append') == {'tags': ['x', 'y', 'y', 'z']}
+        assert merge_dicts(a, b, deep=True, list_strategy='unique') == {'tags': ['x', 'y', 'z']}
+    
+    def test_invalid_list_strategy(self):
+        """Test unknown list strategies are rejected."""
+        with pytest.raises(ValueError):
+            merge_dicts({}, deep=True, list_strategy='zip')
+
+
+class TestMergedView:
+    """Test cases for MergedView class."""
+    
+    def test_later_maps_win(self):
+        """Test lookups resolve to the last map containing the key."""
+        view = MergedView({'a': 1, 'b': 2}, {'a': 3})
+        assert view['a'] == 3
+        assert view['b'] == 2
+        assert 'b' in view
+        with pytest.raises(KeyError):
+            view['c']
+    
+    def test_nested_view(self):
+        """Test nested dicts resolve to nested views."""
+        view = MergedView({'db': {'host': 'x', 'port': 1}}, {'db': {'port': 2}})
+        assert isinstance(view['db'], MergedView)
+        assert dict(view['db']) == {'host': 'x', 'port': 2}
+    
+    def test_iteration_and_length(self):
+        """Test keys iterate in first-seen order."""
+        view = MergedView({'a': 1, 'b': 2}, {'c': 3, 'a': 4})
+        assert list(view) == ['a', 'b', 'c']
+        assert len(view) == 3
+    
+    def test_matches_merge_dicts(self):
+        """Test to_dict equals a deep merge of the same inputs."""
+        maps = [{'a': {'b': 1, 'l': [1]}}, {'a': {'c': 2, 'l': [2]}, 'd': 3}]
+        view = MergedView(*maps, list_strategy='append')
+        assert view.to_dict() == merge_dicts(*maps, deep=True, list_strategy='append')
+        assert view['a']['l'] == [1, 2]
+    
+    def test_shallow_view(self):
+        """Test non-deep views return the winning value as is."""
+        view = MergedView({'a': {'x': 1}}, {'a': {'y': 2}}, deep=False)
+        assert view['a'] == {'y': 2}
 
 
 class TestGetNested:
@@ -88,6 +197,309 @@ class TestGetNested:
         """Test with empty path."""
         data = {'a': 1}
         assert get_nested(data, '') == data
+    
+    def test_get_through_non_dict(self):
+        """Test path that runs into a non-dict value."""
+        data = {'a': {'b': 'text'}, 'items': [1, 2]}
+        assert get_nested(data, 'a.b.c', default='x') == 'x'
+        assert get_nested(data, 'items.0', default='x') == 'x'
+    
+    def test_path_cache_counters(self):
+        """Test that repeated paths hit the compiled path cache."""
+        clear_path_cache()
+        data = {'user': {'name': 'John'}}
+        get_nested(data, 'user.name')
+        get_nested(data, 'user.name')
+        info = path_cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+class TestCompilePath:
+    """Test cases for compile_path function."""
+    
+    def test_compiled_lookup(self):
+        """Test compiled accessor retrieves nested values."""
+        city = compile_path('user.address.city')
+        assert city({'user': {'address': {'city': 'NYC'}}}) == 'NYC'
+    
+    def test_compiled_reuse(self):
+        """Test compiled accessor is reusable across records."""
+        name = compile_path('user.name')
+        records = [{'user': {'name': 'A'}}, {'user': {'name': 'B'}}]
+        assert [name(r) for r in records] == ['A', 'B']
+    
+    def test_compiled_default(self):
+        """Test compiled accessor returns default for missing paths."""
+        accessor = compile_path('a.b')
+        assert accessor({'a': 1}) is None
+        assert accessor({}, 'missing') == 'missing'
+    
+    def test_compiled_keys(self):
+        """Test compiled accessor exposes parsed keys."""
+        assert compile_path('a.b.c').keys == ('a', 'b', 'c')
+        assert compile_path('').keys == ()
+
+
+class TestQueryNested:
+    """Test cases for compile_query and query_nested."""
+    
+    DATA = {
+        'orders': [
+            {'id': 1, 'items': [{'sku': 'A'}, {'sku': 'B'}]},
+            {'id': 2, 'items': [{'sku': 'C'}]},
+            {'id': 3, 'items': []},
+        ],
+        'a.b': {'c': 1},
+        'stats': {'0': 'zero', 'name': 'text'},
+    }
+    
+    def test_plain_keys(self):
+        """Test a query without wildcards yields the single value."""
+        assert list(query_nested(self.DATA, 'stats.name')) == ['text']
+        assert list(query_nested(self.DATA, 'stats.missing')) == []
+    
+    def test_list_indices(self):
+        """Test integer segments index lists, including negative indices."""
+        assert list(query_nested(self.DATA, 'orders.0.id')) == [1]
+        assert list(query_nested(self.DATA, 'orders.-1.id')) == [3]
+        assert list(query_nested(self.DATA, 'orders.9.id')) == []
+    
+    def test_index_segment_on_dict_and_string(self):
+        """Test integer segments are keys on dicts and never index strings."""
+        assert list(query_nested(self.DATA, 'stats.0')) == ['zero']
+        assert list(query_nested(self.DATA, 'stats.name.0')) == []
+    
+    def test_wildcard(self):
+        """Test * matches every list item and dict value, in order."""
+        assert list(query_nested(self.DATA, 'orders.*.items.0.sku')) == ['A', 'C']
+        assert list(query_nested(self.DATA, 'orders.*.items.*.sku')) == ['A', 'B', 'C']
+        assert list(query_nested(self.DATA, 'stats.*')) == ['zero', 'text']
+    
+    def test_recursive_descent(self):
+        """Test ** matches at any depth, including the current level."""
+        assert list(query_nested(self.DATA, '**.sku')) == ['A', 'B', 'C']
+        assert list(query_nested({'id': 1, 'x': [{'id': 2}]}, '**.id')) == [1, 2]
+        assert list(query_nested([1, [2]], '**')) == [[1, [2]], 1, [2], 2]
+    
+    def test_consecutive_recursive_descent(self):
+        """Test ** followed only by ** still matches leaves."""
+        assert list(query_nested(None, '**.**')) == [None]
+        assert list(query_nested([1, [2]], '**.**')) == \
+            [[1, [2]], 1, [2], 2, 1, [2], 2, 2]
+        assert list(query_nested({'a': 1, 'b': {'a': 2}}, '**.**.a')) == [1, 2, 2]
+    
+    def test_escaped_dots(self):
+        """Test escaped dots and wildcards are literal key characters."""
+        assert list(query_nested(self.DATA, r'a\.b.c')) == [1]
+        assert list(query_nested({'*': 5, 'x': 6}, r'\*')) == [5]
+        assert list(query_nested({'a\\b': 7}, r'a\\b')) == [7]
+    
+    def test_is_lazy_over_documents(self):
+        """Test iter_many consumes documents only as matches are requested."""
+        consumed = []
+        
+        def documents():
+            for i in range(3):
+                consumed.append(i)
+                yield {'id': i}
+        
+        matches = compile_query('id').iter_many(documents())
+        assert next(matches) == 0
+        assert consumed == [0]
+        assert list(matches) == [1, 2]
+    
+    def test_is_lazy_within_document(self):
+        """Test a single document is only walked as far as the matches requested."""
+        class Exploding(Mapping):
+            def __getitem__(self, key):
+                raise AssertionError("walked past the first match")
+            
+            def __iter__(self):
+                raise AssertionError("walked past the first match")
+            
+            def __len__(self):
+                return 1
+        
+        data = {'a': {'id': 1, 'x': [{'id': 2}]}, 'b': Exploding()}
+        for query in ('**.id', '*.id', '**'):
+            assert compile_query(query).first(data) is not None
+        matches = query_nested(data, '**.id')
+        assert [next(matches), next(matches)] == [1, 2]
+        with pytest.raises(AssertionError):
+            next(matches)
+    
+    def test_lazy_matches_findall(self):
+        """Test lazy evaluation yields exactly what findall returns."""
+        data = {'a': [{'b': 1}, {'b': [2, {'b': 3}]}], 'b': (4, {'b': 5}), 'c': 'b'}
+        for query in ('**', '**.b', '*.*.b', 'a.*.b.*', '**.b.1.b', 'a.-1.b.0', '**.**'):
+            compiled = compile_query(query)
+            assert list(compiled(data)) == compiled.findall(data)
+    
+    def test_evaluators_agree(self):
+        """Test the lazy walker and the compiled findall chain agree on every short query."""
+        class View(Mapping):
+            def __init__(self, data):
+                self._data = data
+            
+            def __getitem__(self, key):
+                return self._data[key]
+            
+            def __iter__(self):
+                return iter(self._data)
+            
+            def __len__(self):
+                return len(self._data)
+        
+        documents = [
+            self.DATA,
+            {'a': [{'b': 1}, {'b': [2, {'b': 3}]}], 'b': (4, {'b': 5}), 'c': 'b', '0': {'a': None}},
+            [{'a': {'b': [1, 2]}}, [[{'a': 0}]], 'ab', {'-1': 'x'}],
+            {'a': View({'b': {'a': [7]}, '1': 'one'}), 'b': []},
+            'scalar',
+        ]
+        missing = object()
+        segments = ['a', 'b', '0', '1', '-1', '*', '**']
+        queries = ['.'.join(parts) for n in range(1, 4) for parts in product(segments, repeat=n)]
+        for query in queries:
+            compiled = compile_query(query)
+            for data in documents:
+                expected = compiled.findall(data)
+                assert list(compiled(data)) == expected, (query, data)
+                assert list(compiled.iter_many([data, data])) == expected * 2, (query, data)
+                assert compiled.first(data, missing) is (expected[0] if expected else missing)
+    
+    def test_compiled_program(self):
+        """Test runs of keys and indices compile to a single step."""
+        program = compile_query('orders.*.items.0.sku').program
+        assert [op for op, _ in program] == ['step', 'wildcard', 'step']
+        assert program[2][1][0] == ('items', 0, 'sku')
+    
+    def test_first_and_findall(self):
+        """Test the first and findall helpers."""
+        skus = compile_query('orders.*.items.*.sku')
+        assert skus.first(self.DATA) == 'A'
+        assert skus.first({}, 'none') == 'none'
+        assert skus.findall(self.DATA) == ['A', 'B', 'C']
+        assert compile_query('orders.1.id').first(self.DATA) == 2
+    
+    def test_empty_query(self):
+        """Test the empty query matches the data itself."""
+        assert list(query_nested(self.DATA, '')) == [self.DATA]
+
+
+class TestExtractColumns:
+    """Test cases for extract_columns function."""
+    
+    def test_basic_columns(self):
+        """Test extracting columns from several records."""
+        records = [
+            {'user': {'id': 1, 'address': {'city': 'NYC', 'zip': '10001'}}},
+            {'user': {'id': 2, 'address': {'city': 'LA', 'zip': '90001'}}},
+        ]
+        result = extract_columns(
+            records, ['user.id', 'user.address.city', 'user.address.zip']
+        )
+        assert result == {
+            'user.id': [1, 2],
+            'user.address.city': ['NYC', 'LA'],
+            'user.address.zip': ['10001', '90001'],
+        }
+    
+    def test_missing_paths_use_default(self):
+        """Test missing keys are filled with the default."""
+        records = [
+            {'user': {'address': {'city': 'NYC'}}},
+            {'user': 'anonymous'},
+            {},
+        ]
+        result = extract_columns(
+            records, ['user.address.city', 'user.address.zip'], default=''
+        )
+        assert result == {
+            'user.address.city': ['NYC', '', ''],
+            'user.address.zip': ['', '', ''],
+        }
+    
+    def test_nested_and_parent_paths(self):
+        """Test extracting a path and one of its prefixes together."""
+        records = [{'a': {'b': {'c': 1}}}]
+        result = extract_columns(records, ['a.b', 'a.b.c', ''])
+        assert result == {
+            'a.b': [{'c': 1}],
+            'a.b.c': [1],
+            '': [{'a': {'b': {'c': 1}}}],
+        }
+    
+    def test_empty_records(self):
+        """Test extracting from no records."""
+        assert extract_columns([], ['a', 'b']) == {'a': [], 'b': []}
+    
+    def test_numpy_columns(self):
+        """Test NumPy array output."""
+        np = pytest.importorskip('numpy')
+        records = [{'x': 1, 'y': 'a'}, {'x': 2}]
+        result = extract_columns(
+            records, ['x', 'y'], as_numpy=True, dtypes={'x': np.int64}
+        )
+        assert result['x'].dtype == np.int64
+        assert result['x'].tolist() == [1, 2]
+        assert result['y'].dtype == object
+        assert result['y'].tolist() == ['a', None]
+
+
+class TestConvertKeys:
+    """Test cases for convert_keys and its camel/snake helpers."""
+    
+    def test_nested_conversion(self):
+        """Test keys are converted at every level, including inside lists."""
+        data = {'userId': 1, 'orderItems': [{'itemName': 'a', 'tags': ['xY']}]}
+        assert keys_to_snake(data) == {
+            'user_id': 1,
+            'order_items': [{'item_name': 'a', 'tags': ['xY']}],
+        }
+    
+    def test_round_trip(self):
+        """Test converting to snake_case and back."""
+        data = {'userId': {'firstName': 'A', 'lastName': 'B'}}
+        assert keys_to_camel(keys_to_snake(data)) == data
+    
+    def test_input_not_modified(self):
+        """Test the input structure is left untouched."""
+        data = {'userId': {'firstName': 'A'}}
+        keys_to_snake(data)
+        assert data == {'userId': {'firstName': 'A'}}
+    
+    def test_custom_function_and_shared_cache(self):
+        """Test a pluggable key function is called once per distinct key."""
+        calls = []
+        
+        def upper(key):
+            calls.append(key)
+            return key.upper()
+        
+        cache = {}
+        records = [{'a': 1, 'b': {'a': 2}}, {'a': 3}]
+        result = [convert_keys(r, upper, cache) for r in records]
+        assert result == [{'A': 1, 'B': {'A': 2}}, {'A': 3}]
+        assert sorted(calls) == ['a', 'b']
+    
+    def test_non_string_keys_and_leaves(self):
+        """Test non-string keys and scalar input pass through."""
+        assert convert_keys({1: {'aB': 2}}, str.upper) == {1: {'AB': 2}}
+        assert convert_keys('leaf', str.upper) == 'leaf'
+    
+    def test_deep_nesting(self):
+        """Test nesting deeper than the recursion limit."""
+        data = {}
+        node = data
+        for _ in range(5000):
+            node['childNode'] = {}
+            node = node['childNode']
+        result = keys_to_snake(data)
+        for _ in range(5000):
+            result = result['child_node']
+        assert result == {}
 
 
 class TestFlattenDict:
@@ -157,6 +569,423 @@ class TestFlattenDict:
             'settings.theme': 'dark',
             'settings.notifications': True
         }
+    
+    def test_flatten_lists(self):
+        """Test flatten descending into lists with index keys."""
+        data = {'items': [{'id': 1}, {'id': 2}], 'tags': ['a'], 'empty': []}
+        assert flatten_dict(data, flatten_lists=True) == {
+            'items.0.id': 1,
+            'items.1.id': 2,
+            'tags.0': 'a',
+            'empty': [],
+        }
+    
+    def test_flatten_empty_nested_dict(self):
+        """Test empty nested dicts are kept as leaves."""
+        assert flatten_dict({'a': {}, 'b': {'c': {}}}) == {'a': {}, 'b.c': {}}
+    
+    def test_flatten_deep_nesting(self):
+        """Test flatten beyond the recursion limit."""
+        data = {}
+        node = data
+        for _ in range(3000):
+            node['k'] = {}
+            node = node['k']
+        node['k'] = 1
+        assert flatten_dict(data) == {'.'.join(['k'] * 3001): 1}
+    
+    def test_flatten_non_string_keys(self):
+        """Test non-string keys are converted to strings."""
+        assert flatten_dict({1: {2: 'x'}}) == {'1.2': 'x'}
+
+
+class TestIterFlatItems:
+    """Test cases for iter_flat_items function."""
+    
+    def test_lazy_order(self):
+        """Test items are yielded lazily in depth-first order."""
+        gen = iter_flat_items({'a': {'b': 1, 'c': {'d': 2}}, 'e': 3})
+        assert next(gen) == ('a.b', 1)
+        assert list(gen) == [('a.c.d', 2), ('e', 3)]
+
+
+class TestFlattenRecords:
+    """Test cases for flatten_records and FlatRecord."""
+    
+    def test_matches_flatten_dict(self):
+        """Test records read like the flatten_dict result."""
+        data = {'user': {'id': 1, 'tags': ['a']}, 'ok': True}
+        record = next(flatten_records([data], flatten_lists=True))
+        expected = flatten_dict(data, flatten_lists=True)
+        assert record == expected
+        assert record.to_dict() == expected
+        assert list(record.items()) == list(expected.items())
+        assert record['user.id'] == 1
+        assert record.get('missing', 0) == 0
+        assert 'ok' in record and 'user' not in record
+        with pytest.raises(KeyError):
+            record['user']
+    
+    def test_shared_schema(self):
+        """Test records with the same keys share one schema; others get their own."""
+        rows = list(flatten_records([{'a': {'b': i}} for i in range(3)] + [{'c': 1}]))
+        assert rows[0].schema is rows[2].schema
+        assert rows[3].schema is not rows[0].schema
+        assert [row['a.b'] for row in rows[:3]] == [0, 1, 2]
+        assert rows[0] != rows[1]
+    
+    def test_schemas_shared_across_calls(self):
+        """Test passing a schemas mapping reuses schemas between batches."""
+        schemas = {}
+        first = next(flatten_records([{'a': 1}], schemas=schemas))
+        second = next(flatten_records([{'a': 2}], schemas=schemas))
+        assert first.schema is second.schema
+        assert list(schemas) == [('a',)]
+    
+    def test_read_only(self):
+        """Test records cannot be modified or given new attributes."""
+        record = FlatRecord(RecordSchema(['a']), (1,))
+        with pytest.raises(TypeError):
+            record['a'] = 2
+        with pytest.raises(AttributeError):
+            record.extra = 1
+    
+    def test_invalid_schema(self):
+        """Test mismatched values and duplicate keys are rejected."""
+        with pytest.raises(ValueError):
+            FlatRecord(RecordSchema(['a', 'b']), (1,))
+        with pytest.raises(ValueError):
+            RecordSchema(['a', 'a'])
+    
+    def test_memory(self):
+        """Test compact records use far less memory than flat dicts."""
+        import tracemalloc
+        
+        records = [{'user': {'id': i, 'name': 'x', 'email': None}, 'page': {'url': '/', 'ref': None}}
+                   for i in range(2000)]
+        
+        def allocated(build):
+            tracemalloc.start()
+            try:
+                result = build()
+                return tracemalloc.get_traced_memory()[0], result
+            finally:
+                tracemalloc.stop()
+        
+        dicts, _ = allocated(lambda: [flatten_dict(r) for r in records])
+        compact, _ = allocated(lambda: list(flatten_records(records)))
+        assert compact * 2 < dicts
+
+
+class TestFingerprint:
+    """Test cases for fingerprint and Fingerprinter."""
+    
+    def test_order_independent(self):
+        """Test dict and set ordering is ignored but list order is not."""
+        a = {'a': 1, 'b': [1, {'c': None, 'd': 2.5}], 'e': {b'x', 'y'}, (1, 2): 'tuple key'}
+        b = {(1, 2): 'tuple key', 'e': {'y', b'x'}, 'b': [1, {'d': 2.5, 'c': None}], 'a': 1}
+        assert fingerprint(a) == fingerprint(b)
+        assert fingerprint([1, 2]) != fingerprint([2, 1])
+    
+    def test_distinguishes_types(self):
+        """Test values that compare equal but differ in type get different fingerprints."""
+        values = [1, 1.0, True, '1', b'1', None, [1], (1,), {1}, [], {}, (), [[1]], [(1,)],
+                  {'a': 1}, {'a': '1'}, {'a': [1]}, {1: 'a'}, {'1': 'a'}]
+        assert len({fingerprint(v) for v in values}) == len(values)
+    
+    def test_stable(self):
+        """Test the fingerprint does not depend on the process (hash randomization)."""
+        import subprocess
+        import sys
+        
+        # Sets iterate in a seed-dependent order; 60 pairs leave room to inline a few
+        pairs = "{('k%d' % i, 'v%d' % i) for i in range(60)}"
+        for data in ("{'a': ['x', {'b': 1.5}]}", pairs, f"{{'x': frozenset({pairs})}}"):
+            code = f"from pyutils.dict_utils import fingerprint; print(fingerprint({data}, bits=128))"
+            runs = {
+                subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                               env={"PYTHONHASHSEED": seed, "PYTHONPATH": ":".join(sys.path)}).stdout
+                for seed in ("1", "2", "3", "4")
+            }
+            assert runs == {f"{fingerprint(eval(data), bits=128)}\n"}, data
+    
+    def test_bits(self):
+        """Test the fingerprint size and invalid sizes."""
+        assert fingerprint({'a': 1}, bits=128) < 2 ** 128
+        assert fingerprint({'a': 1}, bits=32) < 2 ** 32
+        with pytest.raises(ValueError):
+            fingerprint({}, bits=12)
+    
+    def test_wide_and_shared_subtrees(self):
+        """Test large leaf containers and shared subtrees hash by content."""
+        shared = list(range(100))
+        assert fingerprint({'a': shared, 'b': shared}) == \
+            fingerprint({'a': list(range(100)), 'b': list(range(100))})
+    
+    def test_scalar_subclasses(self):
+        """Test enum-like scalar subclasses hash like their base values."""
+        from enum import IntEnum
+        
+        class Level(IntEnum):
+            HIGH = 3
+        
+        assert fingerprint({'level': Level.HIGH}) == fingerprint({'level': 3})
+    
+    def test_errors(self):
+        """Test unsupported types and cycles raise."""
+        with pytest.raises(TypeError):
+            fingerprint({'a': object()})
+        cyclic = {'a': []}
+        cyclic['a'].append(cyclic)
+        with pytest.raises(ValueError):
+            fingerprint(cyclic)
+    
+    def test_deep_nesting(self):
+        """Test deeply nested data does not hit the recursion limit."""
+        data = {}
+        node = data
+        for _ in range(5000):
+            node['child'] = {}
+            node = node['child']
+        assert fingerprint(data) != fingerprint({})
+    
+    def test_remove_duplicates_key(self):
+        """Test fingerprint as a remove_duplicates key for unhashable records."""
+        records = [{'a': [1]}, {'a': [2]}, {'a': [1]}]
+        assert remove_duplicates(records, key=fingerprint) == [{'a': [1]}, {'a': [2]}]
+    
+    def test_incremental_update(self):
+        """Test updates match a full fingerprint and only rehash the changed path."""
+        data = {'db': {'hosts': [{'name': f'h{i}', 'tags': list(range(100))} for i in range(3)]},
+                'cache': {'ttl': 60}}
+        tracker = Fingerprinter(data)
+        assert tracker.fingerprint() == fingerprint(data)
+        cached = set(tracker._digests.values())
+        
+        assert tracker.update('db.hosts.1.name', 'renamed') == fingerprint(data)
+        assert data['db']['hosts'][1]['name'] == 'renamed'
+        # Untouched hosts keep their cached digests
+        assert len(cached & set(tracker._digests.values())) >= 2
+        assert tracker.update('cache.size', 10) == fingerprint(data)
+        assert tracker.update('', [1, 2]) == fingerprint([1, 2])
+    
+    def test_invalidate(self):
+        """Test in-place changes show up after invalidate."""
+        data = {'a': {'b': list(range(50))}, 'c': {'d': list(range(50))}}
+        tracker = Fingerprinter(data)
+        before = tracker.fingerprint()
+        data['a']['b'].append(50)
+        assert tracker.fingerprint() == before
+        tracker.invalidate('a.b')
+        assert tracker.fingerprint() == fingerprint(data)
+        data['c']['d'] = 'replaced'
+        tracker.invalidate('c')
+        assert tracker.fingerprint() == fingerprint(data)
+
+
+class TestDiffPatch:
+    """Test cases for diff_nested and apply_patch."""
+    
+    def test_diff(self):
+        """Test changed, added and removed leaves at any depth."""
+        old = {'db': {'host': 'x', 'port': 1, 'opts': {'ssl': True}}, 'debug': True, 'tags': [1]}
+        new = {'db': {'host': 'x', 'port': 2, 'opts': {}}, 'tags': [1, 2], 'name': 'svc'}
+        assert diff_nested(old, new) == {
+            'db.port': 2, 'db.opts.ssl': DELETE, 'debug': DELETE, 'tags': [1, 2], 'name': 'svc',
+        }
+        assert diff_nested(old, old) == {}
+    
+    def test_type_changes(self):
+        """Test a dict replaced by a leaf (and back) is a single change."""
+        assert diff_nested({'a': {'b': 1}}, {'a': 1}) == {'a': 1}
+        assert diff_nested({'a': 1}, {'a': {'b': 1}}) == {'a': {'b': 1}}
+        assert diff_nested({'a': None}, {}) == {'a': DELETE}
+    
+    def test_round_trip(self):
+        """Test apply_patch(old, diff_nested(old, new)) rebuilds new without touching old."""
+        import copy
+        
+        old = {'a': {'b': {'c': 1, 'd': [1]}, 'e': 2}, 'f': {'g': {}}, 1: 'int key'}
+        new = {'a': {'b': {'c': 2}, 'x': {'y': 3}}, 'f': {'g': {'h': None}}, 1: 'int key'}
+        snapshot = copy.deepcopy(old)
+        patched = apply_patch(old, diff_nested(old, new, separator='/'), separator='/')
+        assert patched == new
+        assert old == snapshot
+    
+    def test_ambiguous_keys(self):
+        """Test keys a patch path cannot represent are rejected instead of corrupting the result."""
+        with pytest.raises(ValueError, match="separator"):
+            diff_nested({'a.b': 1}, {'a.b': 2})
+        with pytest.raises(ValueError, match="non-string"):
+            diff_nested({'a': {1: 'x'}}, {'a': {1: 'y'}})
+        with pytest.raises(ValueError):
+            diff_nested({'a': {1: 'x'}}, {'a': {}})
+        # The same keys round-trip with a separator they do not contain
+        old, new = {'a.b': 1, 'c': {'d.e': 1}}, {'a.b': 2, 'c': {'d.e': 2}}
+        assert apply_patch(old, diff_nested(old, new, separator='/'), separator='/') == new
+    
+    def test_copy_on_write(self):
+        """Test untouched subtrees are shared and the result diffs cheaply against its source."""
+        old = {'a': {'b': 1}, 'big': {str(i): i for i in range(100)}}
+        patched = apply_patch(old, {'a.b': 2})
+        assert patched['big'] is old['big']
+        assert patched['a'] is not old['a']
+        assert diff_nested(old, patched) == {'a.b': 2}
+    
+    def test_deep_nesting(self):
+        """Test a change at the bottom of a deep chain does not hit the recursion limit."""
+        old, new = {}, {}
+        old_node, new_node = old, new
+        for _ in range(5000):
+            old_node['k'] = old_node = {}
+            new_node['k'] = new_node = {}
+        old_node['v'], new_node['v'] = 1, 2
+        assert diff_nested(old, new) == {'.'.join(['k'] * 5000 + ['v']): 2}
+    
+    def test_apply_missing_paths(self):
+        """Test missing parents are created and deleting a missing key is a no-op."""
+        assert apply_patch({}, {'a.b.c': 1, 'x.y': DELETE}) == {'a': {'b': {'c': 1}}}
+        with pytest.raises(ValueError):
+            apply_patch({'a': 1}, {'a.b': 2})
+    
+    def test_delete_repr_and_pickle(self):
+        """Test the DELETE marker prints and pickles as itself."""
+        import pickle
+        
+        assert repr(DELETE) == 'DELETE'
+        assert pickle.loads(pickle.dumps({'a': DELETE}))['a'] is DELETE
+
+
+class TestUnflattenDict:
+    """Test cases for unflatten_dict function."""
+    
+    def test_basic_unflatten(self):
+        """Test rebuilding nested dictionaries."""
+        assert unflatten_dict({'a.b': 1, 'a.c': 2, 'd': 3}) == {
+            'a': {'b': 1, 'c': 2},
+            'd': 3,
+        }
+    
+    def test_round_trip(self):
+        """Test unflatten is the inverse of flatten."""
+        data = {'a': {'b': {'c': 1}, 'e': {}}, 'f': [1, 2]}
+        assert unflatten_dict(flatten_dict(data)) == data
+        assert unflatten_dict(flatten_dict(data, separator='/'), separator='/') == data
+    
+    def test_round_trip_lists(self):
+        """Test restoring lists flattened with index keys."""
+        data = {'items': [{'id': 1}, {'id': 2, 'tags': ['x', 'y']}], 'n': {'0x': 1}}
+        flat = flatten_dict(data, flatten_lists=True)
+        assert unflatten_dict(flat, restore_lists=True) == data
+    
+    def test_restore_lists_ignores_other_keys(self):
+        """Test non-ASCII digits and non-string keys never become list indices."""
+        assert unflatten_dict({'a.²': 1}, restore_lists=True) == {'a': {'²': 1}}
+        assert unflatten_dict({'a': {1: 'x'}, 'a.b': 2}, restore_lists=True) == \
+            {'a': {1: 'x', 'b': 2}}
+    
+    def test_key_conflict(self):
+        """Test a key that is both leaf and prefix raises."""
+        with pytest.raises(ValueError):
+            unflatten_dict({'a': 1, 'a.b': 2})
+        with pytest.raises(ValueError):
+            unflatten_dict({'a.b': 2, 'a': 1})
+    
+    def test_input_not_modified(self):
+        """Test dict values are copied before being extended."""
+        leaf = {}
+        unflatten_dict({'a': leaf, 'a.b': 1})
+        assert leaf == {}
+
+
+class TestNestedIndex:
+    """Test cases for NestedIndex class."""
+    
+    def make_index(self):
+        return NestedIndex({
+            'db': {'host': 'x', 'port': 1, 'opts': {}},
+            'db!': 2,
+            'debug': True,
+        })
+    
+    def test_leaf_lookup(self):
+        """Test leaf paths resolve like get_nested."""
+        index = self.make_index()
+        assert index['db.port'] == 1
+        assert index.get('db.missing', 'default') == 'default'
+        assert len(index) == 5
+        with pytest.raises(KeyError):
+            index['nope']
+    
+    def test_inner_node_lookup(self):
+        """Test inner paths rebuild the subtree."""
+        index = self.make_index()
+        assert index.get('db') == {'host': 'x', 'port': 1, 'opts': {}}
+        assert 'db' in index
+        assert 'd' not in index
+    
+    def test_prefix_query(self):
+        """Test prefix queries stop at the separator boundary."""
+        index = self.make_index()
+        assert index.keys_with_prefix('db') == ['db.host', 'db.opts', 'db.port']
+        assert list(index.items_with_prefix('db.port')) == [('db.port', 1)]
+        assert index.keys_with_prefix('') == ['db!', 'db.host', 'db.opts', 'db.port', 'debug']
+    
+    def test_update_subtree(self):
+        """Test replacing a subtree re-indexes only that subtree."""
+        index = self.make_index()
+        index.update('db', {'host': 'y', 'replicas': {'a': 1}})
+        assert index.keys_with_prefix('db') == ['db.host', 'db.replicas.a']
+        assert index.to_dict() == {'db': {'host': 'y', 'replicas': {'a': 1}}, 'db!': 2, 'debug': True}
+    
+    def test_update_replaces_leaf_ancestor(self):
+        """Test setting a path below a leaf turns the leaf into a dict."""
+        index = self.make_index()
+        index.update('debug.level', 3)
+        index.update('db.opts.x', 1)
+        assert index.to_dict() == {
+            'db': {'host': 'x', 'port': 1, 'opts': {'x': 1}}, 'db!': 2, 'debug': {'level': 3},
+        }
+    
+    def test_updates_match_flatten_dict(self):
+        """Test the index stays equal to flatten_dict of the edited document."""
+        document = {'a': {'b': 1}, 'c': [1, 2]}
+        index = NestedIndex(document)
+        for path, value in [('a.b', {'x': 1}), ('a.e', 2), ('c', {}), ('a', 5), ('f.g.h', [3])]:
+            node = document
+            keys = path.split('.')
+            for key in keys[:-1]:
+                if not isinstance(node.get(key), dict):
+                    node[key] = {}
+                node = node[key]
+            node[keys[-1]] = value
+            index.update(path, value)
+            assert dict(index.items_with_prefix('')) == flatten_dict(document)
+    
+    def test_delete(self):
+        """Test deleting leaves and subtrees."""
+        index = self.make_index()
+        index.delete('db.host')
+        index.delete('db.port')
+        assert index.get('db') == {'opts': {}}
+        index.delete('db.opts')
+        assert index['db'] == {}
+        with pytest.raises(KeyError):
+            index.delete('missing')
+    
+    def test_flatten_lists(self):
+        """Test list items are indexed by position when requested."""
+        index = NestedIndex({'items': [{'id': 1}, {'id': 2}]}, flatten_lists=True)
+        assert index['items.1.id'] == 2
+        assert index.get('items') == [{'id': 1}, {'id': 2}]
+    
+    def test_memory_footprint(self):
+        """Test the memory report covers both structures."""
+        footprint = self.make_index().memory_footprint()
+        assert footprint['total'] == (
+            footprint['hash_index'] + footprint['sorted_keys'] + footprint['key_strings']
+        )
+        assert footprint['key_strings'] > 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,294 @@
+"""Tests for frequency_utils module."""
+
+import json
+import os
+import pickle
+import random
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+from pyutils.frequency_utils import CountMinSketch, SpaceSaving, top_k
+
+
+def skewed_stream(count, seed=0):
+    """Items with a few heavy hitters and a long tail of rare ones."""
+    rng = random.Random(seed)
+    return [
+        f"rare-{rng.getrandbits(32)}" if rng.random() < 0.3 else f"hot-{int(rng.paretovariate(1.0))}"
+        for _ in range(count)
+    ]
+
+
+class TestSpaceSaving:
+    """Test cases for SpaceSaving class."""
+    
+    def test_exact_below_capacity(self):
+        """Test counts are exact while every item has a counter."""
+        data = ["a", "b", "a", "c", "a", "b"]
+        summary = SpaceSaving(error=0.1)
+        summary.update(data)
+        assert summary.top_k() == Counter(data).most_common()
+        assert summary["a"] == 3 and summary["missing"] == 0
+        assert summary.bounds("a") == (3, 3)
+        assert summary.total == 6 and len(summary) == 3
+    
+    def test_error_bounds(self):
+        """Test every true count lies within the reported bounds."""
+        data = skewed_stream(20_000)
+        exact = Counter(data)
+        summary = SpaceSaving(error=0.01)
+        for item in data[:5000]:
+            summary.add(item)
+        summary.update(data[5000:])
+        assert len(summary) == summary.capacity == 100
+        for item, true_count in exact.items():
+            low, high = summary.bounds(item)
+            assert low <= true_count <= high
+            assert summary[item] - true_count <= 0.01 * len(data)
+        heavy = {item for item, n in exact.items() if n > 0.01 * len(data)}
+        assert heavy <= {item for item, _ in summary.top_k()}
+    
+    def test_merge(self):
+        """Test merging partial summaries keeps the guarantees."""
+        data = skewed_stream(20_000, seed=1)
+        exact = Counter(data)
+        parts = [SpaceSaving(error=0.01) for _ in range(4)]
+        for i, part in enumerate(parts):
+            part.update(data[i::4])
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        assert merged.total == len(data)
+        assert len(merged) <= merged.capacity
+        for item, true_count in exact.items():
+            low, high = merged.bounds(item)
+            assert low <= true_count <= high
+        assert merged.top_k(3) == exact.most_common(3)
+    
+    def test_serialization(self):
+        """Test to_dict/from_dict (through JSON) and pickling round-trip."""
+        summary = SpaceSaving(error=0.05)
+        summary.update(skewed_stream(2000))
+        restored = SpaceSaving.from_dict(json.loads(json.dumps(summary.to_dict())))
+        assert restored.top_k() == summary.top_k()
+        assert restored.total == summary.total
+        restored.update(["new"] * 1000)
+        assert restored.top_k(1) == [("new", restored["new"])]
+        assert pickle.loads(pickle.dumps(summary)).top_k() == summary.top_k()
+    
+    def test_invalid_arguments(self):
+        """Test invalid error rates and counts are rejected."""
+        with pytest.raises(ValueError):
+            SpaceSaving(error=0)
+        with pytest.raises(ValueError):
+            SpaceSaving(error=1.5)
+        with pytest.raises(ValueError):
+            SpaceSaving().add("a", 0)
+        with pytest.raises(ValueError):
+            SpaceSaving.from_dict({"error": 0.5, "total": 3, "counters": [["a", 1, 0]] * 3})
+
+
+class TestCountMinSketch:
+    """Test cases for CountMinSketch class."""
+    
+    def test_never_undercounts(self):
+        """Test estimates are at least the true count and within the bound."""
+        data = skewed_stream(20_000) + [1, 2, (1, "a"), b"a"] * 10
+        exact = Counter(data)
+        sketch = CountMinSketch(error=0.001)
+        sketch.update(data)
+        assert sketch.total == len(data)
+        overcounts = [sketch[item] - true_count for item, true_count in exact.items()]
+        assert min(overcounts) >= 0
+        assert sum(n > 0.001 * len(data) for n in overcounts) <= 0.01 * len(exact)
+        assert sketch["a"] == 0 or sketch["a"] <= 0.001 * len(data)
+    
+    def test_update_matches_add(self):
+        """Test update counts items that are equal but hash differently like add does."""
+        data = [1, True, 1.0, 0.0, -0.0, (1,), (True,), 'a', 'a', b'a', None]
+        added, updated = CountMinSketch(error=0.01), CountMinSketch(error=0.01)
+        for item in data:
+            added.add(item)
+        updated.update(data)
+        assert updated.to_dict() == added.to_dict()
+        assert [updated[item] for item in (1, True, 1.0, 'a')] == [1, 1, 1, 2]
+    
+    def test_merge_and_serialization(self):
+        """Test merged and restored sketches equal one built from the whole stream."""
+        data = skewed_stream(5000)
+        whole = CountMinSketch(error=0.01)
+        whole.update(data)
+        left, right = CountMinSketch(error=0.01), CountMinSketch(error=0.01)
+        left.update(data[:2000])
+        right.update(data[2000:])
+        left.merge(right)
+        assert left.to_dict() == whole.to_dict()
+        restored = CountMinSketch.from_dict(json.loads(json.dumps(whole.to_dict())))
+        assert all(restored[item] == whole[item] for item in data[:100])
+        with pytest.raises(ValueError):
+            whole.merge(CountMinSketch(error=0.1))
+    
+    def test_stable_across_processes(self):
+        """Test hashing does not depend on hash randomization."""
+        code = (
+            "from pyutils.frequency_utils import CountMinSketch; "
+            "s = CountMinSketch(error=0.05); s.update(['a', 'b', 'a', (1, 'x'), 2.5]); "
+            "print(s.to_dict()['table'])"
+        )
+        tables = {
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True, text=True, check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("1", "2")
+        }
+        assert len(tables) == 1
+    
+    def test_merge_across_hash_seeds(self):
+        """Test sketches built under different hash seeds merge into consistent counts."""
+        pairs = frozenset(('k%d' % i, 'v%d' % i) for i in range(60))
+        other = frozenset(('x%d' % i, 'y%d' % i) for i in range(60))
+        code = (
+            "import json; from pyutils.frequency_utils import CountMinSketch; "
+            "pairs = frozenset(('k%d' % i, 'v%d' % i) for i in range(60)); "
+            "other = frozenset(('x%d' % i, 'y%d' % i) for i in range(60)); "
+            "s = CountMinSketch(error=0.001); s.update([pairs, pairs, pairs, {'set': pairs}, other]); "
+            "print(json.dumps(s.to_dict()))"
+        )
+        merged = CountMinSketch(error=0.001)
+        for seed in ("1", "2"):
+            output = subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True, text=True, check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            merged.merge(CountMinSketch.from_dict(json.loads(output)))
+        assert merged.total == 10
+        assert (merged[pairs], merged[{'set': pairs}], merged[other]) == (6, 2, 2)
+    
+    def test_invalid_arguments(self):
+        """Test invalid error rates and counts are rejected."""
+        with pytest.raises(ValueError):
+            SpaceSaving(error=0)
+        with pytest.raises(ValueError):
+            SpaceSaving(error=1.5)
+        with pytest.raises(ValueError):
+            SpaceSaving().add("a", 0)
+        with pytest.raises(ValueError):
+            SpaceSaving.from_dict({"error": 0.5, "total": 3, "counters": [["a", 1, 0]] * 3})
+
+
+class TestCountMinSketch:
+    """Test cases for CountMinSketch class."""
+    
+    def test_never_undercounts(self):
+        """Test estimates are at least the true count and within the bound."""
+        data = skewed_stream(20_000) + [1, 2, (1, "a"), b"a"] * 10
+        exact = Counter(data)
+        sketch = CountMinSketch(error=0.001)
+        sketch.update(data)
+        assert sketch.total == len(data)
+        overcounts = [sketch[item] - true_count for item, true_count in exact.items()]
+        assert min(overcounts) >= 0
+        assert sum(n > 0.001 * len(data) for n in overcounts) <= 0.01 * len(exact)
+        assert sketch["a"] == 0 or sketch["a"] <= 0.001 * len(data)
+    
+    def test_update_matches_add(self):
+        """Test update counts items that are equal but hash differently like add does."""
+        data = [1, True, 1.0, 0.0, -0.0, (1,), (True,), 'a', 'a', b'a', None]
+        added, updated = CountMinSketch(error=0.01), CountMinSketch(error=0.01)
+        for item in data:
+            added.add(item)
+        updated.update(data)
+        assert updated.to_dict() == added.to_dict()
+        assert [updated[item] for item in (1, True, 1.0, 'a')] == [1, 1, 1, 2]
+    
+    def test_merge_and_serialization(self):
+        """Test merged and restored sketches equal one built from the whole stream."""
+        data = skewed_stream(5000)
+        whole = CountMinSketch(error=0.01)
+        whole.update(data)
+        left, right = CountMinSketch(error=0.01), CountMinSketch(error=0.01)
+        left.update(data[:2000])
+        right.update(data[2000:])
+        left.merge(right)
+        assert left.to_dict() == whole.to_dict()
+        restored = CountMinSketch.from_dict(json.loads(json.dumps(whole.to_dict())))
+        assert all(restored[item] == whole[item] for item in data[:100])
+        with pytest.raises(ValueError):
+            whole.merge(CountMinSketch(error=0.1))
+    
+    def test_stable_across_processes(self):
+        """Test hashing does not depend on hash randomization."""
+        code = (
+            "from pyutils.frequency_utils import CountMinSketch; "
+            "s = CountMinSketch(error=0.05); s.update(['a', 'b', 'a', (1, 'x'), 2.5]); "
+            "print(s.to_dict()['table'])"
+        )
+        tables = {
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True, text=True, check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("1", "2")
+        }
+        assert len(tables) == 1
+    
+    def test_merge_across_hash_seeds(self):
+        """Test sketches built under different hash seeds merge into consistent counts."""
+        items = (
+            "pairs = frozenset(('k%d' % i, 'v%d' % i) for i in range(60)); "
+            "other = frozenset(('x%d' % i, 'y%d' % i) for i in range(60)); "
+        )
+        code = (
+            "import json; from pyutils.frequency_utils import CountMinSketch; " + items +
+            "s = CountMinSketch(error=0.001); s.update([pairs, pairs, pairs, {'set': pairs}, other]); "
+            "print(json.dumps(s.to_dict()))"
+        )
+        merged = CountMinSketch(error=0.001)
+        for seed in ("1", "2"):
+            output = subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True, text=True, check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            merged.merge(CountMinSketch.from_dict(json.loads(output)))
+        namespace = {}
+        exec(items, namespace)
+        pairs, other = namespace['pairs'], namespace['other']
+        assert merged.total == 10
+        assert (merged[pairs], merged[{'set': pairs}], merged[other]) == (6, 2, 2)
+    
+    def test_invalid_arguments(self):
+        """Test invalid parameters are rejected."""
+        with pytest.raises(ValueError):
+            CountMinSketch(error=0)
+        with pytest.raises(ValueError):
+            CountMinSketch(confidence=1)
+        with pytest.raises(ValueError):
+            CountMinSketch().add("a", -1)
+
+
+class TestTopK:
+    """Test cases for top_k function."""
+    
+    def test_matches_counter(self):
+        """Test results match Counter.most_common on a skewed stream."""
+        data = skewed_stream(10_000)
+        assert top_k(iter(data), 5) == Counter(data).most_common(5)
+    
+    def test_key(self):
+        """Test counting a key of unhashable records."""
+        records = [{"url": "/a"}, {"url": "/b"}, {"url": "/a"}]
+        assert top_k(records, 1, key=lambda r: r["url"]) == [("/a", 2)]
+        assert top_k(records, 0, key=lambda r: r["url"]) == []
+        with pytest.raises(ValueError):
+            top_k(records, -1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
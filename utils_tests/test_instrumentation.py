@@ -0,0 +1,160 @@
+"""Tests for instrumentation module."""
+
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+import pyutils
+from pyutils import instrumentation, string_utils
+
+
+@pytest.fixture(autouse=True)
+def clean_instrumentation():
+    """Disable instrumentation and clear statistics around each test."""
+    instrumentation.disable()
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+class TestEnableDisable:
+    """Test cases for enabling and disabling instrumentation."""
+    
+    def test_disabled_by_default(self):
+        """Test public functions are the originals when disabled."""
+        assert not instrumentation.is_enabled()
+        assert pyutils.slugify is string_utils.slugify
+        assert not hasattr(pyutils.slugify, '__pyutils_instrumented__')
+    
+    def test_enable_wraps_and_disable_restores(self):
+        """Test enable installs wrappers and disable removes them."""
+        original = pyutils.slugify
+        instrumentation.enable()
+        assert instrumentation.is_enabled()
+        assert pyutils.slugify is not original
+        assert string_utils.slugify is pyutils.slugify
+        assert pyutils.slugify.__wrapped__ is original
+        instrumentation.disable()
+        assert pyutils.slugify is original
+        assert string_utils.slugify is original
+    
+    def test_enable_selected_functions(self):
+        """Test instrumenting only some functions."""
+        instrumentation.enable(['truncate'])
+        assert hasattr(pyutils.truncate, '__pyutils_instrumented__')
+        assert not hasattr(pyutils.slugify, '__pyutils_instrumented__')
+    
+    def test_enable_from_environment(self):
+        """Test the environment variable enables instrumentation at import."""
+        code = (
+            'import pyutils; from pyutils import instrumentation; '
+            'pyutils.slugify("a b"); print(instrumentation.snapshot()["slugify"]["calls"])'
+        )
+        env = dict(os.environ, PYUTILS_INSTRUMENTATION='1')
+        output = subprocess.run(
+            [sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True
+        )
+        assert output.stdout.strip() == '1'
+
+
+class TestSnapshot:
+    """Test cases for recorded statistics."""
+    
+    def test_counts_calls_and_sizes(self):
+        """Test calls, latency and input sizes are recorded."""
+        instrumentation.enable()
+        pyutils.slugify('Hello World')
+        pyutils.slugify('x' * 500)
+        stats = instrumentation.snapshot()['slugify']
+        assert stats['calls'] == 2
+        assert stats['errors'] == 0
+        assert sum(stats['latency_buckets'].values()) == 2
+        assert stats['size_sum'] == 511
+        assert stats['size_buckets']['100'] == 1
+        assert stats['size_buckets']['1000'] == 1
+    
+    def test_counts_errors(self):
+        """Test exceptions are counted and re-raised."""
+        instrumentation.enable()
+        with pytest.raises(ValueError):
+            pyutils.chunk_list([1], 0)
+        assert instrumentation.snapshot()['chunk_list']['errors'] == 1
+    
+    def test_results_unchanged(self):
+        """Test wrapped functions return the same results."""
+        instrumentation.enable()
+        assert pyutils.get_nested({'a': {'b': 1}}, 'a.b') == 1
+        assert pyutils.flatten_list([[1], [2]]) == [1, 2]
+    
+    def test_nested_calls_not_counted(self):
+        """Test public functions called by other public functions are not recorded."""
+        instrumentation.enable()
+        pyutils.flatten_list([[1], [2, [3]]])
+        stats = instrumentation.snapshot()
+        assert stats['flatten_list']['calls'] == 1
+        assert 'iter_flatten' not in stats
+    
+    def test_iterator_consumption_timed(self):
+        """Test iterators are recorded once consumed, including the time spent producing items."""
+        instrumentation.enable()
+        nested = [[i] for i in range(1000)]
+        start = time.perf_counter()
+        items = pyutils.iter_flatten(nested)
+        assert 'iter_flatten' not in instrumentation.snapshot()
+        assert sum(items) == 499500
+        elapsed = time.perf_counter() - start
+        stats = instrumentation.snapshot()['iter_flatten']
+        assert stats['calls'] == 1
+        assert 0 < stats['total_seconds'] <= elapsed
+        # Only the consumer stopping early is not an error
+        chunks = pyutils.iter_chunks(range(10), 3)
+        next(chunks)
+        chunks.close()
+        stats = instrumentation.snapshot()['iter_chunks']
+        assert (stats['calls'], stats['errors']) == (1, 0)
+    
+    def test_stats_kept_after_disable(self):
+        """Test statistics survive disable until reset."""
+        instrumentation.enable()
+        pyutils.truncate('abc', 2)
+        instrumentation.disable()
+        pyutils.truncate('abc', 2)
+        assert instrumentation.snapshot()['truncate']['calls'] == 1
+        instrumentation.reset()
+        assert instrumentation.snapshot() == {}
+
+
+class TestPrometheus:
+    """Test cases for Prometheus export."""
+    
+    def test_text_format(self):
+        """Test counters and cumulative histogram buckets are rendered."""
+        instrumentation.enable()
+        pyutils.slugify('Hello World')
+        text = instrumentation.prometheus_text()
+        assert 'pyutils_calls_total{function="slugify"} 1' in text
+        assert 'pyutils_call_duration_seconds_bucket{function="slugify",le="+Inf"} 1' in text
+        assert 'pyutils_input_size_count{function="slugify"} 1' in text
+        assert '# TYPE pyutils_call_duration_seconds histogram' in text
+    
+    def test_http_endpoint(self):
+        """Test the metrics endpoint serves the text dump."""
+        instrumentation.enable()
+        pyutils.truncate('abc', 2)
+        server = instrumentation.serve_metrics(port=0)
+        try:
+            url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode('utf-8')
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'pyutils_calls_total{function="truncate"} 1' in body
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
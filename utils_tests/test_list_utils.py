@@ -1,7 +1,15 @@
 """Tests for list_utils module."""
 
 import pytest
-from pyutils.list_utils import chunk_list, flatten_list, remove_duplicates
+from pyutils.list_utils import (
+    BloomFilter,
+    chunk_list,
+    flatten_list,
+    iter_chunks,
+    iter_flatten,
+    iter_unique,
+    remove_duplicates,
+)
 
 
 class TestChunkList:
@@ -56,6 +64,80 @@ class TestChunkList:
         """Test chunking with float chunk size."""
         with pytest.raises(TypeError):
             chunk_list([1, 2, 3], 2.5)
+    
+    def test_lazy_chunking(self):
+        """Test lazy mode yields the same chunks one at a time."""
+        result = chunk_list([1, 2, 3, 4, 5], 2, lazy=True)
+        assert not isinstance(result, list)
+        assert list(result) == [[1, 2], [3, 4], [5]]
+    
+    def test_lazy_validates_eagerly(self):
+        """Test lazy mode rejects bad chunk sizes immediately."""
+        with pytest.raises(ValueError):
+            chunk_list([1, 2, 3], 0, lazy=True)
+        with pytest.raises(TypeError):
+            chunk_list([1, 2, 3], 2.5, lazy=True)
+    
+    def test_numpy_chunks_are_views(self):
+        """Test ndarray input is split into views along the first axis."""
+        np = pytest.importorskip('numpy')
+        data = np.arange(10).reshape(5, 2)
+        chunks = chunk_list(data, 2)
+        assert [chunk.tolist() for chunk in chunks] == [[[0, 1], [2, 3]], [[4, 5], [6, 7]], [[8, 9]]]
+        assert all(np.shares_memory(chunk, data) for chunk in chunks)
+
+
+class TestIterChunks:
+    """Test cases for iter_chunks function."""
+    
+    def test_iterator_input(self):
+        """Test chunking a plain iterator."""
+        result = list(iter_chunks(iter(range(5)), 2))
+        assert result == [[0, 1], [2, 3], [4]]
+    
+    def test_padding(self):
+        """Test padding the final chunk."""
+        result = list(iter_chunks(range(5), 2, pad=True, fillvalue=0))
+        assert result == [[0, 1], [2, 3], [4, 0]]
+    
+    def test_padding_exact_fit(self):
+        """Test padding when input divides evenly."""
+        assert list(iter_chunks([1, 2], 2, pad=True)) == [[1, 2]]
+    
+    def test_bytes_zero_copy(self):
+        """Test bytes input yields memoryview slices."""
+        data = bytearray(b'abcdefg')
+        chunks = list(iter_chunks(data, 3))
+        assert all(isinstance(chunk, memoryview) for chunk in chunks)
+        assert [bytes(chunk) for chunk in chunks] == [b'abc', b'def', b'g']
+        data[0] = ord('z')
+        assert bytes(chunks[0]) == b'zbc'
+    
+    def test_array_zero_copy(self):
+        """Test array.array input yields memoryview slices."""
+        from array import array
+        chunks = list(iter_chunks(array('i', range(5)), 2))
+        assert [chunk.tolist() for chunk in chunks] == [[0, 1], [2, 3], [4]]
+    
+    def test_buffer_padding_rejected(self):
+        """Test padding is refused for zero-copy inputs."""
+        with pytest.raises(ValueError):
+            iter_chunks(b'abc', 2, pad=True)
+    
+    def test_numpy_views(self):
+        """Test NumPy input yields views."""
+        np = pytest.importorskip('numpy')
+        data = np.arange(5)
+        chunks = list(iter_chunks(data, 2))
+        assert [chunk.tolist() for chunk in chunks] == [[0, 1], [2, 3], [4]]
+        assert all(np.shares_memory(chunk, data) for chunk in chunks)
+    
+    def test_invalid_chunk_size(self):
+        """Test invalid chunk sizes raise immediately."""
+        with pytest.raises(ValueError):
+            iter_chunks([1], 0)
+        with pytest.raises(TypeError):
+            iter_chunks([1], 1.5)
 
 
 class TestFlattenList:
@@ -95,6 +177,81 @@ class TestFlattenList:
         """Test flatten with single sublist."""
         result = flatten_list([[1, 2, 3]])
         assert result == [1, 2, 3]
+    
+    def test_flatten_beyond_recursion_limit(self):
+        """Test flatten with nesting deeper than the recursion limit."""
+        nested = [0]
+        for i in range(1, 5000):
+            nested = [nested, i]
+        assert flatten_list(nested) == list(range(5000))
+    
+    def test_flatten_max_depth(self):
+        """Test flatten limited to a number of levels."""
+        assert flatten_list([1, [2, [3, [4]]]], max_depth=1) == [1, 2, [3, [4]]]
+        assert flatten_list([1, [2]], max_depth=0) == [1, [2]]
+    
+    def test_flatten_container_types(self):
+        """Test flatten descending into tuples when requested."""
+        assert flatten_list([(1, 2), [3]]) == [(1, 2), 3]
+        assert flatten_list([(1, 2), [3]], container_types=(list, tuple)) == [1, 2, 3]
+    
+    def test_flatten_ndarray(self):
+        """Test ndarray input is flattened along its axes when ndarrays are containers."""
+        np = pytest.importorskip('numpy')
+        data = np.arange(24).reshape(2, 3, 4)
+        types = (list, np.ndarray)
+        assert flatten_list(data, types).tolist() == list(range(24))
+        assert np.shares_memory(flatten_list(data, types), data)
+        assert flatten_list(data, types, max_depth=0).shape == (2, 3, 4)
+        assert flatten_list(data, types, max_depth=1).shape == (6, 4)
+        assert flatten_list(data, types, max_depth=1).tolist() == \
+            flatten_list(data.tolist(), max_depth=1)
+    
+    def test_top_level_ndarray_is_iterated_by_default(self):
+        """Test a top-level ndarray is only iterated, like a list of arrays, by default."""
+        np = pytest.importorskip('numpy')
+        data = np.arange(6).reshape(2, 3)
+        result = flatten_list(data)
+        assert isinstance(result, list)
+        assert [row.tolist() for row in result] == [[0, 1, 2], [3, 4, 5]]
+    
+    def test_flatten_list_of_ndarrays(self):
+        """Test a list of ndarrays is concatenated when ndarrays are containers."""
+        np = pytest.importorskip('numpy')
+        arrays = [np.arange(3), np.arange(4).reshape(2, 2)]
+        result = flatten_list(arrays, container_types=(list, np.ndarray))
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [0, 1, 2, 0, 1, 2, 3]
+        assert result.tolist() == list(iter_flatten(arrays, container_types=(list, np.ndarray)))
+    
+    def test_ndarrays_are_items_by_default(self):
+        """Test ndarrays inside a list are kept whole unless they are containers."""
+        np = pytest.importorskip('numpy')
+        arrays = [np.arange(3), np.arange(2)]
+        assert all(a is b for a, b in zip(flatten_list(arrays), arrays))
+        assert len(flatten_list(arrays, container_types=(list,))) == 2
+        assert flatten_list([arrays[0], [5]])[1] == 5
+
+
+class TestIterFlatten:
+    """Test cases for iter_flatten function."""
+    
+    def test_is_lazy(self):
+        """Test that items are produced on demand."""
+        gen = iter_flatten([[1, 2], [3]])
+        assert next(gen) == 1
+        assert list(gen) == [2, 3]
+    
+    def test_generators(self):
+        """Test descending into generators."""
+        import types
+        nested = [1, (x for x in [2, [3]])]
+        result = list(iter_flatten(nested, container_types=(list, types.GeneratorType)))
+        assert result == [1, 2, 3]
+    
+    def test_strings_are_leaves(self):
+        """Test strings are never descended into."""
+        assert list(iter_flatten(['ab', ['cd']])) == ['ab', 'cd']
 
 
 class TestRemoveDuplicates:
@@ -140,6 +297,143 @@ class TestRemoveDuplicates:
         """Test list with single element."""
         result = remove_duplicates([1])
         assert result == [1]
+    
+    def test_unhashable_items(self):
+        """Test duplicate removal of dicts and lists."""
+        data = [{'a': 1, 'b': [1, 2]}, {'b': [1, 2], 'a': 1}, [1, 2], [1, 2], {'a': 2}]
+        result = remove_duplicates(data)
+        assert result == [{'a': 1, 'b': [1, 2]}, [1, 2], {'a': 2}]
+    
+    def test_key_function(self):
+        """Test duplicate removal by key."""
+        data = [{'id': 1, 'v': 'a'}, {'id': 2, 'v': 'b'}, {'id': 1, 'v': 'c'}]
+        result = remove_duplicates(data, key=lambda r: r['id'])
+        assert result == [{'id': 1, 'v': 'a'}, {'id': 2, 'v': 'b'}]
+    
+    def test_key_function_case_insensitive(self):
+        """Test duplicate removal with a normalizing key."""
+        result = remove_duplicates(['A', 'b', 'a', 'B'], key=str.lower)
+        assert result == ['A', 'b']
+    
+    def test_numpy_preserves_first_occurrence(self):
+        """Test ndarray dedup keeps first occurrences in order."""
+        np = pytest.importorskip('numpy')
+        result = remove_duplicates(np.array([3, 1, 3, 2, 1]))
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [3, 1, 2]
+        assert remove_duplicates(np.array([3, 1, 3]), preserve_order=False).tolist() == [1, 3]
+        assert remove_duplicates(np.array([], dtype=int)).tolist() == []
+    
+    def test_numpy_rows(self):
+        """Test 2-D ndarray dedup compares whole rows."""
+        np = pytest.importorskip('numpy')
+        data = np.array([[1, 2], [0, 0], [1, 2]])
+        assert remove_duplicates(data).tolist() == [[1, 2], [0, 0]]
+    
+    def test_numpy_object_dtype(self):
+        """Test arrays NumPy cannot sort fall back to item-by-item dedup."""
+        np = pytest.importorskip('numpy')
+        assert remove_duplicates(np.array([1, 'a', None, 1], dtype=object)) == [1, 'a', None]
+        assert remove_duplicates(np.array(['b', 'a', 'b'])) == ['b', 'a']
+    
+    def test_numpy_with_key(self):
+        """Test a key function falls back to the generic path."""
+        np = pytest.importorskip('numpy')
+        assert remove_duplicates(np.array([1, -1, 2]), key=abs) == [1, 2]
+
+
+class TestIterUnique:
+    """Test cases for iter_unique function."""
+    
+    def test_streaming(self):
+        """Test unique items are produced lazily."""
+        gen = iter_unique(iter([1, 1, 2, 3, 2]))
+        assert next(gen) == 1
+        assert list(gen) == [2, 3]
+    
+    def test_list_and_tuple_differ(self):
+        """Test lists and tuples with equal items stay distinct."""
+        assert list(iter_unique([[1, 2], (1, 2)])) == [[1, 2], (1, 2)]
+    
+    def test_no_collision_with_tagged_tuples(self):
+        """Test unhashable items never equal tuples that resemble their keys."""
+        data = [[1, 2], ("__list__", (1, 2)), {"a": 1}, ("__dict__", frozenset({("a", 1)}))]
+        assert list(iter_unique(data)) == data
+    
+    def test_deeply_nested_records(self):
+        """Test records nested beyond the recursion limit are deduplicated."""
+        def chain(depth):
+            root = node = []
+            for _ in range(depth):
+                child = {"k": []}
+                node.append(child)
+                node = child["k"]
+            return root
+        
+        data = [chain(5000), chain(5000), chain(4999)]
+        assert len(list(iter_unique(data))) == 2
+        assert len(list(iter_unique(data, approximate=True, capacity=10))) == 2
+    
+    def test_cyclic_records(self):
+        """Test cyclic unhashable items are rejected."""
+        cyclic = [1]
+        cyclic.append([cyclic])
+        with pytest.raises(ValueError):
+            list(iter_unique([cyclic]))
+    
+    def test_approximate_mode(self):
+        """Test Bloom-filter dedup never yields a duplicate."""
+        data = [i % 500 for i in range(5000)]
+        result = list(iter_unique(data, approximate=True, capacity=1000, error_rate=0.01))
+        assert len(result) == len(set(result))
+        assert len(result) >= 490
+    
+    def test_approximate_unhashable(self):
+        """Test Bloom-filter dedup with dict records."""
+        data = [{'id': 1}, {'id': 1}, {'id': 2}]
+        assert list(iter_unique(data, approximate=True, capacity=10)) == [{'id': 1}, {'id': 2}]
+        records = [{'id': i % 50, 'tags': [i % 50]} for i in range(1000)]
+        assert len(list(iter_unique(records, approximate=True, capacity=100))) == 50
+    
+    def test_approximate_colliding_hashes(self):
+        """Test integers with equal builtin hashes are kept apart."""
+        assert list(iter_unique([-1, -2], approximate=True)) == [-1, -2]
+        assert list(iter_unique([1, 2**61], approximate=True)) == [1, 2**61]
+        assert list(iter_unique([1, 1.0, True], approximate=True)) == [1]
+    
+    def test_approximate_colliding_records(self):
+        """Test records and tuples built from colliding integers are kept apart."""
+        records = [{'id': -1}, {'id': -2}]
+        assert list(iter_unique(records, approximate=True)) == records
+        assert list(iter_unique([(-1, 'a'), (-2, 'a')], approximate=True)) == [(-1, 'a'), (-2, 'a')]
+        nested = [{'a': [-1, {'b': -1}]}, {'a': [-1, {'b': -2}]}, {'a': [-1, {'b': -1}]}]
+        assert list(iter_unique(nested, approximate=True)) == nested[:2]
+
+
+class TestBloomFilter:
+    """Test cases for BloomFilter class."""
+    
+    def test_membership(self):
+        """Test added items are always found."""
+        bloom = BloomFilter(capacity=100, error_rate=0.01)
+        for i in range(100):
+            bloom.add(i)
+        assert all(i in bloom for i in range(100))
+    
+    def test_false_positive_rate(self):
+        """Test false-positive rate stays near the target."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'item-{i}')
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        assert false_positives < 300
+    
+    def test_invalid_parameters(self):
+        """Test invalid sizing parameters."""
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=10, error_rate=1.5)
 
 
 if __name__ == "__main__":
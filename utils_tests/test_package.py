@@ -0,0 +1,88 @@
+"""Tests for the pyutils package: lazy loading and import-time budget."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pyutils
+
+# Cumulative `python -X importtime` budget for `import pyutils`, in microseconds
+IMPORT_TIME_BUDGET_US = 20_000
+
+
+def run_python(code, *options):
+    """Run code in a fresh interpreter without instrumentation, returning the result."""
+    env = {key: value for key, value in os.environ.items() if key != "PYUTILS_INSTRUMENTATION"}
+    return subprocess.run(
+        [sys.executable, *options, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def import_time_us():
+    """Cumulative import time of pyutils reported by -X importtime."""
+    output = run_python("import pyutils", "-X", "importtime")
+    for line in output.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "pyutils":
+            return int(fields[1])
+    raise AssertionError(f"pyutils missing from importtime output:\n{output.stderr}")
+
+
+class TestLazyImport:
+    """Test cases for lazy loading of submodules."""
+    
+    def test_import_loads_no_submodules(self):
+        """Test import pyutils imports no submodule, numpy or typing."""
+        output = run_python(
+            "import sys, pyutils; "
+            "print(sorted(m for m in sys.modules if m.startswith(('pyutils.', 'numpy', 'typing'))))"
+        )
+        assert output.stdout.strip() == "[]"
+    
+    def test_attribute_loads_defining_module(self):
+        """Test the first attribute access imports only what it needs."""
+        output = run_python(
+            "import sys, pyutils; pyutils.chunk_list; "
+            "print(sorted(m for m in sys.modules if m.startswith('pyutils.')))"
+        )
+        assert output.stdout.strip() == "['pyutils._compat', 'pyutils.list_utils']"
+    
+    def test_public_names_resolve(self):
+        """Test every name in __all__ resolves to the submodule's object."""
+        for name in pyutils.__all__:
+            value = getattr(pyutils, name)
+            module = sys.modules[f"pyutils.{pyutils._LAZY_ATTRS[name]}"]
+            assert getattr(module, name) is value
+    
+    def test_submodule_attribute(self):
+        """Test submodules are reachable as attributes without importing them first."""
+        output = run_python("import pyutils; print(pyutils.parallel.__name__)")
+        assert output.stdout.strip() == "pyutils.parallel"
+    
+    def test_unknown_attribute(self):
+        """Test unknown names raise AttributeError."""
+        with pytest.raises(AttributeError):
+            pyutils.no_such_function
+    
+    def test_dir_lists_public_names(self):
+        """Test dir() includes names that have not been loaded yet."""
+        assert set(pyutils.__all__) <= set(dir(pyutils))
+        assert "dict_utils" in dir(pyutils)
+
+
+class TestImportTime:
+    """Startup benchmark for import pyutils."""
+    
+    def test_import_time_budget(self):
+        """Test import pyutils stays within the import-time budget."""
+        # Best of three runs, to keep a noisy machine from failing the build
+        best = min(import_time_us() for _ in range(3))
+        assert best <= IMPORT_TIME_BUDGET_US, (
+            f"import pyutils took {best} us, budget is {IMPORT_TIME_BUDGET_US} us"
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+"""Tests for parallel module."""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import count, cycle, islice
+
+import pytest
+from pyutils import parallel
+from pyutils.parallel import calibrate, imap_batch, map_batch
+from pyutils.string_utils import camel_to_snake, slugify, truncate
+
+
+class TestMapBatch:
+    """Test cases for map_batch function."""
+    
+    def test_process_pool_keeps_order(self):
+        """Test results from a process pool keep input order."""
+        texts = [f'Item Number {i}!' for i in range(50)]
+        result = map_batch(slugify, texts, workers=2, chunk_size=7, min_items=0)
+        assert result == [slugify(t) for t in texts]
+    
+    def test_small_input_runs_in_process(self):
+        """Test inputs below the cutover never start a pool."""
+        # A lambda cannot be pickled, so this only works in-process
+        result = map_batch(lambda x: x * 2, [1, 2, 3], workers=2, min_items=10)
+        assert result == [2, 4, 6]
+    
+    def test_partial_function(self):
+        """Test functions with bound arguments via functools.partial."""
+        func = partial(truncate, max_length=5)
+        texts = ['Hello World', 'Hi', 'Longer text']
+        assert map_batch(func, texts, workers=2, chunk_size=1, min_items=0) == \
+            [func(t) for t in texts]
+    
+    def test_iterator_input(self):
+        """Test a generator input is consumed lazily and fully."""
+        names = (f'someName{i}' for i in range(20))
+        result = map_batch(camel_to_snake, names, workers=2, chunk_size=4, min_items=0)
+        assert result == [f'some_name{i}' for i in range(20)]
+    
+    def test_empty_input(self):
+        """Test an empty input."""
+        assert map_batch(slugify, [], workers=2) == []
+    
+    def test_reuse_executor(self):
+        """Test passing an existing executor."""
+        with ProcessPoolExecutor(2) as pool:
+            result = map_batch(slugify, ['A B', 'C D'], chunk_size=1, min_items=0, executor=pool)
+        assert result == ['a-b', 'c-d']
+    
+    def test_executor_skips_calibration(self):
+        """Test a supplied executor is used without calibrating a process pool."""
+        # A lambda cannot be pickled, so calibrate() would fail on it
+        with ThreadPoolExecutor(2) as pool:
+            result = map_batch(lambda x: x * 2, range(1000), workers=2, executor=pool)
+        assert result == [x * 2 for x in range(1000)]
+    
+    def test_imap_is_lazy(self):
+        """Test imap_batch yields results on demand without buffering the input."""
+        results = imap_batch(slugify, cycle(['A B', 'C D']), workers=1)
+        assert next(results) == 'a-b'
+        assert list(islice(results, 3)) == ['c-d', 'a-b', 'c-d']
+    
+    def test_no_payoff_streams_in_process(self):
+        """Test a cutover that never pays off streams instead of buffering."""
+        results = imap_batch(str, count(), workers=2, min_items=sys.maxsize)
+        assert list(islice(results, 3)) == ['0', '1', '2']
+
+
+class TestCalibrate:
+    """Test cases for calibrate function."""
+    
+    def test_single_worker_never_parallel(self):
+        """Test one worker never pays off."""
+        assert calibrate(slugify, ['Hello World'] * 10, workers=1) == sys.maxsize
+    
+    def test_returns_cutover(self):
+        """Test calibration returns a positive item count."""
+        assert calibrate(slugify, ['Hello World'] * 50, workers=2) >= 1
+    
+    def test_partial_cutover_is_reused(self):
+        """Test equivalent partials share one cached cutover."""
+        calibrate(partial(truncate, max_length=50), ['Hello World'] * 10, workers=1)
+        assert parallel._cutovers[parallel._cutover_key(partial(truncate, max_length=50), 1)] == sys.maxsize
+        assert parallel._cutover_key(partial(truncate, max_length=50), 1) != \
+            parallel._cutover_key(partial(truncate, max_length=40), 1)
+    
+    def test_cache_is_bounded(self):
+        """Test the cutover cache never exceeds CUTOVER_CACHE_SIZE."""
+        for length in range(parallel.CUTOVER_CACHE_SIZE + 10):
+            calibrate(partial(truncate, max_length=length), ['Hello World'], workers=1)
+        assert len(parallel._cutovers) == parallel.CUTOVER_CACHE_SIZE
+    
+    def test_empty_sample(self):
+        """Test calibration needs a sample."""
+        with pytest.raises(ValueError):
+            calibrate(slugify, [])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,175 @@
+"""Tests for stream module."""
+
+import json
+import os
+import tracemalloc
+from functools import partial
+
+import pytest
+from pyutils import stream
+
+
+def write_jsonl(path, records, newline="\n"):
+    """Write records as JSON lines and return the path."""
+    path.write_text("".join(json.dumps(record) + newline for record in records))
+    return path
+
+
+class TestReadLines:
+    """Test cases for read_lines function."""
+    
+    @pytest.mark.parametrize("use_mmap", [True, False])
+    def test_lines_across_chunks(self, tmp_path, use_mmap):
+        """Test lines split across block boundaries are reassembled."""
+        lines = [f"line {i} " * (i % 7) for i in range(200)]
+        path = tmp_path / "data.txt"
+        path.write_text("\n".join(lines) + "\n")
+        assert list(stream.read_lines(path, chunk_size=16, use_mmap=use_mmap)) == \
+            [line.encode() for line in lines]
+    
+    @pytest.mark.parametrize("use_mmap", [True, False])
+    def test_no_trailing_newline(self, tmp_path, use_mmap):
+        """Test the last line is returned without a final newline."""
+        path = tmp_path / "data.txt"
+        path.write_bytes(b"a\nbb\nccc")
+        assert list(stream.read_lines(path, chunk_size=2, use_mmap=use_mmap)) == [b"a", b"bb", b"ccc"]
+    
+    @pytest.mark.parametrize("use_mmap", [True, False])
+    def test_empty_file(self, tmp_path, use_mmap):
+        """Test an empty file yields nothing."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        assert list(stream.read_lines(path, use_mmap=use_mmap)) == []
+    
+    @pytest.mark.skipif(not os.path.isdir("/dev/fd"), reason="requires /dev/fd")
+    @pytest.mark.parametrize("use_mmap", [True, False])
+    def test_pipe(self, use_mmap):
+        """Test a pipe, which cannot be memory-mapped, is read in blocks."""
+        read_fd, write_fd = os.pipe()
+        try:
+            os.write(write_fd, b'{"a": 1}\n{"a": 2}\n')
+            os.close(write_fd)
+            lines = list(stream.read_lines(f"/dev/fd/{read_fd}", chunk_size=4, use_mmap=use_mmap))
+        finally:
+            os.close(read_fd)
+        assert lines == [b'{"a": 1}', b'{"a": 2}']
+    
+    def test_invalid_chunk_size(self, tmp_path):
+        """Test a non-positive chunk_size is rejected."""
+        with pytest.raises(ValueError):
+            stream.read_lines(tmp_path / "missing", chunk_size=0)
+
+
+class TestStages:
+    """Test cases for the record stages."""
+    
+    def test_parse_json(self):
+        """Test parsing skips blank lines and handles CRLF."""
+        lines = [b'{"a": 1}\r', b"", b"  ", '{"a": 2}']
+        assert list(stream.parse_json(lines)) == [{"a": 1}, {"a": 2}]
+    
+    def test_parse_json_errors(self):
+        """Test invalid lines raise or are skipped."""
+        lines = [b'{"a": 1}', b"{oops", b"[2]"]
+        with pytest.raises(ValueError):
+            list(stream.parse_json(lines))
+        assert list(stream.parse_json(lines, errors="skip")) == [{"a": 1}, [2]]
+        with pytest.raises(ValueError):
+            stream.parse_json(lines, errors="ignore")
+    
+    def test_project(self):
+        """Test projecting paths, with and without output names."""
+        records = [{"user": {"id": 1, "name": "a"}}, {"user": {}}]
+        assert list(stream.project(records, ["user.id"])) == [{"user.id": 1}, {"user.id": None}]
+        assert list(stream.project(records, {"name": "user.name"}, default="")) == \
+            [{"name": "a"}, {"name": ""}]
+    
+    def test_flatten_and_rename(self):
+        """Test flattening and key renaming stages."""
+        records = [{"userInfo": {"firstName": "A"}}]
+        assert list(stream.flatten(records)) == [{"userInfo.firstName": "A"}]
+        assert list(stream.rename_keys(records)) == [{"user_info": {"first_name": "A"}}]
+        assert list(stream.flatten(records, compact=True)) == [{"userInfo.firstName": "A"}]
+        renamed = list(stream.rename_keys(stream.flatten(records * 2, compact=True)))
+        assert renamed == [{"user_info.first_name": "A"}] * 2
+        assert renamed[0].schema is renamed[1].schema
+        colliding = stream.flatten([{"aB": 1, "a_b": 2}], compact=True)
+        assert list(stream.rename_keys(colliding)) == [{"a_b": 2}]
+    
+    def test_dedupe(self):
+        """Test exact and approximate dedup of dict records."""
+        records = [{"id": 1}, {"id": 2}, {"id": 1}]
+        assert list(stream.dedupe(records)) == [{"id": 1}, {"id": 2}]
+        assert list(stream.dedupe(records, approximate=True, capacity=100)) == [{"id": 1}, {"id": 2}]
+        assert list(stream.dedupe(records, key=lambda r: r["id"] > 0)) == [{"id": 1}]
+    
+    def test_compact_records_downstream(self, tmp_path):
+        """Test FlatRecords from flatten(compact=True) can be deduplicated and written."""
+        records = [{"a": {"b": 1}}, {"a": {"b": 2}}, {"a": {"b": 1}}, {"a": {"b": [1]}}, {"a": {"b": [1]}}]
+        flat = list(stream.dedupe(stream.flatten(records, compact=True)))
+        assert flat == [{"a.b": 1}, {"a.b": 2}, {"a.b": [1]}]
+        approximate = stream.dedupe(stream.flatten(records, compact=True), approximate=True, capacity=100)
+        assert list(approximate) == flat
+        assert stream.write_lines(flat, tmp_path / "out.jsonl") == 3
+        assert list(stream.parse_json(stream.read_lines(tmp_path / "out.jsonl"))) == \
+            [{"a.b": 1}, {"a.b": 2}, {"a.b": [1]}]
+        with pytest.raises(TypeError):
+            stream.write_lines([{"a": object()}], tmp_path / "bad.jsonl")
+    
+    def test_chunk(self):
+        """Test chunking records."""
+        assert list(stream.chunk(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+class TestPipeline:
+    """Test cases for composed pipelines."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test a read-transform-write pipeline."""
+        records = [{"eventId": i % 3, "payload": {"userName": f"ü{i}"}} for i in range(10)]
+        source = write_jsonl(tmp_path / "in.jsonl", records, newline="\r\n")
+        target = tmp_path / "out.jsonl"
+        written = stream.pipeline(
+            stream.read_lines(source),
+            stream.parse_json,
+            partial(stream.dedupe, key=lambda r: r["eventId"]),
+            stream.flatten,
+            stream.rename_keys,
+            partial(stream.write_lines, path=target, batch_size=2),
+        )
+        assert written == 3
+        assert list(stream.parse_json(stream.read_lines(target))) == [
+            {"event_id": i, "payload.user_name": f"ü{i}"} for i in range(3)
+        ]
+    
+    def test_is_lazy(self):
+        """Test stages pull records only when consumed."""
+        pulled = []
+        
+        def source():
+            for i in range(100):
+                pulled.append(i)
+                yield b'{"a": %d}' % i
+        
+        records = stream.pipeline(source(), stream.parse_json, partial(stream.project, paths=["a"]))
+        assert pulled == []
+        assert next(records) == {"a": 0}
+        assert pulled == [0]
+    
+    def test_constant_memory(self, tmp_path):
+        """Test peak memory does not grow with the file size."""
+        def peak(count):
+            path = write_jsonl(tmp_path / f"{count}.jsonl", ({"id": i, "v": "x" * 50} for i in range(count)))
+            tracemalloc.start()
+            try:
+                for _ in stream.pipeline(stream.read_lines(path, chunk_size=4096), stream.parse_json, stream.flatten):
+                    pass
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        
+        assert peak(20_000) < 2 * peak(2_000)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,7 +1,19 @@
 """Tests for string_utils module."""
 
 import pytest
-from pyutils.string_utils import slugify, truncate, camel_to_snake
+from pyutils.string_utils import (
+    Slugifier,
+    TextPipeline,
+    slugify,
+    slugify_many,
+    truncate,
+    truncate_many,
+    camel_to_snake,
+    snake_to_camel,
+    snake_to_pascal,
+    case_cache_info,
+    clear_case_caches,
+)
 
 
 class TestSlugify:
@@ -36,6 +48,55 @@ class TestSlugify:
     def test_slugify_already_slug(self):
         """Test slugify with already slugified string."""
         assert slugify("already-a-slug") == "already-a-slug"
+    
+    def test_slugify_accented_letters(self):
+        """Test slugify transliterates accented letters to ASCII."""
+        assert slugify("Crème Brûlée à la carte") == "creme-brulee-a-la-carte"
+    
+    def test_slugify_all_punctuation(self):
+        """Test slugify removes every punctuation mark."""
+        assert slugify("Rock & Roll (Live) [2024] - \"Best\" of: 'Em/Us*") == \
+            "rock-roll-live-2024-best-of-emus"
+    
+    def test_slugify_collapses_separators(self):
+        """Test slugify collapses hyphens and whitespace, trimming ends."""
+        assert slugify("  --Hello -- World--  ") == "hello-world"
+    
+    def test_slugify_max_length(self):
+        """Test slugify cuts to max_length without a trailing separator."""
+        assert slugify("Hello World Again", max_length=11) == "hello-world"
+        assert slugify("Hello World Again", max_length=6) == "hello"
+        assert slugify("Hello", max_length=0) == ""
+    
+    def test_slugify_allow_unicode(self):
+        """Test slugify keeps non-ASCII letters when allowed."""
+        assert slugify("Привет, Мир!", allow_unicode=True) == "привет-мир"
+        assert slugify("Привет, Мир!") == ""
+
+
+class TestSlugifier:
+    """Test cases for Slugifier class and slugify_many function."""
+    
+    def test_reusable_config(self):
+        """Test a Slugifier applies its stored configuration."""
+        to_slug = Slugifier(separator="_", max_length=12)
+        assert to_slug("Crème Brûlée Recipe") == "creme_brulee"
+        assert to_slug("Hello World") == "hello_world"
+    
+    def test_keep_case(self):
+        """Test a Slugifier that preserves case."""
+        assert Slugifier(lowercase=False)("Hello World") == "Hello-World"
+    
+    def test_many(self):
+        """Test batch slugification matches single calls."""
+        texts = ["Hello World!", "Café Menu", "Python 3.11"]
+        assert slugify_many(texts) == [slugify(t) for t in texts]
+        assert Slugifier(max_length=5).many(texts) == ["hello", "cafe", "pytho"]
+    
+    def test_invalid_max_length(self):
+        """Test negative max_length is rejected."""
+        with pytest.raises(ValueError):
+            Slugifier(max_length=-1)
 
 
 class TestTruncate:
@@ -70,13 +131,135 @@ class TestTruncate:
         assert len(result) == 5
     
     def test_truncate_long_suffix(self):
-        """Test truncate when suffix is long."""
-        result = truncate("Text", 5, suffix="...")
-        assert len(result) == 5
+        """Test that a suffix leaving no room for text is dropped."""
+        assert truncate("Text", 5, suffix="...") == "Text"
+        assert truncate("Text", 3, suffix="...") == "Tex"
+        assert truncate("Text", 2, suffix="...") == "Te"
     
     def test_truncate_empty_string(self):
         """Test truncate with empty string."""
         assert truncate("", 10) == ""
+    
+    def test_truncate_graphemes_keeps_clusters(self):
+        """Test that grapheme mode never splits combining marks or emoji."""
+        assert truncate("e\u0301e\u0301e\u0301", 2, suffix="", mode="graphemes") == "e\u0301e\u0301"
+        assert truncate("👍🏽👍🏽👍🏽", 2, suffix="", mode="graphemes") == "👍🏽👍🏽"
+        assert truncate("🇺🇸🇫🇷🇩🇪", 1, suffix="", mode="graphemes") == "🇺🇸"
+    
+    def test_truncate_width(self):
+        """Test that width mode counts East Asian wide characters as 2."""
+        assert truncate("日本語のテキスト", 7, mode="width") == "日本..."
+        assert truncate("abc", 3, mode="width") == "abc"
+    
+    def test_truncate_bytes_budget(self):
+        """Test that bytes mode respects the encoded size and never splits a character."""
+        result = truncate("Héllo wörld", 8, mode="bytes")
+        assert result == "Héll..."
+        assert len(result.encode("utf-8")) <= 8
+        for limit in range(4, 20):
+            assert len(truncate("日本語のテキスト", limit, mode="bytes").encode("utf-8")) <= limit
+    
+    def test_truncate_bytes_other_encoding(self):
+        """Test bytes mode with an encoding that adds a byte order mark."""
+        result = truncate("Héllo wörld", 12, mode="bytes", encoding="utf-16")
+        assert result == "Hé..."
+        assert len(result.encode("utf-16")) <= 12
+    
+    @pytest.mark.parametrize("encoding", ["utf-16-le", "utf-32", "shift_jis", "gb18030", "iso2022_jp"])
+    def test_truncate_bytes_multibyte_codecs(self, encoding):
+        """Test bytes mode keeps the longest prefix that fits in other codecs."""
+        text = "日本 abc 日本語 テキスト" if encoding in ("shift_jis", "iso2022_jp") else "日a😀本 é😀x"
+        for limit in range(len(text.encode(encoding)) + 1):
+            result = truncate(text, limit, suffix="", mode="bytes", encoding=encoding)
+            longest = max(
+                (cut for cut in range(len(text) + 1) if len(text[:cut].encode(encoding)) <= limit),
+                default=0,
+            )
+            assert result == text[:longest]
+    
+    def test_truncate_word_boundary(self):
+        """Test cutting at the last whitespace before the limit."""
+        assert truncate("The quick brown fox", 14, word_boundary=True) == "The quick..."
+        assert truncate("Supercalifragilistic", 10, word_boundary=True) == "Superca..."
+    
+    def test_truncate_invalid_arguments(self):
+        """Test truncate with an unknown mode or negative max_length."""
+        with pytest.raises(ValueError):
+            truncate("Text", 3, mode="lines")
+        with pytest.raises(ValueError):
+            truncate("Text", -1)
+        with pytest.raises(LookupError):
+            truncate("Text", 3, mode="bytes", encoding="no-such-codec")
+    
+    def test_truncate_many(self):
+        """Test batch truncation matches truncate for every mode."""
+        texts = ["Short", "This is a long text", "日本語のテキスト", ""]
+        for mode in ("chars", "graphemes", "width", "bytes"):
+            assert truncate_many(texts, 10, mode=mode) == [truncate(t, 10, mode=mode) for t in texts]
+
+
+class TestTextPipeline:
+    """Test cases for TextPipeline class."""
+    
+    def test_matches_separate_steps(self):
+        """Test a pipeline equals applying each step in turn."""
+        texts = ["  Fish & Chips ", "Crème Brûlée @ Home", "", "ÀÉÎ  long title here"]
+        pipeline = TextPipeline().strip().lower().replace({"&": " and ", "@": "at"}).slugify().truncate(12)
+        expected = [
+            truncate(slugify(t.strip().lower().replace("&", " and ").replace("@", "at")), 12)
+            for t in texts
+        ]
+        assert [pipeline(t) for t in texts] == expected
+        assert pipeline.many(texts) == expected
+        assert list(pipeline.stream(iter(texts), chunk_size=3)) == expected
+    
+    def test_replace_single_pass(self):
+        """Test longest keys win and replacements are not rescanned."""
+        replace = TextPipeline().replace({"a": "b", "ab": "X", "abc": "Y", "b": "a"})
+        assert replace("abcab ab b") == "YX X a"
+        assert TextPipeline().replace({"a": "b", "b": "a"})("abba") == "baab"
+        assert TextPipeline().replace({".": "\\", "*": "+"})("a.b*") == "a\\b+"
+        assert TextPipeline().replace({}).stages == ()
+        with pytest.raises(ValueError):
+            TextPipeline().replace({"": "x"})
+    
+    def test_redundant_steps_dropped(self):
+        """Test steps that slugify makes redundant are removed."""
+        assert TextPipeline().strip().lower().slugify().stages == ("slugify",)
+        assert TextPipeline().strip().lower().slugify(allow_unicode=True).stages == \
+            ("strip", "lower", "slugify")
+        assert TextPipeline().strip("x").slugify().stages == ("strip", "slugify")
+        pipeline = TextPipeline().strip("-").lower().slugify(allow_unicode=True)
+        assert pipeline("-\u0130stanbul-") == slugify("-\u0130stanbul-".strip("-").lower(), allow_unicode=True)
+    
+    def test_immutable_builder(self):
+        """Test builder methods leave the original pipeline unchanged."""
+        base = TextPipeline().strip()
+        lowered = base.lower()
+        assert base.stages == ("strip",)
+        assert lowered.stages == ("strip", "lower")
+        assert repr(lowered) == "TextPipeline(strip | lower)"
+        assert TextPipeline()("  same ") == "  same "
+    
+    def test_apply_and_profile(self):
+        """Test custom steps and per-step timings."""
+        pipeline = TextPipeline().apply(str.upper).apply(lambda t: t + "!", name="bang").truncate(4, mode="bytes")
+        assert pipeline("ab") == "AB!"
+        assert pipeline.many(["héllo"]) == ["H..."]
+        timings = pipeline.profile(["abc"] * 10)
+        assert [name for name, _ in timings] == ["upper", "bang", "truncate"]
+        assert all(seconds >= 0 for _, seconds in timings)
+    
+    def test_invalid_arguments(self):
+        """Test invalid step settings are rejected when the step is added."""
+        with pytest.raises(ValueError):
+            TextPipeline().truncate(-1)
+        with pytest.raises(ValueError):
+            TextPipeline().truncate(5, mode="words")
+        with pytest.raises(ValueError):
+            TextPipeline().slugify(max_length=-1)
+        with pytest.raises(ValueError):
+            TextPipeline().stream([], chunk_size=0)
 
 
 class TestCamelToSnake:
@@ -111,6 +294,67 @@ class TestCamelToSnake:
     def test_already_snake_case(self):
         """Test camel_to_snake with already snake_case."""
         assert camel_to_snake("already_snake_case") == "already_snake_case"
+    
+    def test_acronym_at_start(self):
+        """Test camel_to_snake splits an acronym before a word."""
+        assert camel_to_snake("HTTPServer") == "http_server"
+        assert camel_to_snake("getHTTPResponseCode") == "get_http_response_code"
+        assert camel_to_snake("ID") == "id"
+    
+    def test_non_ascii(self):
+        """Test camel_to_snake with non-ASCII letters."""
+        assert camel_to_snake("prénomÉlève") == "prénom_élève"
+    
+    def test_long_identifier(self):
+        """Test camel_to_snake on a long identifier."""
+        assert camel_to_snake("FooBar" * 1000) == "_".join(["foo_bar"] * 1000)
+    
+    def test_cached(self):
+        """Test memoized conversion returns identical results."""
+        clear_case_caches()
+        assert camel_to_snake("myVariableName", cached=True) == "my_variable_name"
+        assert camel_to_snake("myVariableName", cached=True) == "my_variable_name"
+        info = case_cache_info()["camel_to_snake"]
+        assert info.hits == 1
+        assert info.misses == 1
+
+
+class TestSnakeToCamel:
+    """Test cases for snake_to_camel and snake_to_pascal functions."""
+    
+    def test_basic_snake_to_camel(self):
+        """Test basic snake_case to camelCase conversion."""
+        assert snake_to_camel("my_variable_name") == "myVariableName"
+    
+    def test_basic_snake_to_pascal(self):
+        """Test basic snake_case to PascalCase conversion."""
+        assert snake_to_pascal("http_server") == "HttpServer"
+    
+    def test_single_word(self):
+        """Test conversion of a single word."""
+        assert snake_to_camel("variable") == "variable"
+        assert snake_to_pascal("variable") == "Variable"
+    
+    def test_underscores(self):
+        """Test leading underscores are kept and repeats dropped."""
+        assert snake_to_camel("_private__value_") == "_privateValue"
+        assert snake_to_camel("__") == "__"
+    
+    def test_empty_string(self):
+        """Test conversion of an empty string."""
+        assert snake_to_camel("") == ""
+        assert snake_to_pascal("") == ""
+    
+    def test_round_trip(self):
+        """Test camelCase survives a round trip."""
+        assert snake_to_camel(camel_to_snake("myVariableName")) == "myVariableName"
+    
+    def test_cached(self):
+        """Test memoized conversion shares one cache."""
+        clear_case_caches()
+        assert snake_to_camel("a_b", cached=True) == "aB"
+        assert snake_to_pascal("a_b", cached=True) == "AB"
+        assert case_cache_info()["snake_to_camel"].misses == 2
 
 
 if __name__ == "__main__":